@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import os
+import sys
+import timeit
+
+import django
+from django.conf import settings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def setup_django(**overrides):
+    """
+    Configure a minimal django project (like quicktest.py does) so that the
+    benchmarks can run without a real project.
+    """
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+
+    django_settings = {
+        'DATABASES': {
+            'default': {
+                'ENGINE': 'django.db.backends.sqlite3',
+                'NAME': ':memory:',
+            }
+        },
+        'INSTALLED_APPS': [
+            'django.contrib.auth',
+            'django.contrib.contenttypes',
+            'django.contrib.sessions',
+            'django.contrib.messages',
+            'generic_scaffold',
+        ],
+        'ROOT_URLCONF': 'generic_scaffold.tests',
+        'SECRET_KEY': '123',
+        'DEFAULT_AUTO_FIELD': 'django.db.models.BigAutoField',
+        'TEMPLATES': [{
+            'BACKEND': 'django.template.backends.django.DjangoTemplates',
+            'APP_DIRS': True,
+        }],
+    }
+    django_settings.update(overrides)
+    settings.configure(**django_settings)
+    django.setup()
+
+
+def create_models(count, app_label='generic_scaffold'):
+    "Create count simple models to be scaffolded by the benchmarks"
+    from django.db import models
+
+    return [
+        type(str('BenchModel{0}'.format(i)), (models.Model, ), {
+            '__module__': __name__,
+            'Meta': type(str('Meta'), (), {'app_label': app_label}),
+            'title': models.CharField(max_length=128),
+            'description': models.TextField(),
+        })
+        for i in range(count)
+    ]
+
+
+def best_of(func, repeat=5, number=1):
+    "Return the best time in seconds of a single call to func"
+    return min(timeit.repeat(func, repeat=repeat, number=number)) / number
+
+
+def report(name, seconds):
+    print('{0:<50} {1:>10.3f} ms'.format(name, seconds * 1000))
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+Compare a page of the html list view against the same page of the json api
+list view (which serializes ``values()`` rows without creating model
+instances).
+
+Run it with ``python benchmarks/api_list.py``.
+"""
+from __future__ import unicode_literals
+
+from _setup import setup_django, create_models, best_of, report
+
+setup_django(ROOT_URLCONF=__name__)
+
+from django.db import connection
+from django.test import RequestFactory
+
+from generic_scaffold import CrudManager
+
+BenchModel, = create_models(1)
+ROWS = 1000
+
+crud = type(str('BenchCrudManager'), (CrudManager, ), {
+    'model': BenchModel,
+    'prefix': 'bench/',
+    'api': True,
+    'list_pagination': 'offset',
+    'list_paginate_by': ROWS,
+})()
+urlpatterns = crud.get_url_patterns()
+
+
+def main():
+    rows = ROWS
+    with connection.schema_editor() as editor:
+        editor.create_model(BenchModel)
+    BenchModel.objects.bulk_create([
+        BenchModel(title='title {0}'.format(i), description='description') for i in range(rows)
+    ])
+
+    list_view = crud.get_view('list')
+    api_list_view = crud.get_view('api_list')
+    request = RequestFactory().get('/')
+
+    report('html list view ({0} rows)'.format(rows),
+           best_of(lambda: list_view(request).render()))
+    report('json api list view ({0} rows)'.format(rows),
+           best_of(lambda: api_list_view(request)))
+
+
+if __name__ == '__main__':
+    main()
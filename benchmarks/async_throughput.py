@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+Measure the throughput (requests per second) of the sync and the async
+(``async_views = True``) list and detail views when served by uvicorn with
+concurrent clients.
+
+Needs uvicorn (``pip install uvicorn``). Run it with
+``python benchmarks/async_throughput.py``.
+"""
+from __future__ import unicode_literals
+
+import asyncio
+import os
+import socket
+import tempfile
+import threading
+import time
+
+from _setup import setup_django, create_models
+
+DB_FILE = os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')
+
+setup_django(
+    ROOT_URLCONF=__name__,
+    DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': DB_FILE}},
+    ALLOWED_HOSTS=['*'],
+)
+
+import uvicorn
+from django.core.asgi import get_asgi_application
+from django.db import connection
+from django.urls import reverse
+
+from generic_scaffold import CrudManager
+
+SyncModel, AsyncModel = create_models(2)
+
+sync_crud = type(str('SyncCrudManager'), (CrudManager, ), {
+    'model': SyncModel, 'prefix': 'sync/', 'list_pagination': 'offset',
+})()
+async_crud = type(str('AsyncCrudManager'), (CrudManager, ), {
+    'model': AsyncModel, 'prefix': 'async/', 'list_pagination': 'offset', 'async_views': True,
+})()
+urlpatterns = sync_crud.get_url_patterns() + async_crud.get_url_patterns()
+
+
+def create_tables(rows=200):
+    with connection.schema_editor() as editor:
+        for model in [SyncModel, AsyncModel]:
+            editor.create_model(model)
+    for model in [SyncModel, AsyncModel]:
+        model.objects.bulk_create([
+            model(title='title {0}'.format(i), description='description') for i in range(rows)
+        ])
+    connection.close()
+
+
+def start_server():
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+
+    config = uvicorn.Config(get_asgi_application(), host='127.0.0.1', port=port, log_level='warning')
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, thread, port
+
+
+async def fetch(port, path):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write('GET {0} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n'.format(path).encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    if not response.startswith(b'HTTP/1.1 200'):
+        raise RuntimeError(response[:200])
+
+
+async def load(port, path, requests, concurrency):
+    queue = asyncio.Queue()
+    for i in range(requests):
+        queue.put_nowait(path)
+
+    async def worker():
+        while not queue.empty():
+            await fetch(port, queue.get_nowait())
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for i in range(concurrency)])
+    return requests / (time.perf_counter() - start)
+
+
+def report(name, rps):
+    print('{0:<50} {1:>10.1f} req/s'.format(name, rps))
+
+
+def main(requests=500, concurrency=20):
+    create_tables()
+    server, thread, port = start_server()
+    try:
+        for crud in [sync_crud, async_crud]:
+            paths = [
+                ('list', reverse(crud.list_url_name)),
+                ('detail', crud.row_urls(crud.model.objects.first())['detail']),
+            ]
+            for action, path in paths:
+                asyncio.run(load(port, path, 20, concurrency))  # warm up
+                rps = asyncio.run(load(port, path, requests, concurrency))
+                report('{0} {1} ({2} clients)'.format(
+                    'async' if crud.async_views else 'sync', action, concurrency
+                ), rps)
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+if __name__ == '__main__':
+    main()
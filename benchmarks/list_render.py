@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Compare rendering the fallback list template with a {% url %} reversal per
+row link against the precomputed row urls of the CrudManager and against
+rows cached with list_row_cache_field.
+
+Run it with ``python benchmarks/list_render.py``.
+"""
+from __future__ import unicode_literals
+
+from _setup import setup_django, best_of, report
+
+# The default locmem cache keeps only 300 entries
+setup_django(CACHES={'default': {
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    'OPTIONS': {'MAX_ENTRIES': 100000},
+}})
+
+import datetime
+
+from django.template import engines
+from django.template.loader import get_template
+
+from generic_scaffold.tests import TestModel, TestVersionedModel, TestVersionedCrudManager, test_crud
+
+URL_TAG_LIST_TEMPLATE = """{% extends 'generic_scaffold/base.html' %}
+{% block content %}
+<a href='{% url object_list.0.create_url_name %}'>Create</a>
+<ul>
+    {% for object in object_list %}
+        <li>
+            {{ object }}
+            <a href='{% url object.detail_url_name object.id %}'>detail</a>
+            <a href='{% url object.update_url_name object.id %}'>update</a>
+            <a href='{% url object.delete_url_name object.id %}'>delete</a>
+        </li>
+    {% endfor %}
+</ul>
+{% endblock %}"""
+
+
+def main(rows=1000):
+    object_list = [TestModel(pk=i, test='test{0}'.format(i)) for i in range(1, rows + 1)]
+    context = {'object_list': object_list, 'crud': test_crud}
+
+    url_tag_template = engines['django'].from_string(URL_TAG_LIST_TEMPLATE)
+    row_urls_template = get_template('generic_scaffold/list.html')
+
+    report('list.html with {{% url %}} per row ({0} rows)'.format(rows),
+           best_of(lambda: url_tag_template.render(context)))
+    report('list.html with crud|row_urls ({0} rows)'.format(rows),
+           best_of(lambda: row_urls_template.render(context)))
+
+    row_cache_crud = type(str('RowCacheCrudManager'), (TestVersionedCrudManager, ), {
+        'list_row_cache_field': 'updated',
+    })()
+    now = datetime.datetime.now()
+    context = {
+        'object_list': [TestVersionedModel(pk=i, test='test{0}'.format(i), updated=now) for i in range(1, rows + 1)],
+        'crud': row_cache_crud,
+    }
+    # The first render fills the cache
+    row_urls_template.render(context)
+    report('list.html with cached rows ({0} rows)'.format(rows),
+           best_of(lambda: row_urls_template.render(context)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Compare the time to the first byte and the peak memory of rendering the
+whole (unpaginated) list view in memory against streaming it with
+list_streaming.
+
+Run it with ``python benchmarks/list_streaming.py``.
+"""
+from __future__ import unicode_literals
+
+from _setup import setup_django, create_models, best_of, report
+
+setup_django(ROOT_URLCONF=__name__)
+
+import tracemalloc
+
+from django.db import connection
+from django.test import RequestFactory
+
+from generic_scaffold import CrudManager
+
+BenchModel, = create_models(1)
+ROW_COUNTS = (1000, 10000, 50000)
+
+BenchCrudManager = type(str('BenchCrudManager'), (CrudManager, ), {
+    'model': BenchModel,
+    'prefix': 'bench/',
+})
+crud = BenchCrudManager()
+streaming_crud = type(str('StreamingBenchCrudManager'), (BenchCrudManager, ), {'list_streaming': True})()
+urlpatterns = crud.get_url_patterns()
+
+
+def first_byte(view, request):
+    response = view(request)
+    if response.streaming:
+        return next(iter(response.streaming_content))
+    return response.render().content[:1]
+
+
+def consume(view, request):
+    response = view(request)
+    if response.streaming:
+        for chunk in response.streaming_content:
+            pass
+    else:
+        response.render()
+
+
+def peak_memory(func):
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    with connection.schema_editor() as editor:
+        editor.create_model(BenchModel)
+
+    list_view = crud.get_view('list')
+    streaming_view = streaming_crud.get_view('list')
+    request = RequestFactory().get('/')
+
+    created = 0
+    for rows in ROW_COUNTS:
+        BenchModel.objects.bulk_create([
+            BenchModel(title='title {0}'.format(i), description='description') for i in range(created, rows)
+        ])
+        created = rows
+
+        for name, view in (('list', list_view), ('streaming list', streaming_view)):
+            report('{0} first byte ({1} rows)'.format(name, rows),
+                   best_of(lambda: first_byte(view, request), repeat=3))
+            report('{0} whole response ({1} rows)'.format(name, rows),
+                   best_of(lambda: consume(view, request), repeat=3))
+            print('{0:<50} {1:>10.1f} MB'.format(
+                '{0} peak memory ({1} rows)'.format(name, rows),
+                peak_memory(lambda: consume(view, request)) / 1024.0 / 1024.0
+            ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""
+Run the whole benchmark suite on an in-memory SQLite database and store the
+results as JSON so that they can be compared between versions:
+
+* the cost of registering (defining) CrudManager classes
+* the time needed by get_url_patterns (eager and lazy)
+* the time to resolve urls as the number of scaffolds grows (regular and
+  compact url patterns)
+* the time to render the list view (generic_scaffold/list.html) for
+  100, 1000 and 10000 rows
+* the latency of the detail, create, update and delete views
+* the number of queries of each action
+
+Run it with ``python benchmarks/suite.py`` (``--quick`` for smaller sizes).
+Use ``--output results.json`` to choose where the results are stored and
+``--compare old.json`` to compare them with a previous run.
+"""
+from __future__ import unicode_literals
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import time
+import types
+
+from _setup import ROOT, setup_django, create_models
+
+setup_django(ROOT_URLCONF=__name__, ALLOWED_HOSTS=['*'])
+
+import django
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+
+from generic_scaffold import CrudManager, get_compact_url_patterns
+
+SIZES = (10, 100, 1000)
+QUICK_SIZES = (10, 100)
+ROW_COUNTS = (100, 1000, 10000)
+QUICK_ROW_COUNTS = (100, 1000)
+# Results that are slower by more than this are reported as regressions
+REGRESSION_THRESHOLD = 1.2
+
+# The first model is used to render the views, the rest to define managers
+all_models = create_models(max(SIZES) + 1)
+ViewModel, bench_models = all_models[0], all_models[1:]
+
+view_crud = type(str('ViewBenchCrudManager'), (CrudManager, ), {
+    'model': ViewModel,
+    'prefix': 'bench/',
+})()
+urlpatterns = view_crud.get_url_patterns()
+ViewModel.get_absolute_url = lambda self: reverse(view_crud.detail_url_name, args=[self.pk])
+
+
+def measure(func, setup=None, repeat=5):
+    "Return the best time in milliseconds of func; setup is not timed"
+    best = None
+    for i in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+
+def define_managers(models, **options):
+    managers = []
+    for model in models:
+        attrs = {'model': model, 'prefix': '{0}/'.format(model._meta.model_name)}
+        attrs.update(options)
+        managers.append(type(str('{0}CrudManager'.format(model.__name__)), (CrudManager, ), attrs))
+    return managers
+
+
+def unregister(managers):
+    for manager in managers:
+        CrudManager._registry.remove(manager)
+        del CrudManager._registry_by_prefix[manager.prefix]
+        del CrudManager._registry_by_model[(manager.app_label, manager.model_name)]
+
+
+def bench_registration(results, sizes):
+    for size in sizes:
+        models = bench_models[:size]
+        defined = []
+        results['registration.{0}'.format(size)] = measure(
+            lambda: defined.append(define_managers(models)),
+            setup=lambda: defined and unregister(defined.pop()),
+        )
+        unregister(defined.pop())
+
+
+def bench_url_patterns(results, sizes):
+    for size in sizes:
+        for lazy in [False, True]:
+            managers = define_managers(bench_models[:size], lazy=lazy)
+            results['url_patterns.{0}.{1}'.format('lazy' if lazy else 'eager', size)] = measure(
+                lambda: [manager().get_url_patterns() for manager in managers]
+            )
+            unregister(managers)
+
+
+def bench_resolve(results, sizes):
+    for size in sizes:
+        managers = define_managers(bench_models[:size], lazy=True)
+        cruds = [manager() for manager in managers]
+        regular = types.ModuleType(str('regular_urls'))
+        regular.urlpatterns = []
+        for crud in cruds:
+            regular.urlpatterns += crud.get_url_patterns()
+        compact = types.ModuleType(str('compact_urls'))
+        compact.urlpatterns = get_compact_url_patterns(*cruds)
+
+        # 100 paths spread over all scaffolds
+        paths = []
+        for i in range(50):
+            crud = cruds[i * size // 50]
+            paths.append(reverse(crud.list_url_name, urlconf=regular))
+            paths.append(reverse(crud.update_url_name, args=[1], urlconf=regular))
+
+        for name, urlconf in [('regular', regular), ('compact', compact)]:
+            results['resolve.{0}.{1}'.format(name, size)] = measure(
+                lambda: [resolve(path, urlconf=urlconf) for path in paths]
+            )
+        unregister(managers)
+
+
+def create_rows(count):
+    ViewModel.objects.all().delete()
+    ViewModel.objects.bulk_create([
+        ViewModel(title='title {0}'.format(i), description='description') for i in range(count)
+    ])
+
+
+def bench_list_render(results, row_counts):
+    view = view_crud.get_view('list')
+    request = RequestFactory().get('/')
+    for count in row_counts:
+        create_rows(count)
+        results['list_render.{0}'.format(count)] = measure(
+            lambda: view(request).render(), repeat=3
+        )
+
+
+def get_action_requests():
+    "Return (action, method, view kwargs, request factory) for each action"
+    factory = RequestFactory()
+    data = {'title': 'changed', 'description': 'changed'}
+    obj = lambda: ViewModel.objects.first()
+    return [
+        ('list', 'get', lambda: {}, lambda: factory.get('/')),
+        ('detail', 'get', lambda: {'pk': obj().pk}, lambda: factory.get('/')),
+        ('create', 'get', lambda: {}, lambda: factory.get('/')),
+        ('create', 'post', lambda: {}, lambda: factory.post('/', data)),
+        ('update', 'get', lambda: {'pk': obj().pk}, lambda: factory.get('/')),
+        ('update', 'post', lambda: {'pk': obj().pk}, lambda: factory.post('/', data)),
+        ('delete', 'get', lambda: {'pk': obj().pk}, lambda: factory.get('/')),
+        ('delete', 'post', lambda: {'pk': obj().pk}, lambda: factory.post('/')),
+    ]
+
+
+def bench_actions(results):
+    for action, method, get_kwargs, get_request in get_action_requests():
+        view = view_crud.get_view(action)
+        state = {}
+
+        def setup():
+            create_rows(10)
+            state['kwargs'] = get_kwargs()
+            state['request'] = get_request()
+
+        def call():
+            response = view(state['request'], **state['kwargs'])
+            if hasattr(response, 'render'):
+                response.render()
+
+        name = '{0}.{1}'.format(action, method)
+        results['latency.' + name] = measure(call, setup=setup, repeat=10)
+        setup()
+        with CaptureQueriesContext(connection) as queries:
+            call()
+        results['queries.' + name] = len(queries)
+
+
+def get_meta():
+    try:
+        commit = subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'date': datetime.datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+    }
+
+
+def compare(results, old_results):
+    "Print the results next to the old ones and return the regressions"
+    regressions = []
+    for name, value in sorted(results.items()):
+        old = old_results.get(name)
+        if old is None:
+            print('{0:<35} {1:>12.3f}'.format(name, value))
+            continue
+        ratio = value / old if old else (1.0 if value == old else float('inf'))
+        regression = ratio > REGRESSION_THRESHOLD if not name.startswith('queries.') else value > old
+        if regression:
+            regressions.append(name)
+        print('{0:<35} {1:>12.3f} {2:>12.3f} {3:>7.2f}x{4}'.format(
+            name, old, value, ratio, ' REGRESSION' if regression else ''
+        ))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the django-generic-scaffold benchmarks')
+    parser.add_argument('--output', default=os.path.join(ROOT, 'benchmark-results.json'))
+    parser.add_argument('--compare', help='Results of a previous run to compare with')
+    parser.add_argument('--quick', action='store_true', help='Use smaller sizes')
+    args = parser.parse_args()
+
+    with connection.schema_editor() as editor:
+        editor.create_model(ViewModel)
+
+    sizes = QUICK_SIZES if args.quick else SIZES
+    results = {}
+    bench_registration(results, sizes)
+    bench_url_patterns(results, sizes)
+    bench_resolve(results, sizes)
+    bench_list_render(results, QUICK_ROW_COUNTS if args.quick else ROW_COUNTS)
+    bench_actions(results)
+
+    with open(args.output, 'w') as output:
+        json.dump({'meta': get_meta(), 'results': results}, output, indent=2, sort_keys=True)
+
+    old_results = {}
+    if args.compare:
+        with open(args.compare) as old:
+            old_results = json.load(old)['results']
+    print('{0:<35} {1:>12} {2:>12}'.format('benchmark (ms or queries)', 'old', 'new'))
+    regressions = compare(results, old_results)
+    print('Results stored in {0}'.format(args.output))
+    if regressions:
+        print('Regressions: {0}'.format(', '.join(regressions)))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+Compare resolving the urls of many scaffolds when they are added with
+get_url_patterns (five regexes for each scaffold) against a single
+get_compact_url_patterns entry.
+
+Run it with ``python benchmarks/url_resolve.py``.
+"""
+from __future__ import unicode_literals
+
+import types
+
+from _setup import setup_django, create_models, best_of, report
+
+setup_django()
+
+from django.urls import resolve, reverse
+
+from generic_scaffold import CrudManager, get_compact_url_patterns
+
+
+def create_urlconfs(count):
+    cruds = [
+        type(str('{0}CrudManager'.format(model.__name__)), (CrudManager, ), {
+            'model': model,
+            'prefix': '{0}/'.format(model._meta.model_name),
+            'lazy': True,
+        })()
+        for model in create_models(count)
+    ]
+
+    regular = types.ModuleType(str('regular_urls'))
+    regular.urlpatterns = []
+    for crud in cruds:
+        regular.urlpatterns += crud.get_url_patterns()
+
+    compact = types.ModuleType(str('compact_urls'))
+    compact.urlpatterns = get_compact_url_patterns(*cruds)
+    return cruds, regular, compact
+
+
+def main(count=1000):
+    cruds, regular, compact = create_urlconfs(count)
+    # Visit the list and update views of a sample of all scaffolds
+    paths = []
+    for crud in cruds[::count // 100]:
+        paths.append(reverse(crud.list_url_name, urlconf=regular))
+        paths.append(reverse(crud.update_url_name, args=[1], urlconf=regular))
+
+    def resolve_all(urlconf):
+        for path in paths:
+            resolve(path, urlconf=urlconf)
+
+    report('resolve {0} paths, {1} regular scaffolds'.format(len(paths), count),
+           best_of(lambda: resolve_all(regular)))
+    report('resolve {0} paths, {1} compact scaffolds'.format(len(paths), count),
+           best_of(lambda: resolve_all(compact)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Measure the time needed to define, instantiate and get the url patterns of
+many CrudManagers (i.e what happens when the urls.py is imported) with eager
+and lazy views.
+
+Run it with ``python benchmarks/urlconf_import.py``.
+"""
+from __future__ import unicode_literals
+
+from _setup import setup_django, create_models, best_of, report
+
+setup_django()
+
+from generic_scaffold import CrudManager
+
+
+def unregister(managers):
+    for manager in managers:
+        CrudManager._registry.remove(manager)
+        del CrudManager._registry_by_prefix[manager.prefix]
+        del CrudManager._registry_by_model[(manager.app_label, manager.model_name)]
+
+
+def build_urlconf(bench_models, lazy):
+    managers = []
+    urlpatterns = []
+    for model in bench_models:
+        manager = type(str('{0}CrudManager'.format(model.__name__)), (CrudManager, ), {
+            'model': 'generic_scaffold.{0}'.format(model.__name__) if lazy else model,
+            'prefix': '{0}/'.format(model._meta.model_name),
+            'lazy': lazy,
+        })
+        managers.append(manager)
+        urlpatterns += manager().get_url_patterns()
+    unregister(managers)
+    return urlpatterns
+
+
+def main(count=500):
+    bench_models = create_models(count)
+    report('urlconf with {0} eager managers'.format(count),
+           best_of(lambda: build_urlconf(bench_models, lazy=False)))
+    report('urlconf with {0} lazy managers'.format(count),
+           best_of(lambda: build_urlconf(bench_models, lazy=True)))
+
+
+if __name__ == '__main__':
+    main()
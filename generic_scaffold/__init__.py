@@ -1,2 +1,17 @@
-from generic_scaffold.views import CrudManager
-from generic_scaffold.views import get_url_names
\ No newline at end of file
+from importlib import import_module
+
+# Imported on first use so that the light modules of the package (i.e the
+# manifest loader) can be used without importing the views
+_exports = {
+    'CrudManager': 'generic_scaffold.views',
+    'get_url_names': 'generic_scaffold.views',
+    'get_compact_url_patterns': 'generic_scaffold.resolvers',
+}
+
+
+def __getattr__(name):
+    try:
+        module = _exports[name]
+    except KeyError:
+        raise AttributeError('module {0!r} has no attribute {1!r}'.format(__name__, name))
+    return getattr(import_module(module), name)
@@ -0,0 +1,158 @@
+import json
+from types import SimpleNamespace
+
+from django.core.exceptions import BadRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.forms import ModelForm, modelform_factory
+from django.forms.models import model_to_dict
+from django.http import Http404, HttpResponse, JsonResponse
+from django.views.generic import View
+from django.views.generic.detail import SingleObjectMixin
+from django.views.generic.list import MultipleObjectMixin
+
+from generic_scaffold.lookups import get_object_filter
+from generic_scaffold.pagination import KeysetPaginationMixin
+
+
+class ApiMixin(object):
+    api_fields = ()
+    fields_kwarg = 'fields'
+
+    def get_api_fields(self):
+        "The fields of api_fields selected with ?fields=a,b (all of them by default)"
+        selected = self.request.GET.get(self.fields_kwarg)
+        if not selected:
+            return list(self.api_fields)
+        fields = [field for field in selected.split(',') if field]
+        unknown = [field for field in fields if field not in self.api_fields]
+        if unknown:
+            raise BadRequest('Unknown fields: {0}'.format(', '.join(unknown)))
+        return fields
+
+    def render_json(self, data, status=200):
+        return JsonResponse(data, encoder=DjangoJSONEncoder, status=status)
+
+    def get_page_url(self, **params):
+        query = self.request.GET.copy()
+        query.pop('page', None)
+        query.pop('cursor', None)
+        query.update(params)
+        return '{0}?{1}'.format(self.request.path, query.urlencode())
+
+
+class ApiListView(ApiMixin, MultipleObjectMixin, View):
+    paginate_by = 25
+
+    def get_values_fields(self, fields):
+        return fields
+
+    def get_rows(self, page_rows, fields):
+        return list(page_rows)
+
+    def get(self, request, *args, **kwargs):
+        fields = self.get_api_fields()
+        queryset = self.get_queryset().values(*self.get_values_fields(fields))
+        paginator, page, rows, is_paginated = self.paginate_queryset(queryset, self.paginate_by)
+
+        data = {'results': self.get_rows(rows, fields)}
+        if paginator is not None:
+            if getattr(paginator, 'count_strategy', 'exact') != 'none':
+                data['count'] = paginator.count
+            data['next'] = page.has_next() and self.get_page_url(page=page.next_page_number()) or None
+            data['previous'] = page.has_previous() and self.get_page_url(
+                page=page.previous_page_number()
+            ) or None
+        else:
+            data['next'] = page.has_next() and self.get_page_url(cursor=page.next_cursor) or None
+            data['previous'] = page.has_previous() and self.get_page_url(
+                cursor=page.previous_cursor
+            ) or None
+        return self.render_json(data)
+
+
+class ApiKeysetListView(KeysetPaginationMixin, ApiListView):
+    def get_values_fields(self, fields):
+        # The cursor needs the ordering fields even if they were not selected
+        keyset_fields = [field.attname for field, _ in self.get_keyset_fields(self.get_queryset())]
+        return fields + [field for field in keyset_fields if field not in fields]
+
+    def get_cursor_values(self, fields, row):
+        return super(ApiKeysetListView, self).get_cursor_values(fields, SimpleNamespace(**row))
+
+    def get_rows(self, page_rows, fields):
+        return [dict((field, row[field]) for field in fields) for row in page_rows]
+
+
+class ApiDetailView(ApiMixin, SingleObjectMixin, View):
+    def get(self, request, *args, **kwargs):
+        queryset = self.get_queryset().filter(**get_object_filter(self))
+        try:
+            return self.render_json(queryset.values(*self.get_api_fields()).get())
+        except queryset.model.DoesNotExist:
+            raise Http404('No {0} found matching the query'.format(queryset.model._meta.verbose_name))
+
+
+class ApiFormMixin(ApiMixin, SingleObjectMixin):
+    form_class = None
+    fields = None
+    http_method_names = ['post', 'put']
+
+    def get_form_class(self):
+        return self.form_class or modelform_factory(self.model, form=ModelForm, fields=self.fields)
+
+    def get_data(self):
+        "Accept both a json object body and normal form data"
+        if self.request.content_type == 'application/json':
+            try:
+                data = json.loads(self.request.body or b'{}')
+            except ValueError:
+                data = None
+            return data if isinstance(data, dict) else None
+        return self.request.POST
+
+    def get_api_form(self, data):
+        form_class = self.get_form_class()
+        if self.object is not None and self.request.content_type == 'application/json':
+            # A json body may contain only the changed fields; the missing
+            # ones keep their current values instead of being emptied
+            data = dict(model_to_dict(self.object, fields=form_class.base_fields), **data)
+        return form_class(data=data, files=self.request.FILES, instance=self.object)
+
+    def serialize(self, obj):
+        return dict((field, getattr(obj, field)) for field in self.api_fields)
+
+    def save_form(self, status):
+        data = self.get_data()
+        if data is None:
+            raise BadRequest('Invalid JSON object')
+        form = self.get_api_form(data)
+        if not form.is_valid():
+            return self.render_json({'errors': form.errors.get_json_data()}, 400)
+        self.object = form.save()
+        return self.render_json(self.serialize(self.object), status)
+
+
+class ApiCreateView(ApiFormMixin, View):
+    def post(self, request, *args, **kwargs):
+        self.object = None
+        return self.save_form(201)
+
+    put = post
+
+
+class ApiUpdateView(ApiFormMixin, View):
+    def post(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        return self.save_form(200)
+
+    put = post
+
+
+class ApiDeleteView(SingleObjectMixin, View):
+    http_method_names = ['post', 'delete']
+
+    def post(self, request, *args, **kwargs):
+        self.get_object().delete()
+        return HttpResponse(status=204)
+
+    delete = post
@@ -0,0 +1,233 @@
+import asyncio
+import inspect
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ImproperlyConfigured
+from django.core.paginator import InvalidPage, Paginator
+from django.http import Http404, HttpResponse, HttpResponseRedirect
+from django.utils.translation import gettext as _
+from django.views.generic import View
+from django.views.generic.detail import SingleObjectMixin, SingleObjectTemplateResponseMixin
+from django.views.generic.edit import ModelFormMixin
+from django.views.generic.list import MultipleObjectMixin, MultipleObjectTemplateResponseMixin
+
+
+def async_permission(decorator, view):
+    """
+    Apply a permission decorator (like login_required) to an async view. If
+    the decorator is not async aware it is called in a thread (so it may use
+    the database i.e to load request.user) and the coroutine it returns
+    (when the permission check passes) is awaited.
+    """
+    decorated = decorator(view)
+    # Don't trust asyncio.iscoroutinefunction here: functools.wraps copies the
+    # coroutine marker of the async view to sync wrappers like login_required
+    code = getattr(decorated, '__code__', None)
+    if decorated is view or (code is not None and code.co_flags & inspect.CO_COROUTINE):
+        return decorated
+
+    def call_decorated(request, *args, **kwargs):
+        return decorated(request, *args, **kwargs)
+
+    async def async_decorated(request, *args, **kwargs):
+        response = await sync_to_async(call_decorated)(request, *args, **kwargs)
+        if asyncio.iscoroutine(response):
+            response = await response
+        return response
+
+    for attr in ['view_class', 'view_initkwargs', 'csrf_exempt']:
+        if hasattr(decorated, attr):
+            setattr(async_decorated, attr, getattr(decorated, attr))
+    return async_decorated
+
+
+def render_now(response):
+    "Render a TemplateResponse and return it as a plain HttpResponse"
+    response.render()
+    return HttpResponse(
+        response.content, content_type=response['Content-Type'], status=response.status_code
+    )
+
+
+async def arender(response):
+    """
+    Render a TemplateResponse in a thread since the template may need the
+    database (i.e the __str__ of an object that uses a foreign key or the
+    request.user of a base template).
+    """
+    return await sync_to_async(render_now)(response)
+
+
+async def fetch(queryset):
+    "Evaluate the queryset without blocking so it can be used in templates"
+    async for obj in queryset:
+        pass
+    return queryset
+
+
+class AsyncSingleObjectMixin(SingleObjectMixin):
+    async def aget_object(self, queryset=None):
+        if queryset is None:
+            queryset = self.get_queryset()
+
+        pk = self.kwargs.get(self.pk_url_kwarg)
+        slug = self.kwargs.get(self.slug_url_kwarg)
+        if pk is not None:
+            queryset = queryset.filter(pk=pk)
+        if slug is not None and (pk is None or self.query_pk_and_slug):
+            queryset = queryset.filter(**{self.get_slug_field(): slug})
+        if pk is None and slug is None:
+            raise AttributeError(
+                'Generic detail view %s must be called with either an object '
+                'pk or a slug in the URLconf.' % self.__class__.__name__
+            )
+
+        try:
+            return await queryset.aget()
+        except queryset.model.DoesNotExist:
+            raise Http404(_('No %(verbose_name)s found matching the query') % {
+                'verbose_name': queryset.model._meta.verbose_name
+            })
+
+
+class AsyncListView(MultipleObjectTemplateResponseMixin, MultipleObjectMixin, View):
+    async def apaginate_queryset(self, queryset, page_size):
+        paginator = self.get_paginator(
+            queryset, page_size, orphans=self.get_paginate_orphans(),
+            allow_empty_first_page=self.get_allow_empty(),
+        )
+        if type(paginator).count is Paginator.count:
+            # Set the cached count so the paginator will not query it again
+            paginator.count = await queryset.acount()
+        elif not hasattr(paginator, 'apage'):
+            # The count may come from the cache or the database statistics
+            await sync_to_async(getattr)(paginator, 'count')
+
+        page_kwarg = self.page_kwarg
+        page = self.kwargs.get(page_kwarg) or self.request.GET.get(page_kwarg) or 1
+        try:
+            page_number = int(page)
+        except ValueError:
+            if page == 'last':
+                page_number = paginator.num_pages
+            else:
+                raise Http404(_('Page is not “last”, nor can it be converted to an int.'))
+        try:
+            if hasattr(paginator, 'apage'):
+                page = await paginator.apage(page_number)
+            else:
+                page = paginator.page(page_number)
+        except InvalidPage as e:
+            raise Http404(_('Invalid page (%(page_number)s): %(message)s') % {
+                'page_number': page_number, 'message': str(e)
+            })
+        if not isinstance(page.object_list, list):
+            page.object_list = await fetch(page.object_list)
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    def get_context_data(self, **kwargs):
+        # Like MultipleObjectMixin.get_context_data but uses the page that
+        # get() has already fetched instead of paginating again
+        queryset = self.object_list
+        context_object_name = self.get_context_object_name(queryset)
+        if self.pagination:
+            paginator, page, queryset, is_paginated = self.pagination
+        else:
+            paginator, page, is_paginated = None, None, False
+        context = {
+            'paginator': paginator,
+            'page_obj': page,
+            'is_paginated': is_paginated,
+            'object_list': queryset,
+        }
+        if context_object_name is not None:
+            context[context_object_name] = queryset
+        context.update(kwargs)
+        return super(MultipleObjectMixin, self).get_context_data(**context)
+
+    async def get(self, request, *args, **kwargs):
+        self.object_list = self.get_queryset()
+        self.pagination = None
+        page_size = self.get_paginate_by(self.object_list)
+        if page_size:
+            self.pagination = await self.apaginate_queryset(self.object_list, page_size)
+            is_empty = not self.pagination[2]
+        else:
+            await fetch(self.object_list)
+            is_empty = not self.object_list
+
+        if not self.get_allow_empty() and is_empty:
+            raise Http404(_('Empty list and “%(class_name)s.allow_empty” is False.') % {
+                'class_name': self.__class__.__name__,
+            })
+        return await arender(self.render_to_response(self.get_context_data()))
+
+
+class AsyncDetailView(SingleObjectTemplateResponseMixin, AsyncSingleObjectMixin, View):
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        return await arender(self.render_to_response(self.get_context_data(object=self.object)))
+
+
+class AsyncFormMixin(SingleObjectTemplateResponseMixin, ModelFormMixin, AsyncSingleObjectMixin):
+    template_name_suffix = '_form'
+
+    async def render_form(self, form, **response_kwargs):
+        response = self.render_to_response(self.get_context_data(form=form), **response_kwargs)
+        return await arender(response)
+
+    async def aform_valid(self, form):
+        self.object = form.save(commit=False)
+        await self.object.asave()
+        if form._meta.model._meta.many_to_many:
+            await sync_to_async(form.save_m2m)()
+        return HttpResponseRedirect(self.get_success_url())
+
+    async def get(self, request, *args, **kwargs):
+        return await self.render_form(self.get_form())
+
+    async def post(self, request, *args, **kwargs):
+        form = self.get_form()
+        if await sync_to_async(form.is_valid)():
+            return await self.aform_valid(form)
+        return await self.render_form(form)
+
+
+class AsyncCreateView(AsyncFormMixin, View):
+    async def get(self, request, *args, **kwargs):
+        self.object = None
+        return await super(AsyncCreateView, self).get(request, *args, **kwargs)
+
+    async def post(self, request, *args, **kwargs):
+        self.object = None
+        return await super(AsyncCreateView, self).post(request, *args, **kwargs)
+
+
+class AsyncUpdateView(AsyncFormMixin, View):
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        return await super(AsyncUpdateView, self).get(request, *args, **kwargs)
+
+    async def post(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        return await super(AsyncUpdateView, self).post(request, *args, **kwargs)
+
+
+class AsyncDeleteView(SingleObjectTemplateResponseMixin, AsyncSingleObjectMixin, View):
+    template_name_suffix = '_confirm_delete'
+    success_url = None
+
+    def get_success_url(self):
+        if self.success_url:
+            return self.success_url.format(**self.object.__dict__)
+        raise ImproperlyConfigured('No URL to redirect to. Provide a success_url.')
+
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        return await arender(self.render_to_response(self.get_context_data(object=self.object)))
+
+    async def post(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        success_url = self.get_success_url()
+        await self.object.adelete()
+        return HttpResponseRedirect(success_url)
@@ -0,0 +1,180 @@
+import operator
+from functools import reduce
+
+from django import forms
+from django.core.cache import caches
+from django.core.exceptions import BadRequest, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import CharField, Q
+from django.http import JsonResponse
+from django.urls import NoReverseMatch, reverse
+from django.views.generic import View
+from django.views.generic.list import MultipleObjectMixin
+
+from generic_scaffold.counts import estimate_count
+from generic_scaffold.filters import get_indexed_fields
+
+
+def get_autocomplete_fields(model):
+    "The indexed text fields of model that can be searched by prefix"
+    indexed = get_indexed_fields(model)
+    return [
+        f.name for f in model._meta.concrete_fields
+        if isinstance(f, CharField) and f.name in indexed
+    ]
+
+
+def get_count_key(model):
+    return 'generic_scaffold:autocomplete_count:{0}'.format(model._meta.label_lower)
+
+
+def count_rows(model):
+    queryset = model._default_manager.all()
+    count = estimate_count(queryset)
+    return queryset.count() if count is None else count
+
+
+class AutocompleteView(MultipleObjectMixin, View):
+    """
+    Return the objects whose autocomplete_fields start with ?q= as json:
+    {"results": [{"id": ..., "text": ...}], "more": true|false}
+    """
+    autocomplete_fields = ()
+    query_kwarg = 'q'
+    paginate_by = 20
+
+    def get_search_filter(self, query):
+        if self.autocomplete_fields:
+            # A case sensitive prefix search can use the index of the fields
+            return reduce(operator.or_, [
+                Q(**{'{0}__startswith'.format(name): query}) for name in self.autocomplete_fields
+            ])
+        try:
+            return Q(pk=self.model._meta.pk.to_python(query))
+        except ValidationError:
+            return None
+
+    def get_queryset(self):
+        queryset = super(AutocompleteView, self).get_queryset()
+        query = self.request.GET.get(self.query_kwarg, '').strip()
+        if query:
+            search = self.get_search_filter(query)
+            queryset = queryset.filter(search) if search is not None else queryset.none()
+        return queryset.order_by(*(list(self.autocomplete_fields[:1]) + ['pk']))
+
+    def get_page_number(self):
+        try:
+            page = int(self.request.GET.get(self.page_kwarg, 1))
+        except ValueError:
+            page = 0
+        if page < 1:
+            raise BadRequest('Invalid page')
+        return page
+
+    def get(self, request, *args, **kwargs):
+        offset = (self.get_page_number() - 1) * self.paginate_by
+        # Fetch one more row to know if there's a next page without counting
+        rows = list(self.get_queryset()[offset:offset + self.paginate_by + 1])
+        return JsonResponse({
+            'results': [{'id': obj.pk, 'text': str(obj)} for obj in rows[:self.paginate_by]],
+            'more': len(rows) > self.paginate_by,
+        }, encoder=DjangoJSONEncoder)
+
+
+class AutocompleteWidgetMixin(object):
+    """
+    Render only the selected options (instead of the whole related table)
+    when the related table is big, plus a search input that uses the
+    autocomplete url of the related model.
+    """
+    template_name = 'generic_scaffold/widgets/autocomplete.html'
+
+    def __init__(self, url, is_big, attrs=None):
+        super(AutocompleteWidgetMixin, self).__init__(attrs)
+        self.url = url
+        self.is_big = is_big
+        self.lazy = False
+
+    def get_selected_choices(self, value):
+        iterator = self.choices
+        choices = []
+        if iterator.field.empty_label is not None and not self.allow_multiple_selected:
+            choices.append(('', iterator.field.empty_label))
+        values = [v for v in value if v not in (None, '')]
+        if values:
+            try:
+                selected = list(iterator.queryset.filter(pk__in=values))
+            except (ValueError, ValidationError):
+                selected = []
+            choices.extend(iterator.choice(obj) for obj in selected)
+        return choices
+
+    def optgroups(self, name, value, attrs=None):
+        if not self.lazy:
+            return super(AutocompleteWidgetMixin, self).optgroups(name, value, attrs)
+        choices, self.choices = self.choices, self.get_selected_choices(value)
+        try:
+            return super(AutocompleteWidgetMixin, self).optgroups(name, value, attrs)
+        finally:
+            self.choices = choices
+
+    def get_context(self, name, value, attrs):
+        self.lazy = self.is_big()
+        context = super(AutocompleteWidgetMixin, self).get_context(name, value, attrs)
+        context['widget']['lazy'] = self.lazy
+        context['widget']['autocomplete_url'] = self.url
+        return context
+
+
+class AutocompleteSelect(AutocompleteWidgetMixin, forms.Select):
+    pass
+
+
+class AutocompleteSelectMultiple(AutocompleteWidgetMixin, forms.SelectMultiple):
+    pass
+
+
+class AutocompleteWidgetsMixin(object):
+    "Use the autocomplete widgets for the relations of the generated forms"
+    # field name: autocomplete url name of the related model
+    autocomplete_widgets = {}
+    autocomplete_threshold = 1000
+    # The number of rows of the related models is cached for this many seconds
+    autocomplete_count_timeout = 300
+    cache_alias = 'default'
+
+    def is_big_table(self, model):
+        cache = caches[self.cache_alias]
+        key = get_count_key(model)
+        size = cache.get(key)
+        if size is None:
+            size = count_rows(model)
+            cache.set(key, size, self.autocomplete_count_timeout)
+        return size > self.autocomplete_threshold
+
+    def get_form(self, form_class=None):
+        form = super(AutocompleteWidgetsMixin, self).get_form(form_class)
+        for name, url_name in self.autocomplete_widgets.items():
+            field = form.fields.get(name)
+            if not isinstance(field, forms.ModelChoiceField):
+                continue
+            model = field.queryset.model
+            # The autocomplete results are identified by their primary key
+            if field.to_field_name not in (None, model._meta.pk.name):
+                continue
+            # The urls of the related scaffold may not be included
+            try:
+                url = reverse(url_name)
+            except NoReverseMatch:
+                continue
+            if isinstance(field, forms.ModelMultipleChoiceField):
+                widget_class = AutocompleteSelectMultiple
+            else:
+                widget_class = AutocompleteSelect
+            widget = widget_class(
+                url, lambda model=model: self.is_big_table(model), attrs=field.widget.attrs
+            )
+            widget.is_required = field.widget.is_required
+            widget.choices = field.choices
+            field.widget = widget
+        return form
@@ -0,0 +1,170 @@
+import csv
+import io
+
+from django.core.exceptions import ValidationError
+from django.db import router, transaction
+from django.forms import ModelForm, modelformset_factory
+from django.http import HttpResponseBadRequest, HttpResponseRedirect
+from django.views.generic import View
+from django.views.generic.list import MultipleObjectMixin, MultipleObjectTemplateResponseMixin
+
+
+class BulkMixin(MultipleObjectMixin):
+    pk_kwarg = 'pk'
+    success_url = None
+    bulk_batch_size = 500
+
+    def get_selected_pks(self):
+        data = self.request.POST if self.request.method == 'POST' else self.request.GET
+        pk_field = self.model._meta.pk
+        try:
+            return [pk_field.to_python(pk) for pk in data.getlist(self.pk_kwarg)]
+        except ValidationError:
+            return None
+
+    def get_selected_queryset(self, pks):
+        return self.get_queryset().filter(pk__in=pks)
+
+    def get_success_url(self):
+        return self.success_url
+
+    def get_write_database(self):
+        return router.db_for_write(self.model)
+
+    def atomic(self):
+        return transaction.atomic(using=self.get_write_database())
+
+
+class BulkDeleteView(BulkMixin, View):
+    http_method_names = ['post']
+
+    def post(self, request, *args, **kwargs):
+        pks = self.get_selected_pks()
+        if pks is None:
+            return HttpResponseBadRequest()
+        with self.atomic():
+            self.get_selected_queryset(pks).delete()
+        return HttpResponseRedirect(self.get_success_url())
+
+
+class BulkFormsetMixin(MultipleObjectTemplateResponseMixin, BulkMixin):
+    form_class = None
+    fields = None
+    template_name_suffix = '_bulk_form'
+
+    def get_form_class(self):
+        return self.form_class or ModelForm
+
+    def get_formset_class(self, extra=0):
+        return modelformset_factory(
+            self.model, form=self.get_form_class(), fields=self.fields, extra=extra
+        )
+
+    def render_formset(self, formset, **kwargs):
+        return self.render_to_response(
+            self.get_context_data(object_list=self.object_list, formset=formset, **kwargs)
+        )
+
+
+class BulkUpdateView(BulkFormsetMixin, View):
+    formset_prefix = 'form'
+
+    def get(self, request, *args, **kwargs):
+        pks = self.get_selected_pks()
+        if pks is None:
+            return HttpResponseBadRequest()
+        self.object_list = self.get_selected_queryset(pks)
+        formset = self.get_formset_class()(queryset=self.object_list, prefix=self.formset_prefix)
+        return self.render_formset(formset)
+
+    def post(self, request, *args, **kwargs):
+        # The list page posts only the selected pks; show the formset for them
+        if '{0}-TOTAL_FORMS'.format(self.formset_prefix) not in request.POST:
+            return self.get(request, *args, **kwargs)
+
+        pks = self.get_selected_pks()
+        if pks is None:
+            return HttpResponseBadRequest()
+        self.object_list = self.get_selected_queryset(pks)
+        formset = self.get_formset_class()(
+            request.POST, request.FILES, queryset=self.object_list, prefix=self.formset_prefix
+        )
+        if not formset.is_valid():
+            return self.render_formset(formset)
+
+        self.save(formset)
+        return HttpResponseRedirect(self.get_success_url())
+
+    def save(self, formset):
+        opts = self.model._meta
+        concrete_fields = set(f.name for f in opts.concrete_fields if not f.primary_key)
+        m2m_fields = set(f.name for f in opts.many_to_many)
+
+        objects, update_fields, m2m_forms = [], set(), []
+        for form in formset.forms:
+            if not form.has_changed():
+                continue
+            objects.append(form.save(commit=False))
+            update_fields.update(concrete_fields.intersection(form.changed_data))
+            if m2m_fields.intersection(form.changed_data):
+                m2m_forms.append(form)
+
+        with self.atomic():
+            if objects and update_fields:
+                self.model._default_manager.db_manager(self.get_write_database()).bulk_update(
+                    objects, sorted(update_fields), batch_size=self.bulk_batch_size
+                )
+            for form in m2m_forms:
+                form.save_m2m()
+        return objects
+
+
+class BulkCreateView(BulkFormsetMixin, View):
+    formset_prefix = 'form'
+    bulk_create_extra = 10
+    csv_field = 'csv'
+
+    def get_formset(self, data=None, files=None):
+        return self.get_formset_class(extra=self.bulk_create_extra)(
+            data, files, queryset=self.model._default_manager.none(), prefix=self.formset_prefix
+        )
+
+    def get_csv_forms(self, text):
+        form_class = self.get_formset_class().form
+        reader = csv.DictReader(io.StringIO(text.strip()))
+        return [form_class(data=row) for row in reader]
+
+    def get(self, request, *args, **kwargs):
+        self.object_list = self.model._default_manager.none()
+        return self.render_formset(self.get_formset(), csv_field=self.csv_field)
+
+    def post(self, request, *args, **kwargs):
+        self.object_list = self.model._default_manager.none()
+        csv_text = request.POST.get(self.csv_field, '')
+        if csv_text.strip():
+            formset = self.get_formset()
+            forms = self.get_csv_forms(csv_text)
+            csv_errors = [(i + 1, form.errors) for i, form in enumerate(forms) if not form.is_valid()]
+            if csv_errors:
+                return self.render_formset(
+                    formset, csv_field=self.csv_field, csv_errors=csv_errors, csv_text=csv_text
+                )
+        else:
+            formset = self.get_formset(request.POST, request.FILES)
+            if not formset.is_valid():
+                return self.render_formset(formset, csv_field=self.csv_field)
+            forms = [form for form in formset.forms if form.has_changed()]
+
+        self.save(forms)
+        return HttpResponseRedirect(self.get_success_url())
+
+    def save(self, forms):
+        objects = [form.save(commit=False) for form in forms]
+        with self.atomic():
+            self.model._default_manager.db_manager(self.get_write_database()).bulk_create(
+                objects, batch_size=self.bulk_batch_size
+            )
+            if self.model._meta.many_to_many:
+                for form in forms:
+                    form.save_m2m()
+        return objects
@@ -0,0 +1,107 @@
+import hashlib
+import time
+
+from asgiref.sync import sync_to_async
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+from django.http import HttpResponse
+
+
+def get_version_key(model):
+    if isinstance(model, str):
+        app_label, model_name = model.split('.')
+    else:
+        app_label, model_name = model._meta.app_label, model._meta.model_name
+    return 'generic_scaffold:version:{0}.{1}'.format(app_label, model_name.lower())
+
+
+def get_model_version(model, cache):
+    key = get_version_key(model)
+    version = cache.get(key)
+    if version is None:
+        # Start from the current time instead of 1 so that entries cached
+        # before the version key was evicted will never be used again
+        cache.add(key, int(time.time() * 1000), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_model_version(model, cache):
+    key = get_version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, int(time.time() * 1000), None)
+
+
+def connect_cache_signals(model, cache_alias):
+    def receiver(sender, **kwargs):
+        bump_model_version(sender, caches[cache_alias])
+
+    dispatch_uid = '{0}:{1}'.format(get_version_key(model), cache_alias)
+    post_save.connect(receiver, sender=model, weak=False, dispatch_uid=dispatch_uid)
+    post_delete.connect(receiver, sender=model, weak=False, dispatch_uid=dispatch_uid)
+
+
+class CacheResponseMixin(object):
+    cache_timeout = None
+    cache_alias = 'default'
+    cache_per_user = True
+    cache_key_prefix = ''
+
+    def get_cache_key(self, request):
+        cache = caches[self.cache_alias]
+        user = getattr(request, 'user', None)
+        if self.cache_per_user and user is not None and user.is_authenticated:
+            scope = user.pk
+        else:
+            scope = ''
+        return 'generic_scaffold:response:{0}:{1}:{2}:{3}'.format(
+            self.cache_key_prefix,
+            get_model_version(self.model, cache),
+            scope,
+            hashlib.md5(request.get_full_path().encode('utf-8')).hexdigest(),
+        )
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return super(CacheResponseMixin, self).dispatch(request, *args, **kwargs)
+
+        cache = caches[self.cache_alias]
+        key = self.get_cache_key(request)
+        cached = cache.get(key)
+        if cached is not None:
+            content, content_type = cached
+            return HttpResponse(content, content_type=content_type)
+
+        response = super(CacheResponseMixin, self).dispatch(request, *args, **kwargs)
+        if hasattr(response, 'render') and callable(response.render):
+            response.render()
+
+        # Don't cache pages containing a csrf token since it's different for each client
+        csrf_used = request.META.get('CSRF_COOKIE_NEEDS_UPDATE') or request.META.get('CSRF_COOKIE_USED')
+        if response.status_code == 200 and not response.streaming and not csrf_used:
+            cache.set(key, (response.content, response['Content-Type']), self.cache_timeout)
+        return response
+
+
+class InvalidateCacheMixin(object):
+    cache_alias = 'default'
+
+    def should_invalidate(self, request, response):
+        return request.method == 'POST' and 300 <= response.status_code < 400
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.view_is_async:
+            return self.async_dispatch(request, *args, **kwargs)
+        response = super(InvalidateCacheMixin, self).dispatch(request, *args, **kwargs)
+        if self.should_invalidate(request, response):
+            bump_model_version(self.model, caches[self.cache_alias])
+        return response
+
+    async def async_dispatch(self, request, *args, **kwargs):
+        response = await super(InvalidateCacheMixin, self).dispatch(request, *args, **kwargs)
+        if self.should_invalidate(request, response):
+            # The cache backend may need the database
+            await sync_to_async(bump_model_version)(self.model, caches[self.cache_alias])
+        return response
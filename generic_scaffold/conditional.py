@@ -0,0 +1,71 @@
+import calendar
+import hashlib
+
+from django.core.cache import caches
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from generic_scaffold.cache import get_model_version
+from generic_scaffold.lookups import get_object_filter
+
+
+class ConditionalGetMixin(object):
+    last_modified_field = None
+    etag_strategy = None
+    cache_alias = 'default'
+
+    def get_validator_queryset(self):
+        return self.get_queryset().select_related(None).prefetch_related(None).order_by()
+
+    def get_last_modified_and_count(self):
+        queryset = self.get_validator_queryset()
+        if self.kind == 'detail':
+            queryset = queryset.filter(**get_object_filter(self))
+        if self.last_modified_field:
+            result = queryset.aggregate(last_modified=Max(self.last_modified_field), count=Count('pk'))
+        else:
+            result = queryset.aggregate(count=Count('pk'))
+        return result.get('last_modified'), result['count']
+
+    def get_validators(self):
+        # Deleting a row doesn't change the Max of last_modified_field, so a
+        # list is validated by an ETag that contains the count of its rows
+        is_list = self.kind == 'list'
+        aggregate = self.etag_strategy == 'aggregate' or (is_list and self.etag_strategy is None)
+        last_modified, count = None, None
+        if self.last_modified_field or self.etag_strategy == 'aggregate':
+            last_modified, count = self.get_last_modified_and_count()
+
+        etag = None
+        if aggregate and count is not None:
+            etag = '{0}:{1}'.format(last_modified and last_modified.isoformat(), count)
+        elif self.etag_strategy == 'version':
+            etag = str(get_model_version(self.model, caches[self.cache_alias]))
+        if etag is not None:
+            etag = quote_etag(hashlib.md5(
+                '{0}:{1}'.format(self.kind, etag).encode('utf-8')
+            ).hexdigest())
+
+        if is_list:
+            last_modified = None
+        if last_modified is not None:
+            last_modified = calendar.timegm(last_modified.utctimetuple())
+        return etag, last_modified
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return super(ConditionalGetMixin, self).dispatch(request, *args, **kwargs)
+
+        etag, last_modified = self.get_validators()
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is not None:
+            return response
+
+        response = super(ConditionalGetMixin, self).dispatch(request, *args, **kwargs)
+        if response.status_code == 200:
+            if etag and not response.has_header('ETag'):
+                response['ETag'] = etag
+            if last_modified and not response.has_header('Last-Modified'):
+                response['Last-Modified'] = http_date(last_modified)
+        return response
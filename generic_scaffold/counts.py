@@ -0,0 +1,132 @@
+import hashlib
+import json
+
+from django.core.cache import caches
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+
+from generic_scaffold.cache import get_model_version
+
+
+def estimate_count(queryset):
+    """
+    Return the number of rows of queryset as estimated by the query planner
+    or None if the database can't estimate it (only postgresql can).
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            # The statistics of the table are enough for unfiltered lists
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+                [connection.ops.quote_name(queryset.model._meta.db_table)]
+            )
+            row = cursor.fetchone()
+            return int(row[0]) if row and row[0] >= 0 else None
+
+        sql, params = queryset.order_by().query.get_compiler(using=queryset.db).as_sql()
+        cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class CachedCountPaginator(Paginator):
+    "Keep the count in the cache until it expires or the model is changed"
+    count_strategy = 'cached'
+    cache_alias = 'default'
+    count_timeout = 300
+
+    def get_count_cache_key(self, cache):
+        return 'generic_scaffold:count:{0}:{1}'.format(
+            get_model_version(self.object_list.model, cache),
+            hashlib.md5(str(self.object_list.query).encode('utf-8')).hexdigest(),
+        )
+
+    @cached_property
+    def count(self):
+        cache = caches[self.cache_alias]
+        key = self.get_count_cache_key(cache)
+        count = cache.get(key)
+        if count is None:
+            count = super(CachedCountPaginator, self).count
+            cache.set(key, count, self.count_timeout)
+        return count
+
+
+class EstimatedCountPaginator(Paginator):
+    "Use the estimate of the query planner for big tables"
+    count_strategy = 'estimated'
+    # Small estimates may be way off (i.e for tables that haven't been
+    # analyzed yet) and are cheap to count exactly
+    exact_count_below = 10000
+
+    @cached_property
+    def count(self):
+        estimate = estimate_count(self.object_list)
+        if estimate is None or estimate < self.exact_count_below:
+            return super(EstimatedCountPaginator, self).count
+        return estimate
+
+
+class NoCountPage(Page):
+    def __init__(self, object_list, number, paginator, has_next):
+        super(NoCountPage, self).__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+    def next_page_number(self):
+        return self.number + 1
+
+    def previous_page_number(self):
+        return self.number - 1
+
+
+class NoCountPaginator(Paginator):
+    """
+    Never count the rows; fetch one more row than the page size to find out
+    if there's a next page.
+    """
+    count_strategy = 'none'
+
+    def validate_number(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(_('That page number is not an integer'))
+        if number < 1:
+            raise EmptyPage(_('That page number is less than 1'))
+        return number
+
+    def get_page_slice(self, number):
+        bottom = (number - 1) * self.per_page
+        return self.object_list[bottom:bottom + self.per_page + 1]
+
+    def make_page(self, rows, number):
+        if not rows and (number > 1 or not self.allow_empty_first_page):
+            raise EmptyPage(_('That page contains no results'))
+        return NoCountPage(rows[:self.per_page], number, self, len(rows) > self.per_page)
+
+    def page(self, number):
+        number = self.validate_number(number)
+        return self.make_page(list(self.get_page_slice(number)), number)
+
+    async def apage(self, number):
+        number = self.validate_number(number)
+        return self.make_page([obj async for obj in self.get_page_slice(number)], number)
+
+
+PAGINATOR_CLASSES = {
+    'exact': Paginator,
+    'cached': CachedCountPaginator,
+    'estimated': EstimatedCountPaginator,
+    'none': NoCountPaginator,
+}
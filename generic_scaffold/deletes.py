@@ -0,0 +1,80 @@
+import warnings
+
+from django.db import models
+from django.db.models.signals import post_delete, pre_delete
+from django.http import Http404, HttpResponseRedirect
+from django.utils.translation import gettext as _
+
+from generic_scaffold.lookups import get_object_filter
+
+BIG_FIELD_CLASSES = (models.TextField, models.JSONField, models.BinaryField)
+
+
+def get_big_fields(model):
+    "The names of the (possibly huge) text, json and binary columns of model"
+    return [
+        f.name for f in model._meta.concrete_fields
+        if isinstance(f, BIG_FIELD_CLASSES) and not f.primary_key
+    ]
+
+
+class FastDeleteWarning(UserWarning):
+    pass
+
+
+def check_fast_delete(model, label=None):
+    "Warn if django will have to fetch the rows of model to delete them"
+    if pre_delete.has_listeners(model) or post_delete.has_listeners(model):
+        warnings.warn(
+            '{0}: {1} has pre_delete or post_delete receivers so fast_delete will still fetch the rows'.format(
+                label or model.__name__, model._meta.label
+            ), FastDeleteWarning, stacklevel=3,
+        )
+
+
+class FastDeleteMixin(object):
+    """
+    Display the confirmation page without loading the big columns of the
+    object and delete it with a single filtered queryset delete.
+    """
+    delete_fields = None
+
+    def get_confirmation_queryset(self):
+        queryset = self.get_queryset()
+        if self.delete_fields:
+            return queryset.only(*self.delete_fields)
+        return queryset.defer(*get_big_fields(self.model))
+
+    def get_object(self, queryset=None):
+        if queryset is None:
+            queryset = self.get_confirmation_queryset()
+        return super(FastDeleteMixin, self).get_object(queryset)
+
+    def get_delete_queryset(self):
+        return self.get_queryset().filter(**get_object_filter(self))
+
+    def get_not_found_error(self):
+        return Http404(_('No %(verbose_name)s found matching the query') % {
+            'verbose_name': self.model._meta.verbose_name
+        })
+
+    def post(self, request, *args, **kwargs):
+        success_url = self.get_success_url()
+        deleted, _rows = self.get_delete_queryset().delete()
+        if not deleted:
+            raise self.get_not_found_error()
+        return HttpResponseRedirect(success_url)
+
+
+class AsyncFastDeleteMixin(FastDeleteMixin):
+    async def aget_object(self, queryset=None):
+        if queryset is None:
+            queryset = self.get_confirmation_queryset()
+        return await super(AsyncFastDeleteMixin, self).aget_object(queryset)
+
+    async def post(self, request, *args, **kwargs):
+        success_url = self.get_success_url()
+        deleted, _rows = await self.get_delete_queryset().adelete()
+        if not deleted:
+            raise self.get_not_found_error()
+        return HttpResponseRedirect(success_url)
@@ -0,0 +1,63 @@
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import Http404, StreamingHttpResponse
+
+
+class Echo(object):
+    "A file-like object that just returns what is written to it"
+    def write(self, value):
+        return value
+
+
+class ExportMixin(object):
+    export_formats = ('csv', 'ndjson')
+    export_fields = ()
+    export_chunk_size = 2000
+    format_kwarg = 'format'
+
+    content_types = {
+        'csv': 'text/csv',
+        'ndjson': 'application/x-ndjson',
+    }
+
+    def get_export_format(self):
+        export_format = self.request.GET.get(self.format_kwarg, self.export_formats[0])
+        if export_format not in self.export_formats:
+            raise Http404('Unsupported export format')
+        return export_format
+
+    def iter_csv(self, rows):
+        writer = csv.writer(Echo())
+        yield writer.writerow(self.export_fields)
+        for row in rows:
+            yield writer.writerow(row)
+
+    def iter_ndjson(self, rows):
+        encoder = DjangoJSONEncoder()
+        for row in rows:
+            yield encoder.encode(dict(zip(self.export_fields, row))) + '\n'
+
+    def iter_chunks(self, lines):
+        chunk = []
+        for line in lines:
+            chunk.append(line)
+            if len(chunk) >= self.export_chunk_size:
+                yield ''.join(chunk)
+                chunk = []
+        if chunk:
+            yield ''.join(chunk)
+
+    def get(self, request, *args, **kwargs):
+        export_format = self.get_export_format()
+        queryset = self.get_queryset().values_list(*self.export_fields)
+        rows = queryset.iterator(chunk_size=self.export_chunk_size)
+        lines = getattr(self, 'iter_' + export_format)(rows)
+
+        response = StreamingHttpResponse(
+            self.iter_chunks(lines), content_type=self.content_types[export_format]
+        )
+        response['Content-Disposition'] = 'attachment; filename="{0}.{1}"'.format(
+            self.model._meta.model_name, export_format
+        )
+        return response
@@ -0,0 +1,154 @@
+import operator
+import warnings
+from functools import reduce
+
+from django.core.exceptions import BadRequest, FieldDoesNotExist, ImproperlyConfigured, ValidationError
+from django.db.models import Q
+
+RANGE_LOOKUPS = ('gt', 'gte', 'lt', 'lte')
+PREFIX_LOOKUPS = ('startswith', 'istartswith')
+
+# The prefix and exact searches are case sensitive so that they can use a
+# normal index of the column (like the autocomplete)
+SEARCH_LOOKUPS = {
+    '^': 'startswith',
+    '=': 'exact',
+    '': 'icontains',
+}
+
+
+class MissingIndexWarning(UserWarning):
+    pass
+
+
+def split_search_field(name):
+    if name[:1] in ('^', '='):
+        return name[1:], SEARCH_LOOKUPS[name[0]]
+    return name, SEARCH_LOOKUPS['']
+
+
+def get_indexed_fields(model):
+    "The names of the fields that are the first column of an index"
+    opts = model._meta
+    indexed = set()
+    for field in opts.concrete_fields:
+        if field.primary_key or field.unique or field.db_index:
+            indexed.update([field.name, field.attname])
+    for index in opts.indexes:
+        if index.fields:
+            indexed.add(index.fields[0].lstrip('-'))
+    for constraint in opts.constraints:
+        fields = getattr(constraint, 'fields', None)
+        if fields:
+            indexed.add(fields[0])
+    for fields in opts.unique_together:
+        indexed.add(fields[0])
+    for fields in getattr(opts, 'index_together', ()):
+        indexed.add(fields[0])
+    return indexed
+
+
+def check_indexes(model, filter_fields=(), search_fields=(), ordering=(), label=None):
+    """
+    Warn (with a MissingIndexWarning) for each field that will be used to
+    filter or order a list that is not the first column of an index.
+    """
+    indexed = get_indexed_fields(model)
+    label = label or model.__name__
+
+    for name in filter_fields:
+        try:
+            model._meta.get_field(name)
+        except FieldDoesNotExist:
+            raise ImproperlyConfigured(
+                '{0}: {1} is not a field of {2}'.format(label, name, model._meta.label)
+            )
+
+    def check(name, usage):
+        name = name.lstrip('-')
+        if name == 'pk' or '__' in name or name in indexed:
+            return
+        warnings.warn(
+            '{0}: {1} field {2}.{3} has no database index'.format(
+                label, usage, model._meta.label, name
+            ), MissingIndexWarning, stacklevel=3,
+        )
+
+    for name in filter_fields:
+        check(name, 'filter')
+    for name in search_fields:
+        name, lookup = split_search_field(name)
+        # contains can't use a normal index anyway
+        if lookup != 'icontains':
+            check(name, 'search')
+    for name in ordering:
+        check(name, 'ordering')
+
+
+class FilterMixin(object):
+    list_filter_fields = ()
+    search_fields = ()
+    search_kwarg = 'q'
+
+    def get_filter_field(self, name):
+        if name in self.list_filter_fields:
+            return self.model._meta.get_field(name)
+
+    def get_filters(self):
+        "Return the (lookup, value) filters of the query string"
+        filters = []
+        for key in self.request.GET:
+            name, _, lookup = key.rpartition('__')
+            if lookup not in RANGE_LOOKUPS + PREFIX_LOOKUPS:
+                name, lookup = key, 'exact'
+            field = self.get_filter_field(name)
+            values = [value for value in self.request.GET.getlist(key) if value != '']
+            if field is None or not values:
+                continue
+            if lookup in PREFIX_LOOKUPS:
+                filters.append(('{0}__{1}'.format(name, lookup), values[0]))
+                continue
+            try:
+                values = [field.to_python(value) for value in values]
+            except ValidationError as e:
+                raise BadRequest('{0}: {1}'.format(key, ' '.join(e.messages)))
+            if lookup == 'exact' and len(values) > 1:
+                filters.append(('{0}__in'.format(name), values))
+            else:
+                filters.append(('{0}__{1}'.format(name, lookup), values[0]))
+        return filters
+
+    def get_search_filter(self):
+        query = self.request.GET.get(self.search_kwarg, '').strip()
+        if not query:
+            return None
+        conditions = []
+        for name in self.search_fields:
+            name, lookup = split_search_field(name)
+            conditions.append(Q(**{'{0}__{1}'.format(name, lookup): query}))
+        return reduce(operator.or_, conditions)
+
+    def get_queryset(self):
+        queryset = super(FilterMixin, self).get_queryset()
+        if self.list_filter_fields:
+            filters = self.get_filters()
+            if filters:
+                queryset = queryset.filter(**dict(filters))
+        if self.search_fields:
+            search = self.get_search_filter()
+            if search is not None:
+                queryset = queryset.filter(search)
+        return queryset
+
+    def get_filter_querystring(self):
+        "The filters of the query string, to keep them in the pagination links"
+        query = self.request.GET.copy()
+        for key in ['page', 'cursor']:
+            query.pop(key, None)
+        return query.urlencode() + '&' if query else ''
+
+    def get_context_data(self, **kwargs):
+        context = super(FilterMixin, self).get_context_data(**kwargs)
+        context['search_query'] = self.request.GET.get(self.search_kwarg, '')
+        context['filter_querystring'] = self.get_filter_querystring()
+        return context
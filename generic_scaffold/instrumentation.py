@@ -0,0 +1,147 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import sync_to_async
+from django.db import connections
+from django.dispatch import Signal
+
+# Sent after each request of an instrumented view with the prefix and the
+# action of the CrudManager, the request, the response and the timings
+view_timed = Signal()
+
+# The timings of the current async request. The async ORM runs the queries of
+# all concurrent requests with the same connections, so their execute wrapper
+# must find the request of each query from its context.
+current_timings = ContextVar('generic_scaffold_timings', default=None)
+
+
+class QueryTimer(object):
+    "A connection.execute_wrapper that counts the queries and their duration"
+    def __init__(self, timings):
+        self.timings = timings
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.timings['db'] += time.perf_counter() - start
+            self.timings['queries'] += 1
+
+
+class ContextQueryTimer(object):
+    "A connection.execute_wrapper that counts the queries of the current_timings"
+    def __call__(self, execute, sql, params, many, context):
+        timings = current_timings.get()
+        if timings is None:
+            return execute(sql, params, many, context)
+        return QueryTimer(timings)(execute, sql, params, many, context)
+
+
+context_query_timer = ContextQueryTimer()
+
+
+def install_context_query_timer():
+    for connection in connections.all():
+        if context_query_timer not in connection.execute_wrappers:
+            connection.execute_wrappers.append(context_query_timer)
+
+
+def install_query_timer(timer):
+    for connection in connections.all():
+        connection.execute_wrappers.append(timer)
+
+
+def uninstall_query_timer(timer):
+    for connection in connections.all():
+        if timer in connection.execute_wrappers:
+            connection.execute_wrappers.remove(timer)
+
+
+def get_server_timing(timings):
+    return ', '.join([
+        'queryset;dur={0:.1f}'.format(timings['queryset'] * 1000),
+        'db;dur={0:.1f};desc="{1} queries"'.format(timings['db'] * 1000, timings['queries']),
+        'render;dur={0:.1f}'.format(timings['render'] * 1000),
+        'total;dur={0:.1f}'.format(timings['total'] * 1000),
+    ])
+
+
+class InstrumentationMixin(object):
+    """
+    Time the queryset build, the database queries, the template rendering
+    and the whole request of a view and report them through the view_timed
+    signal, the instrument_callback and (optionally) a Server-Timing header.
+    """
+    instrument_prefix = None
+    instrument_callback = None
+    server_timing = False
+
+    @contextmanager
+    def timer(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] += time.perf_counter() - start
+
+    def get_queryset(self):
+        with self.timer('queryset'):
+            return super(InstrumentationMixin, self).get_queryset()
+
+    def render_to_response(self, context, **response_kwargs):
+        response = super(InstrumentationMixin, self).render_to_response(context, **response_kwargs)
+        if not hasattr(response, 'render'):
+            # A streaming response is rendered while it is sent
+            return response
+        render = response.render
+
+        def timed_render():
+            if response.is_rendered:
+                return render()
+            with self.timer('render'):
+                return render()
+        response.render = timed_render
+        return response
+
+    def report_timings(self, request, response):
+        view_timed.send(
+            sender=self.__class__, prefix=self.instrument_prefix, action=self.kind,
+            timings=self.timings, request=request, response=response,
+        )
+        if self.instrument_callback:
+            self.instrument_callback(self.instrument_prefix, self.kind, self.timings, request, response)
+        if self.server_timing:
+            response['Server-Timing'] = get_server_timing(self.timings)
+
+    def dispatch(self, request, *args, **kwargs):
+        self.timings = {'queryset': 0.0, 'db': 0.0, 'queries': 0, 'render': 0.0, 'total': 0.0}
+        if self.view_is_async:
+            return self.async_dispatch(request, *args, **kwargs)
+
+        timer = QueryTimer(self.timings)
+        install_query_timer(timer)
+        try:
+            with self.timer('total'):
+                response = super(InstrumentationMixin, self).dispatch(request, *args, **kwargs)
+                # Render here so that the queries of the template are counted
+                if hasattr(response, 'render') and callable(response.render):
+                    response.render()
+        finally:
+            uninstall_query_timer(timer)
+        self.report_timings(request, response)
+        return response
+
+    async def async_dispatch(self, request, *args, **kwargs):
+        # The async ORM runs the queries in a thread with its own connections;
+        # sync_to_async passes the context (and so the current_timings) to it
+        token = current_timings.set(self.timings)
+        try:
+            await sync_to_async(install_context_query_timer)()
+            with self.timer('total'):
+                response = await super(InstrumentationMixin, self).dispatch(request, *args, **kwargs)
+        finally:
+            current_timings.reset(token)
+        self.report_timings(request, response)
+        return response
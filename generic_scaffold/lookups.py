@@ -0,0 +1,68 @@
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db import models
+from django.urls.converters import SlugConverter, StringConverter, UUIDConverter
+
+# The regex of the url kwarg for each kind of field and a value matching it
+INT_LOOKUP = (r'\d+', '0')
+UUID_LOOKUP = (UUIDConverter.regex, '00000000-0000-0000-0000-000000000000')
+SLUG_LOOKUP = (SlugConverter.regex, '0')
+STRING_LOOKUP = (StringConverter.regex, '0')
+
+
+def get_lookup_regex(field):
+    "The (regex, sample value) of the urls that select an object by field"
+    while field.is_relation:
+        # A OneToOneField primary key (or a foreign key) has the type of its target
+        field = field.target_field
+    if isinstance(field, (models.AutoField, models.IntegerField)):
+        return INT_LOOKUP
+    if isinstance(field, models.UUIDField):
+        return UUID_LOOKUP
+    if isinstance(field, models.SlugField):
+        return SLUG_LOOKUP
+    return STRING_LOOKUP
+
+
+def is_unique(model, name):
+    field = model._meta.get_field(name)
+    if field.unique:
+        return True
+    for constraint in model._meta.constraints:
+        if (isinstance(constraint, models.UniqueConstraint) and tuple(constraint.fields) == (name, )
+                and constraint.condition is None):
+            return True
+    return any(tuple(fields) == (name, ) for fields in model._meta.unique_together)
+
+
+def get_lookup_field(model, lookup_field=None, label=None):
+    "The field used in the urls of the single object views of model"
+    label = label or model.__name__
+    if lookup_field is None:
+        field = model._meta.pk
+        composite = getattr(models, 'CompositePrimaryKey', None)
+        if composite is not None and isinstance(field, composite):
+            raise ImproperlyConfigured(
+                '{0}: {1} has a composite primary key; set lookup_field to a unique field'.format(
+                    label, model._meta.label
+                )
+            )
+        return field
+    try:
+        field = model._meta.get_field(lookup_field)
+    except FieldDoesNotExist:
+        raise ImproperlyConfigured(
+            '{0}: lookup_field {1} is not a field of {2}'.format(label, lookup_field, model._meta.label)
+        )
+    if not field.concrete or not is_unique(model, lookup_field):
+        raise ImproperlyConfigured(
+            '{0}: lookup_field {1}.{2} must be a unique field'.format(label, model._meta.label, lookup_field)
+        )
+    return field
+
+
+def get_object_filter(view):
+    "The filter of the object that is selected by the url kwargs of a single object view"
+    pk = view.kwargs.get(view.pk_url_kwarg)
+    if pk is not None:
+        return {'pk': pk}
+    return {view.get_slug_field(): view.kwargs.get(view.slug_url_kwarg)}
@@ -0,0 +1,76 @@
+from importlib import import_module
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import NoReverseMatch, get_script_prefix, reverse
+from six import string_types
+
+from generic_scaffold import CrudManager
+from generic_scaffold.lookups import INT_LOOKUP, get_lookup_field, get_lookup_regex
+from generic_scaffold.manifest import MANIFEST_VERSION, get_manifest_path, write_manifest
+
+
+def get_manifest_entry(crud_class):
+    "The entry of a registered CrudManager class in the manifest"
+    model = apps.get_model(crud_class.model) if isinstance(crud_class.model, string_types) else crud_class.model
+    field = get_lookup_field(model, crud_class.lookup_field, label=crud_class.__name__)
+    lookup_regex, sample = get_lookup_regex(field)
+    url_kwarg = crud_class.lookup_field or 'pk'
+
+    routes = {}
+    urls = {}
+    script_prefix = get_script_prefix()
+    for action, route, with_pk in crud_class.get_routes():
+        routes[action] = r'^' + route + (r'(?P<{0}>{1})$'.format(url_kwarg, lookup_regex) if with_pk else '$')
+        try:
+            url = reverse(crud_class.url_names[action], args=[sample] if with_pk else [])
+        except NoReverseMatch:
+            # The scaffold is not included in the urlconf
+            continue
+        # Like row_urls keep everything before the lookup value
+        url = url[:-len(sample)] if with_pk else url
+        urls[action] = url[len(script_prefix):] if url.startswith(script_prefix) else url
+
+    return {
+        'prefix': crud_class.prefix,
+        'app_label': crud_class.app_label,
+        'model': crud_class.model_name,
+        'url_names': crud_class.url_names,
+        'lookup': url_kwarg,
+        'quote': lookup_regex != INT_LOOKUP[0],
+        'routes': routes,
+        'urls': urls,
+    }
+
+
+def build_manifest(crud_classes):
+    return {
+        'version': MANIFEST_VERSION,
+        'scaffolds': [get_manifest_entry(crud_class) for crud_class in crud_classes],
+    }
+
+
+class Command(BaseCommand):
+    help = 'Write the manifest of the registered scaffolds (url names and urls) to GENERIC_SCAFFOLD_MANIFEST'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help='The manifest file (default the GENERIC_SCAFFOLD_MANIFEST setting)')
+        parser.add_argument(
+            '--module', action='append', default=[],
+            help='Also import this scaffolding module (if it is not imported by the urlconf)',
+        )
+
+    def handle(self, *args, **options):
+        path = options['output'] or get_manifest_path()
+        if not path:
+            raise CommandError('Set GENERIC_SCAFFOLD_MANIFEST or pass --output')
+
+        # The CrudManagers are registered when their modules are imported
+        import_module(settings.ROOT_URLCONF)
+        for module in options['module']:
+            import_module(module)
+
+        manifest = build_manifest(CrudManager._registry)
+        write_manifest(manifest, path)
+        self.stdout.write('Wrote {0} scaffolds to {1}'.format(len(manifest['scaffolds']), path))
@@ -0,0 +1,114 @@
+"""
+A manifest of the registered scaffolds (written by the scaffold_manifest
+management command) so that processes that don't import the scaffolding
+modules (i.e celery workers) can still find their url names and urls.
+Loading it must not import the views (or the models).
+"""
+import json
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.urls import get_script_prefix
+from django.utils.http import RFC3986_SUBDELIMS
+from six.moves.urllib.parse import quote
+
+MANIFEST_VERSION = 1
+
+# path: (mtime and size of the file, ScaffoldManifest)
+_manifests = {}
+
+
+def get_umask():
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+def write_manifest(manifest, path):
+    "Write the manifest atomically so that other processes never read half of it"
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.scaffold_manifest', dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(manifest, f, separators=(',', ':'), sort_keys=True)
+        # mkstemp creates the file readable only by its owner; the manifest
+        # must be readable by the other processes (i.e of another user)
+        os.chmod(tmp_path, 0o666 & ~get_umask())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class ScaffoldManifest(object):
+    def __init__(self, manifest):
+        if manifest.get('version') != MANIFEST_VERSION:
+            raise ImproperlyConfigured(
+                'The scaffold manifest has version {0}; run the scaffold_manifest command again'.format(
+                    manifest.get('version')
+                )
+            )
+        self.scaffolds = manifest['scaffolds']
+        self.by_prefix = dict((entry['prefix'], entry) for entry in self.scaffolds)
+        self.by_model = dict(((entry['app_label'], entry['model']), entry) for entry in self.scaffolds)
+
+    def get_entry(self, app=None, model=None, prefix=None):
+        if app and model:
+            return self.by_model.get((app, model.lower()))
+        return self.by_prefix.get(prefix)
+
+    def get_url_names(self, app=None, model=None, prefix=None):
+        entry = self.get_entry(app, model, prefix)
+        return entry and dict(entry['url_names'])
+
+    def get_url(self, action, value=None, app=None, model=None, prefix=None):
+        "The url of action (with value as the lookup of the single object actions) without reversing"
+        entry = self.get_entry(app, model, prefix)
+        url = entry and entry['urls'].get(action)
+        if url is None:
+            return None
+        if value is not None:
+            value = str(value)
+            url += quote(value, safe=RFC3986_SUBDELIMS + '~:@') if entry['quote'] else value
+        return get_script_prefix() + url
+
+
+def get_manifest_path():
+    return getattr(settings, 'GENERIC_SCAFFOLD_MANIFEST', None)
+
+
+def load_manifest(path=None):
+    """
+    The ScaffoldManifest of path (default the GENERIC_SCAFFOLD_MANIFEST
+    setting) or None if there's no manifest. The file is read again only
+    when it changes.
+    """
+    path = path or get_manifest_path()
+    if not path:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    version = (stat.st_mtime_ns, stat.st_size)
+    cached = _manifests.get(path)
+    if cached is None or cached[0] != version:
+        try:
+            f = open(path)
+        except OSError:
+            return None
+        with f:
+            cached = _manifests[path] = (version, ScaffoldManifest(json.load(f)))
+    return cached[1]
+
+
+def get_url_names(app=None, model=None, prefix=None):
+    manifest = load_manifest()
+    return manifest and manifest.get_url_names(app, model, prefix)
+
+
+def get_url(action, value=None, app=None, model=None, prefix=None):
+    manifest = load_manifest()
+    return manifest and manifest.get_url(action, value, app, model, prefix)
@@ -0,0 +1,143 @@
+import base64
+import json
+
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.db.models import Q
+from django.http import Http404
+
+
+def encode_cursor(direction, values):
+    payload = json.dumps({'d': direction, 'v': values}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    padded = cursor + '=' * (-len(cursor) % 4)
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+        direction, values = payload['d'], payload['v']
+    except (ValueError, TypeError, KeyError):
+        raise Http404('Invalid cursor')
+    if direction not in ('next', 'prev') or not isinstance(values, list):
+        raise Http404('Invalid cursor')
+    return direction, values
+
+
+class DefaultOrderingMixin(object):
+    "Order by pk when nothing else orders the list so that the pages are stable"
+    def get_ordering(self):
+        return super(DefaultOrderingMixin, self).get_ordering() or ('pk', )
+
+
+class KeysetPage(object):
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+def get_keyset_fields(model, keyset_ordering, label):
+    "The (field, descending) pairs of keyset_ordering"
+    opts = model._meta
+    fields = []
+    for name in keyset_ordering:
+        descending = name.startswith('-')
+        field_name = name.lstrip('-')
+        field = opts.pk if field_name == 'pk' else opts.get_field(field_name)
+        if field.null:
+            # NULL can't be compared with < and > so the pages would skip rows
+            raise ImproperlyConfigured(
+                'keyset_ordering of {0} can\'t contain the nullable field {1}'.format(label, field.name)
+            )
+        fields.append((field, descending))
+    if not any(field.primary_key or field.unique for field, _ in fields):
+        raise ImproperlyConfigured('keyset_ordering of {0} must contain a unique field'.format(label))
+    return fields
+
+
+class KeysetPaginationMixin(object):
+    keyset_ordering = ('pk', )
+    cursor_kwarg = 'cursor'
+
+    def get_keyset_fields(self, queryset):
+        return get_keyset_fields(queryset.model, self.keyset_ordering, self.__class__.__name__)
+
+    def get_seek_filter(self, fields, values, forward):
+        seek = Q()
+        for i, (field, descending) in enumerate(fields):
+            lookup = 'gt' if forward != descending else 'lt'
+            condition = Q(**{'{0}__{1}'.format(field.attname, lookup): values[i]})
+            for j in range(i):
+                condition &= Q(**{fields[j][0].attname: values[j]})
+            seek |= condition
+        return seek
+
+    def get_cursor_values(self, fields, obj):
+        return [field.value_to_string(obj) for field, _ in fields]
+
+    def get_page_queryset(self, queryset, page_size):
+        fields = self.get_keyset_fields(queryset)
+        ordering = ['-' + f.attname if d else f.attname for f, d in fields]
+        reverse_ordering = [f.attname if d else '-' + f.attname for f, d in fields]
+
+        cursor = self.request.GET.get(self.cursor_kwarg)
+        direction, values = decode_cursor(cursor) if cursor else ('next', None)
+        forward = direction == 'next'
+
+        if values is not None:
+            if len(values) != len(fields):
+                raise Http404('Invalid cursor')
+            try:
+                values = [field.to_python(value) for (field, _), value in zip(fields, values)]
+            except ValidationError:
+                raise Http404('Invalid cursor')
+            queryset = queryset.filter(self.get_seek_filter(fields, values, forward))
+
+        queryset = queryset.order_by(*(ordering if forward else reverse_ordering))
+        self.keyset_state = (fields, forward, values is not None)
+        return queryset[:page_size + 1]
+
+    def get_page(self, rows, page_size):
+        fields, forward, from_cursor = self.keyset_state
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if not forward:
+            rows.reverse()
+
+        if forward:
+            has_next, has_previous = has_more, from_cursor
+        else:
+            has_next, has_previous = from_cursor, has_more
+
+        next_cursor = previous_cursor = None
+        if rows:
+            if has_next:
+                next_cursor = encode_cursor('next', self.get_cursor_values(fields, rows[-1]))
+            if has_previous:
+                previous_cursor = encode_cursor('prev', self.get_cursor_values(fields, rows[0]))
+
+        page = KeysetPage(rows, next_cursor, previous_cursor)
+        return (None, page, rows, page.has_other_pages())
+
+    def paginate_queryset(self, queryset, page_size):
+        rows = list(self.get_page_queryset(queryset, page_size))
+        return self.get_page(rows, page_size)
+
+    async def apaginate_queryset(self, queryset, page_size):
+        rows = [obj async for obj in self.get_page_queryset(queryset, page_size)]
+        return self.get_page(rows, page_size)
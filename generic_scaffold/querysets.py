@@ -0,0 +1,41 @@
+def plan_related_fields(model, fields=None, exclude=()):
+    """
+    Return the (select_related, prefetch_related) lookups for the forward
+    relations of model. If fields is given only relations that are used by
+    these fields are returned.
+    """
+    names = None
+    if fields is not None:
+        names = set(f.split('__')[0] for f in fields)
+
+    select_related = []
+    prefetch_related = []
+    for field in model._meta.get_fields():
+        if not field.is_relation or not field.concrete or field.name in exclude:
+            continue
+        if names is not None and field.name not in names:
+            continue
+        if field.many_to_many:
+            prefetch_related.append(field.name)
+        elif field.many_to_one or field.one_to_one:
+            select_related.append(field.name)
+    return select_related, prefetch_related
+
+
+class QuerysetPlanMixin(object):
+    select_related = ()
+    prefetch_related = ()
+    only_fields = ()
+    defer_fields = ()
+
+    def get_queryset(self):
+        queryset = super(QuerysetPlanMixin, self).get_queryset()
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        if self.only_fields:
+            queryset = queryset.only(*self.only_fields)
+        if self.defer_fields:
+            queryset = queryset.defer(*self.defer_fields)
+        return queryset
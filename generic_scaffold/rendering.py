@@ -0,0 +1,44 @@
+import hashlib
+
+from django.template.loader import select_template
+
+
+def get_row_cache_key(prefix, obj, field, vary=()):
+    "The cache key of the rendered row of obj; it changes with the field"
+    value = field.value_from_object(obj)
+    key = '{0}:{1}:{2}:{3}:{4}'.format(
+        prefix, obj._meta.label, obj.pk, value, ':'.join(str(v) for v in vary)
+    )
+    return 'generic_scaffold:row:{0}'.format(hashlib.md5(key.encode('utf-8')).hexdigest())
+
+
+class PinnedTemplateMixin(object):
+    """
+    Find the template of the view once for each list of candidate template
+    names and keep it (compiled) instead of asking the loaders each time.
+    """
+    def get_pinned_templates(self):
+        # Each view class keeps its own templates
+        klazz = type(self)
+        if 'pinned_templates' not in klazz.__dict__:
+            klazz.pinned_templates = {}
+        return klazz.pinned_templates
+
+    def get_pinned_template(self):
+        names = tuple(self.get_template_names())
+        pinned_templates = self.get_pinned_templates()
+        template = pinned_templates.get(names)
+        if template is None:
+            template = select_template(names, using=self.template_engine)
+            pinned_templates[names] = template
+        return template
+
+    def render_to_response(self, context, **response_kwargs):
+        response_kwargs.setdefault('content_type', self.content_type)
+        return self.response_class(
+            request=self.request,
+            template=self.get_pinned_template(),
+            context=context,
+            using=self.template_engine,
+            **response_kwargs
+        )
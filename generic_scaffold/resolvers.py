@@ -0,0 +1,38 @@
+from django.urls import Resolver404, URLResolver
+from django.urls.resolvers import RegexPattern
+
+
+class ScaffoldResolver(URLResolver):
+    """
+    Resolve the urls of many CrudManagers with dict lookups instead of trying
+    the regexes of all their url patterns one after the other. Reversing
+    works as usual since the normal url patterns are used.
+    """
+    def __init__(self, crud_managers):
+        self.routes = {}
+        self.pk_routes = {}
+        url_patterns = []
+        for crud in crud_managers:
+            patterns = crud.get_url_patterns()
+            for (action, route, with_pk), pattern in zip(crud.get_routes(), patterns):
+                if with_pk:
+                    self.pk_routes.setdefault(route, pattern)
+                else:
+                    self.routes.setdefault(route, pattern)
+            url_patterns.extend(patterns)
+        super(ScaffoldResolver, self).__init__(RegexPattern(r'^'), url_patterns)
+
+    def resolve(self, path):
+        path = str(path)
+        pattern = self.routes.get(path)
+        if pattern is None:
+            head, sep, tail = path.rpartition('/')
+            pattern = self.pk_routes.get(head + sep)
+        match = pattern and pattern.resolve(path)
+        if match:
+            return match
+        raise Resolver404({'path': path})
+
+
+def get_compact_url_patterns(*crud_managers):
+    return [ScaffoldResolver(crud_managers)]
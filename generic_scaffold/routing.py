@@ -0,0 +1,62 @@
+from django.db import router
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class DatabaseRoutingMixin(object):
+    """
+    Read with safe requests from the read_database and write (and read the
+    objects to change) with the other requests on the write_database. After
+    a write the user reads from the write_database for read_after_write_timeout
+    seconds so that they see their changes even if the replica lags behind.
+    """
+    read_database = None
+    write_database = None
+    read_after_write_timeout = 10
+    read_after_write_cookie = 'generic_scaffold_write'
+
+    def get_write_database(self):
+        return self.write_database or router.db_for_write(self.model)
+
+    def get_read_database(self):
+        if self.read_database and self.read_after_write_cookie not in self.request.COOKIES:
+            return self.read_database
+        return self.get_write_database()
+
+    def get_database(self):
+        if self.request.method in SAFE_METHODS:
+            return self.get_read_database()
+        return self.get_write_database()
+
+    def get_queryset(self):
+        return super(DatabaseRoutingMixin, self).get_queryset().using(self.get_database())
+
+    def set_write_database(self, form):
+        # New objects are saved to the database of their _state
+        instance = getattr(form, 'instance', None)
+        if instance is not None and instance._state.db is None:
+            instance._state.db = self.get_write_database()
+        return form
+
+    def get_form(self, form_class=None):
+        return self.set_write_database(super(DatabaseRoutingMixin, self).get_form(form_class))
+
+    def get_api_form(self, data):
+        return self.set_write_database(super(DatabaseRoutingMixin, self).get_api_form(data))
+
+    def set_read_after_write(self, response):
+        if (self.request.method not in SAFE_METHODS and response.status_code < 400
+                and self.read_database and self.read_after_write_timeout):
+            response.set_cookie(
+                self.read_after_write_cookie, '1', max_age=self.read_after_write_timeout,
+                httponly=True, samesite='Lax',
+            )
+        return response
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.view_is_async:
+            return self.async_dispatch(request, *args, **kwargs)
+        return self.set_read_after_write(super(DatabaseRoutingMixin, self).dispatch(request, *args, **kwargs))
+
+    async def async_dispatch(self, request, *args, **kwargs):
+        return self.set_read_after_write(await super(DatabaseRoutingMixin, self).dispatch(request, *args, **kwargs))
@@ -0,0 +1,93 @@
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+from django.http import StreamingHttpResponse
+from django.template.loader import select_template
+
+# Replaced by the rows in the rendered list_streaming.html (so it must not
+# contain anything that would be escaped)
+ROWS_MARKER = 'generic_scaffold_rows_6f1f0c1e'
+
+
+class StreamingListMixin(object):
+    """
+    Stream the whole list (the unpaginated list or the paginated list with
+    ?all=1) instead of rendering it in memory: the page template is rendered
+    once and split around its {{ rows }}, then the rows are fetched with
+    queryset.iterator() and rendered streaming_chunk_size at a time.
+    """
+    streaming_kwarg = 'all'
+    streaming_chunk_size = 2000
+    streaming_template_suffix = '_list_streaming'
+    streaming_rows_template_suffix = '_list_rows'
+
+    def is_streaming(self):
+        return not self.paginate_by or bool(self.request.GET.get(self.streaming_kwarg))
+
+    def get_paginate_by(self, queryset):
+        if self.is_streaming():
+            return None
+        return super(StreamingListMixin, self).get_paginate_by(queryset)
+
+    def get_streaming_template_names(self, suffix):
+        """
+        The names derived from the template_name of the list (i.e
+        books/list.html gives books/list_streaming.html and books/list_rows.html)
+        or the app_name/model_list_streaming.html and the fallback template.
+        """
+        if self.template_name:
+            name, extension = os.path.splitext(self.template_name)
+            return ('{0}{1}{2}'.format(name, suffix[len('_list'):], extension), )
+        opts = self.model._meta
+        return (
+            '{0}/{1}{2}.html'.format(opts.app_label, opts.model_name, suffix),
+            'generic_scaffold/list{0}.html'.format(suffix[len('_list'):]),
+        )
+
+    def get_streaming_template(self, suffix):
+        names = self.get_streaming_template_names(suffix)
+        if not hasattr(self, 'get_pinned_templates'):
+            return select_template(names, using=self.template_engine)
+        pinned_templates = self.get_pinned_templates()
+        template = pinned_templates.get(names)
+        if template is None:
+            template = pinned_templates[names] = select_template(names, using=self.template_engine)
+        return template
+
+    def get_streaming_queryset(self):
+        queryset = self.object_list
+        keyset_ordering = getattr(self, 'keyset_ordering', None)
+        if keyset_ordering:
+            queryset = queryset.order_by(*keyset_ordering)
+        return queryset
+
+    def render_rows(self, template, context, rows):
+        context['object_list'] = rows
+        return template.render(context, self.request)
+
+    def stream(self, context):
+        page = self.get_streaming_template(self.streaming_template_suffix).render(
+            dict(context, rows=ROWS_MARKER), self.request
+        )
+        header, marker, footer = page.partition(ROWS_MARKER)
+        if not marker:
+            raise ImproperlyConfigured('The streaming list template must contain {{ rows }}')
+        yield header
+
+        template = self.get_streaming_template(self.streaming_rows_template_suffix)
+        context = dict(context)
+        rows = []
+        for obj in self.get_streaming_queryset().iterator(chunk_size=self.streaming_chunk_size):
+            rows.append(obj)
+            if len(rows) == self.streaming_chunk_size:
+                yield self.render_rows(template, context, rows)
+                rows = []
+        if rows:
+            yield self.render_rows(template, context, rows)
+        yield footer
+
+    def render_to_response(self, context, **response_kwargs):
+        if not self.is_streaming():
+            return super(StreamingListMixin, self).render_to_response(context, **response_kwargs)
+        response_kwargs.setdefault('content_type', self.content_type)
+        return StreamingHttpResponse(self.stream(context), **response_kwargs)
@@ -1,6 +1,7 @@
 import django
 from django import template
 from django.conf import settings
+from django.utils.safestring import mark_safe
 
 from generic_scaffold import get_url_names
 
@@ -19,3 +20,52 @@ def set_urls_for_scaffold(app=None, model=None, prefix=None):
 
 set_urls_for_scaffold = decorator(set_urls_for_scaffold)
 
+
+@register.filter
+def row_urls(crud, obj):
+    return crud.row_urls(obj)
+
+
+class RowCacheNode(template.Node):
+    def __init__(self, nodelist, obj, vary):
+        self.nodelist = nodelist
+        self.obj = obj
+        self.vary = vary
+
+    def get_cached_rows(self, context, crud, vary):
+        "Get the cached rows of the whole page with a single cache query"
+        rows = context.render_context.get(self)
+        if rows is None:
+            keys = dict(
+                (crud.get_row_cache_key(obj, vary), obj.pk) for obj in context.get('object_list') or []
+            )
+            rows = dict((keys[key], row) for key, row in crud.get_row_cache().get_many(keys).items())
+            context.render_context[self] = rows
+        return rows
+
+    def render(self, context):
+        crud = context.get('crud')
+        if crud is None or not getattr(crud, 'list_row_cache_field', None):
+            return self.nodelist.render(context)
+        obj = self.obj.resolve(context)
+        vary = [v.resolve(context) for v in self.vary]
+        row = self.get_cached_rows(context, crud, vary).get(obj.pk)
+        if row is None:
+            row = self.nodelist.render(context)
+            crud.get_row_cache().set(crud.get_row_cache_key(obj, vary), str(row), crud.list_row_cache_timeout)
+        return mark_safe(row)
+
+
+@register.tag
+def row_cache(parser, token):
+    """
+    Cache the rendered row of an object by the list_row_cache_field of the
+    crud; the other arguments are added to the key:
+    {% row_cache object var1 var2 %}...{% endrow_cache %}
+    """
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError('{0} needs the object of the row'.format(bits[0]))
+    nodelist = parser.parse(('endrow_cache', ))
+    parser.delete_first_token()
+    return RowCacheNode(nodelist, parser.compile_filter(bits[1]), [parser.compile_filter(b) for b in bits[2:]])
@@ -1,13 +1,45 @@
-from django.test import TestCase, RequestFactory, Client
+import asyncio
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import types
+import uuid
+from unittest import mock
+from django.test import TestCase, RequestFactory, Client, AsyncClient
 import django
 if django.VERSION >= (2, 0, 0):
-    from django.urls import reverse
+    from django.urls import reverse, resolve
 else:
-    from django.core.urlresolvers import reverse
-from django.db import models
+    from django.core.urlresolvers import reverse, resolve
+from django.db import models, connection
+from django.db.models.signals import post_delete
+from django.test.utils import CaptureQueriesContext
+from django import forms
+from django.contrib.auth.decorators import login_required
+from django.views.decorators.csrf import csrf_exempt
+from django.contrib.auth.models import User, AnonymousUser
+from django.core.cache import cache
+from django.core.management import call_command, CommandError
+from django.template import TemplateDoesNotExist
+from django.template.loader import select_template
+from django.http import Http404
+from django.utils.http import http_date
 from django.views.generic import ListView, CreateView , DetailView, UpdateView, DeleteView
-from generic_scaffold import CrudManager, get_url_names
-from generic_scaffold.templatetags.generic_scaffold_tags import set_urls_for_scaffold
+from generic_scaffold import CrudManager, get_url_names, get_compact_url_patterns
+from generic_scaffold import manifest
+from generic_scaffold.cache import InvalidateCacheMixin, get_model_version
+from generic_scaffold.management.commands.scaffold_manifest import build_manifest
+from generic_scaffold.instrumentation import view_timed
+from generic_scaffold.rendering import PinnedTemplateMixin
+from generic_scaffold.autocomplete import AutocompleteWidgetsMixin, get_count_key
+from generic_scaffold.views import FallbackTemplateMixin
+from generic_scaffold.deletes import FastDeleteWarning
+from generic_scaffold.filters import MissingIndexWarning, get_indexed_fields
+from generic_scaffold.templatetags.generic_scaffold_tags import set_urls_for_scaffold, row_urls
 
 class TestModel(models.Model):
     test = models.CharField(max_length=16)
@@ -24,6 +56,137 @@ class TestModelImplicit(models.Model):
 class TestModelExplicit(models.Model):
     test = models.CharField(max_length=16)
 
+class TestOffsetModel(models.Model):
+    test = models.CharField(max_length=16)
+
+class TestKeysetModel(models.Model):
+    test = models.CharField(max_length=16)
+    rank = models.IntegerField(db_index=True)
+
+class TestLazyModel(models.Model):
+    test = models.CharField(max_length=16)
+
+class TestCompactModel(models.Model):
+    test = models.CharField(max_length=16)
+
+class TestCompactModel2(models.Model):
+    test = models.CharField(max_length=16)
+
+class TestExportModel(models.Model):
+    test = models.CharField(max_length=16)
+    number = models.IntegerField(default=0)
+
+class TestBulkModel(models.Model):
+    test = models.CharField(max_length=16)
+    number = models.IntegerField(default=0)
+
+class TestCachedModel(models.Model):
+    test = models.CharField(max_length=16)
+
+    def get_absolute_url(self):
+        return reverse(self.detail_url_name, args=[self.pk])
+
+class TestConditionalModel(models.Model):
+    test = models.CharField(max_length=16)
+    updated = models.DateTimeField(auto_now=True)
+
+class TestAsyncModel(models.Model):
+    test = models.CharField(max_length=16)
+
+    def __str__(self):
+        return self.test
+
+    def get_absolute_url(self):
+        return reverse(self.detail_url_name, args=[self.pk])
+
+class TestApiModel(models.Model):
+    test = models.CharField(max_length=16)
+    number = models.IntegerField(default=0, db_index=True)
+
+class TestFilterModel(models.Model):
+    name = models.CharField(max_length=16, db_index=True)
+    code = models.CharField(max_length=16)
+    number = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [models.Index(fields=['number', 'name'])]
+
+    def __str__(self):
+        return self.name
+
+class TestStampedModel(models.Model):
+    test = models.CharField(max_length=16)
+    stamp = models.DateTimeField(null=True, blank=True)
+
+    def get_absolute_url(self):
+        return reverse(self.detail_url_name, args=[self.pk])
+
+class TestVersionedModel(models.Model):
+    test = models.CharField(max_length=16)
+    description = models.TextField(blank=True)
+    version = models.IntegerField(default=0)
+    updated = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.test
+
+    def get_absolute_url(self):
+        return reverse(self.detail_url_name, args=[self.pk])
+
+class TestFastDeleteModel(models.Model):
+    test = models.CharField(max_length=16)
+    body = models.TextField(blank=True)
+
+    def __str__(self):
+        return self.test
+
+class TestUUIDModel(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    test = models.CharField(max_length=16)
+
+    def __str__(self):
+        return self.test
+
+    def get_absolute_url(self):
+        return reverse(self.detail_url_name, args=[self.pk])
+
+class TestSlugModel(models.Model):
+    slug = models.SlugField(unique=True)
+    code = models.CharField(max_length=16, unique=True)
+    test = models.CharField(max_length=16)
+
+    def __str__(self):
+        return self.test
+
+    def get_absolute_url(self):
+        return reverse(self.detail_url_name, args=[self.slug])
+
+class TestCustomer(models.Model):
+    name = models.CharField(max_length=16, db_index=True)
+
+    def __str__(self):
+        return self.name
+
+class TestOrder(models.Model):
+    customer = models.ForeignKey(TestCustomer, on_delete=models.CASCADE, related_name='+')
+    watchers = models.ManyToManyField(TestCustomer, blank=True, related_name='+')
+
+    def get_absolute_url(self):
+        return reverse(self.detail_url_name, args=[self.pk])
+
+class TestRelatedTarget(models.Model):
+    test = models.CharField(max_length=16)
+
+class TestRelatedModel(models.Model):
+    test = models.CharField(max_length=16)
+    description = models.TextField(blank=True)
+    target = models.ForeignKey(TestRelatedTarget, on_delete=models.CASCADE, related_name='+')
+    other = models.ForeignKey(TestRelatedTarget, on_delete=models.CASCADE, null=True, related_name='+')
+    tags = models.ManyToManyField(TestRelatedTarget, related_name='+')
+
+    def __str__(self):
+        return '{0} {1} {2}'.format(self.test, self.target.test, ','.join(t.test for t in self.tags.all()))
+
 class TestCrudManager(CrudManager):
     model = TestModel
     prefix = 'test'
@@ -60,6 +223,173 @@ class TestOverrideViewsCrudManager(CrudManager):
     delete_template_name = 'generic_scaffold/confirm_delete.html'
 
 
+class TestOffsetCrudManager(CrudManager):
+    model = TestOffsetModel
+    prefix = 'test_offset'
+    list_pagination = 'offset'
+    list_paginate_by = 2
+
+
+class TestKeysetCrudManager(CrudManager):
+    model = TestKeysetModel
+    prefix = 'test_keyset'
+    list_pagination = 'keyset'
+    list_paginate_by = 2
+    list_keyset_ordering = ('-rank', 'pk')
+
+
+class TestLazyCrudManager(CrudManager):
+    model = 'generic_scaffold.TestLazyModel'
+    prefix = 'test_lazy'
+    lazy = True
+
+
+class TestRelatedCrudManager(CrudManager):
+    model = TestRelatedModel
+    prefix = 'test_related'
+    list_select_related = ('target', )
+    list_prefetch_related = ('tags', )
+    list_defer_fields = ('description', )
+    detail_select_related = ('target', )
+    detail_prefetch_related = ('tags', )
+
+
+class TestCompactCrudManager(CrudManager):
+    model = TestCompactModel
+    prefix = 'test_compact/'
+
+
+class TestCompact2CrudManager(CrudManager):
+    model = TestCompactModel2
+    prefix = 'test_compact2'
+    lazy = True
+
+
+class HideHiddenMixin(object):
+    def get_queryset(self):
+        return super(HideHiddenMixin, self).get_queryset().exclude(test='hidden')
+
+
+class TestExportCrudManager(CrudManager):
+    model = TestExportModel
+    prefix = 'test_export'
+    export_formats = ('csv', 'ndjson')
+    export_chunk_size = 2
+    list_mixins = [HideHiddenMixin]
+    permissions = {
+        'list': login_required,
+    }
+
+
+class TestBulkCrudManager(CrudManager):
+    model = TestBulkModel
+    prefix = 'test_bulk'
+    bulk_actions = ('create', 'update', 'delete')
+    bulk_create_extra = 2
+    permissions = {
+        'delete': login_required,
+    }
+
+
+class TestCachedCrudManager(CrudManager):
+    model = TestCachedModel
+    prefix = 'test_cached'
+    cache = {'list': 60, 'detail': 60}
+
+
+class TestConditionalCrudManager(CrudManager):
+    model = TestConditionalModel
+    prefix = 'test_conditional'
+    last_modified_field = 'updated'
+    etag_strategy = 'aggregate'
+
+
+class TestApiForm(forms.ModelForm):
+    class Meta:
+        model = TestApiModel
+        fields = ['test', 'number']
+
+    def clean_number(self):
+        if self.cleaned_data['number'] < 0:
+            raise forms.ValidationError('Negative number')
+        return self.cleaned_data['number']
+
+
+class TestApiCrudManager(CrudManager):
+    model = TestApiModel
+    prefix = 'test_api'
+    api = True
+    list_pagination = 'offset'
+    list_paginate_by = 2
+    form_class = TestApiForm
+    permissions = {
+        'api_delete': login_required,
+    }
+
+
+class TestFilterCrudManager(CrudManager):
+    model = TestFilterModel
+    prefix = 'test_filter'
+    list_filter_fields = ('name', 'number')
+    search_fields = ('^name', 'code')
+    list_pagination = 'offset'
+    list_paginate_by = 2
+    export_formats = ('csv', )
+    api = True
+
+
+class TestVersionedCrudManager(CrudManager):
+    model = TestVersionedModel
+    prefix = 'test_versioned'
+    update_changed_only = True
+    concurrency_field = 'version'
+
+
+class TestStampedCrudManager(CrudManager):
+    model = TestStampedModel
+    prefix = 'test_stamped'
+    concurrency_field = 'stamp'
+
+
+class TestFastDeleteCrudManager(CrudManager):
+    model = TestFastDeleteModel
+    prefix = 'test_fast_delete'
+    fast_delete = True
+
+
+class TestUUIDCrudManager(CrudManager):
+    model = TestUUIDModel
+    prefix = 'test_uuid'
+
+
+class TestSlugCrudManager(CrudManager):
+    model = TestSlugModel
+    prefix = 'test_slug'
+    lookup_field = 'slug'
+    api = True
+
+
+class TestCustomerCrudManager(CrudManager):
+    model = TestCustomer
+    prefix = 'test_customer'
+
+
+class TestOrderCrudManager(CrudManager):
+    model = TestOrder
+    prefix = 'test_order'
+
+
+class TestAsyncCrudManager(CrudManager):
+    model = TestAsyncModel
+    prefix = 'test_async'
+    async_views = True
+    list_pagination = 'offset'
+    list_paginate_by = 2
+    permissions = {
+        'delete': login_required,
+    }
+
+
 test_crud = TestCrudManager()
 urlpatterns = test_crud.get_url_patterns()
 
@@ -75,6 +405,64 @@ urlpatterns += test_explicit_crud.get_url_patterns()
 test_override_crud = TestOverrideViewsCrudManager()
 urlpatterns += test_override_crud.get_url_patterns()
 
+test_offset_crud = TestOffsetCrudManager()
+urlpatterns += test_offset_crud.get_url_patterns()
+
+test_keyset_crud = TestKeysetCrudManager()
+urlpatterns += test_keyset_crud.get_url_patterns()
+
+test_related_crud = TestRelatedCrudManager()
+urlpatterns += test_related_crud.get_url_patterns()
+
+test_lazy_crud = TestLazyCrudManager()
+urlpatterns += test_lazy_crud.get_url_patterns()
+
+test_export_crud = TestExportCrudManager()
+urlpatterns += test_export_crud.get_url_patterns()
+
+test_bulk_crud = TestBulkCrudManager()
+urlpatterns += test_bulk_crud.get_url_patterns()
+
+test_cached_crud = TestCachedCrudManager()
+urlpatterns += test_cached_crud.get_url_patterns()
+
+test_conditional_crud = TestConditionalCrudManager()
+urlpatterns += test_conditional_crud.get_url_patterns()
+
+test_api_crud = TestApiCrudManager()
+urlpatterns += test_api_crud.get_url_patterns()
+
+test_filter_crud = TestFilterCrudManager()
+urlpatterns += test_filter_crud.get_url_patterns()
+
+test_versioned_crud = TestVersionedCrudManager()
+urlpatterns += test_versioned_crud.get_url_patterns()
+
+test_stamped_crud = TestStampedCrudManager()
+urlpatterns += test_stamped_crud.get_url_patterns()
+
+test_fast_delete_crud = TestFastDeleteCrudManager()
+urlpatterns += test_fast_delete_crud.get_url_patterns()
+
+test_async_crud = TestAsyncCrudManager()
+urlpatterns += test_async_crud.get_url_patterns()
+
+test_uuid_crud = TestUUIDCrudManager()
+urlpatterns += test_uuid_crud.get_url_patterns()
+
+test_slug_crud = TestSlugCrudManager()
+urlpatterns += test_slug_crud.get_url_patterns()
+
+test_customer_crud = TestCustomerCrudManager()
+urlpatterns += test_customer_crud.get_url_patterns()
+
+test_order_crud = TestOrderCrudManager()
+urlpatterns += test_order_crud.get_url_patterns()
+
+test_compact_crud = TestCompactCrudManager()
+test_compact2_crud = TestCompact2CrudManager()
+urlpatterns += get_compact_url_patterns(test_compact_crud, test_compact2_crud)
+
 
 class DuplicatesTest(TestCase):
     def test_duplicate_prefix(self):
@@ -260,6 +648,99 @@ class TestUrlNames(TestCase):
         for attr in ['list', 'create', 'update', 'delete', 'detail']:
             self.assertEquals( names[attr], "{0}_generic_scaffold_testmodel_{1}".format(TestCrudManager.prefix, attr))
 
+    def test_get_url_names_with_model_class(self):
+        names = CrudManager.get_url_names(model_class=TestModel)
+        self.assertEquals(names['list'], test_crud.list_url_name)
+
+    def test_get_url_names_model_case_insensitive(self):
+        self.assertEquals(get_url_names(app='generic_scaffold', model='TestModel'), test_crud.url_names)
+
+    def test_get_url_names_returns_a_copy(self):
+        get_url_names(prefix='test')['list'] = 'changed'
+        get_url_names(app='generic_scaffold', model='testmodel')['detail'] = 'changed'
+        CrudManager.get_url_names(model_class=TestModel)['update'] = 'changed'
+        self.assertFalse('changed' in TestCrudManager.url_names.values())
+        self.assertEquals(get_url_names(prefix='test'), TestCrudManager.url_names)
+
+    def test_get_url_names_not_found(self):
+        self.assertEquals(get_url_names(prefix='not_there'), None)
+        self.assertEquals(get_url_names(app='generic_scaffold', model='testmodelimplicit2'), None)
+
+    def test_url_names_set_on_class(self):
+        self.assertEquals(TestImplicitCrudManager.url_names['detail'], 'test_implicit_generic_scaffold_testmodelimplicit_detail')
+        self.assertEquals(CrudManager._registry_by_prefix['test'], TestCrudManager)
+        self.assertEquals(CrudManager._registry_by_model[('generic_scaffold', 'testmodel')], TestCrudManager)
+
+class TestManifest(TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'scaffolds.json')
+        call_command('scaffold_manifest', output=self.path, stdout=io.StringIO())
+
+    def test_manifest(self):
+        scaffolds = manifest.load_manifest(self.path)
+        self.assertEquals(len(scaffolds.scaffolds), len(CrudManager._registry))
+        self.assertEquals(scaffolds.get_url_names(prefix='test'), test_crud.url_names)
+        self.assertEquals(scaffolds.get_url_names('generic_scaffold', 'TestModel'), test_crud.url_names)
+        self.assertEquals(scaffolds.get_url_names(prefix='not_there'), None)
+        entry = scaffolds.get_entry(prefix='test_slug')
+        self.assertEquals(entry['routes']['detail'], test_slug_crud.get_url_patterns()[2].pattern.regex.pattern)
+
+        self.assertEquals(scaffolds.get_url('list', prefix='test'), reverse(test_crud.list_url_name))
+        self.assertEquals(scaffolds.get_url('detail', 5, prefix='test'), reverse(test_crud.detail_url_name, args=[5]))
+        self.assertEquals(scaffolds.get_url('update', 'the-slug', prefix='test_slug'), '/test_slugupdate/the-slug')
+        self.assertEquals(scaffolds.get_url('export', prefix='test'), None)
+
+    def test_manifest_quotes_lookups(self):
+        klazz = type("CodeLookup", (TestSlugCrudManager, ), {'lookup_field': 'code'})
+        scaffolds = manifest.ScaffoldManifest(build_manifest([klazz]))
+        self.assertEquals(scaffolds.get_url('detail', 'a b,c', prefix='test_slug'), '/test_slugdetail/a%20b,c')
+
+    def test_get_url_names_fallback(self):
+        registry = dict(CrudManager._registry_by_prefix)
+        del registry['test']
+        with mock.patch.object(CrudManager, '_registry_by_prefix', registry):
+            self.assertEquals(get_url_names(prefix='test'), None)
+            with self.settings(GENERIC_SCAFFOLD_MANIFEST=self.path):
+                self.assertEquals(get_url_names(prefix='test'), test_crud.url_names)
+                self.assertEquals(set_urls_for_scaffold(prefix='test'), test_crud.url_names)
+                self.assertEquals(manifest.get_url('detail', 1, prefix='test'), '/testdetail/1')
+
+    def test_manifest_reloaded(self):
+        scaffolds = manifest.load_manifest(self.path)
+        self.assertTrue(manifest.load_manifest(self.path) is scaffolds)
+        manifest.write_manifest({'version': manifest.MANIFEST_VERSION, 'scaffolds': []}, self.path)
+        self.assertEquals(manifest.load_manifest(self.path).get_url_names(prefix='test'), None)
+
+        manifest.write_manifest({'version': 0, 'scaffolds': []}, self.path)
+        with self.assertRaises(django.core.exceptions.ImproperlyConfigured):
+            manifest.load_manifest(self.path)
+        self.assertEquals(manifest.load_manifest(self.path + '.missing'), None)
+        self.assertEquals(manifest.load_manifest(os.path.dirname(self.path)), None)
+
+    def test_manifest_permissions(self):
+        umask = os.umask(0o022)
+        try:
+            manifest.write_manifest({'version': manifest.MANIFEST_VERSION, 'scaffolds': []}, self.path)
+        finally:
+            os.umask(umask)
+        self.assertEquals(os.stat(self.path).st_mode & 0o777, 0o644)
+
+    def test_manifest_without_path(self):
+        self.assertEquals(manifest.load_manifest(), None)
+        with self.assertRaises(CommandError):
+            call_command('scaffold_manifest')
+
+    def test_loader_does_not_import_views(self):
+        code = (
+            'import sys; from django.conf import settings; settings.configure(); '
+            'import generic_scaffold.manifest; print("generic_scaffold.views" in sys.modules)'
+        )
+        output = subprocess.check_output([sys.executable, '-c', code], cwd=os.path.dirname(os.path.dirname(__file__)))
+        self.assertEquals(output.strip(), b'False')
+
+
 class TestTempalteTags(TestCase):
     def test_template_tags_with_prefix(self):
         names = set_urls_for_scaffold(prefix='test')
@@ -271,6 +752,1313 @@ class TestTempalteTags(TestCase):
         for attr in ['list', 'create', 'update', 'delete', 'detail']:
             self.assertEquals( names[attr], "{0}_generic_scaffold_testmodel_{1}".format(TestCrudManager.prefix, attr))
 
+    def test_row_urls(self):
+        for crud in [test_crud, test_empty_prefix_crud]:
+            obj = crud.model(pk=42)
+            urls = row_urls(crud, obj)
+            self.assertEquals(sorted(urls.keys()), ['delete', 'detail', 'update'])
+            for attr in ['detail', 'update', 'delete']:
+                self.assertEquals(urls[attr], reverse(getattr(crud, attr + '_url_name'), args=[42]))
+
+    def test_list_uses_row_urls(self):
+        obj = TestModel.objects.create(test='test')
+        resp = Client().get(reverse(get_url_names(prefix='test')['list']))
+        self.assertTrue(reverse(get_url_names(prefix='test')['update'], args=[obj.pk]).encode() in resp.content)
+
+
+class TestViewClassCache(TestCase):
+    def test_view_classes_are_cached(self):
+        for action in ['list', 'create', 'update', 'delete', 'detail']:
+            self.assertTrue(test_crud.get_view_class(action) is test_crud.get_view_class(action))
+        self.assertEquals(test_crud.get_view_class('list').__bases__[-1].__name__, "ListView")
+
+    def test_url_patterns_are_idempotent(self):
+        patterns = test_crud.get_url_patterns()
+        patterns.append(None)
+        again = test_crud.get_url_patterns()
+        self.assertEquals(len(again), 6)
+        for p1, p2 in zip(patterns, again):
+            self.assertTrue(p1.callback is p2.callback)
+
+    def test_resolved_view_is_cached_view(self):
+        view = resolve(reverse(get_url_names(prefix='test')['list'])).func
+        self.assertTrue(view is test_crud.get_view('list'))
+        self.assertTrue(view.view_class is test_crud.get_view_class('list'))
+
+
+class TestLazyViews(TestCase):
+    def test_url_patterns_do_not_build_views(self):
+        crud = TestLazyCrudManager()
+        patterns = crud.get_url_patterns()
+        self.assertEquals(crud._view_classes, {})
+        self.assertEquals([p.name for p in patterns], [crud.url_names[a] for a in ['list', 'create', 'detail', 'update', 'delete', 'autocomplete']])
+
+    def test_lazy_view_attributes(self):
+        crud = type("LazyCsrfExempt", (TestLazyCrudManager, ), {'permissions': {'create': csrf_exempt}})()
+        view = crud.get_lazy_view('create')
+        self.assertTrue(view.csrf_exempt)
+        self.assertEquals(crud._view_classes, {})
+        self.assertFalse(hasattr(crud.get_lazy_view('list'), 'csrf_exempt'))
+
+        view(RequestFactory().get('/'))
+        self.assertTrue(view.view_class is crud.get_view_class('create'))
+
+    def test_string_model(self):
+        self.assertEquals(TestLazyCrudManager.url_names['list'], 'test_lazy_generic_scaffold_testlazymodel_list')
+        self.assertEquals(get_url_names(app='generic_scaffold', model='testlazymodel'), TestLazyCrudManager.url_names)
+
+    def test_with_client(self):
+        c = Client()
+        list_resp = c.get(reverse(get_url_names(prefix='test_lazy')['list']))
+        self.assertEquals(list_resp.status_code, 200)
+        self.assertTrue(TestLazyCrudManager.model is TestLazyModel)
+        self.assertEquals(test_lazy_crud.get_view_class('list').model, TestLazyModel)
+
+        create_resp = c.get(reverse(get_url_names(prefix='test_lazy')['create']))
+        self.assertTrue(b'id_test' in create_resp.content)
+
+        obj = TestLazyModel.objects.create(test='lazy')
+
+        detail_resp = c.get(reverse(get_url_names(prefix='test_lazy')['detail'], args=[obj.pk]))
+        self.assertTrue(b'TestLazyModel object' in detail_resp.content)
+
+
+class TestCompactUrls(TestCase):
+    def test_reverse(self):
+        self.assertEquals(reverse(test_compact_crud.list_url_name), '/test_compact/')
+        self.assertEquals(reverse(test_compact_crud.detail_url_name, args=[3]), '/test_compact/detail/3')
+        self.assertEquals(reverse(test_compact2_crud.update_url_name, args=[3]), '/test_compact2update/3')
+
+    def test_resolve(self):
+        for crud in [test_compact_crud, test_compact2_crud]:
+            match = resolve(reverse(crud.list_url_name))
+            self.assertEquals(match.url_name, crud.list_url_name)
+            self.assertTrue(match.func is crud.get_url_patterns()[0].callback)
+
+            match = resolve(reverse(crud.delete_url_name, args=[42]))
+            self.assertEquals(match.url_name, crud.delete_url_name)
+            self.assertEquals(match.kwargs, {'pk': '42'})
+
+    def test_not_found(self):
+        c = Client()
+        self.assertEquals(c.get('/test_compact/detail/foo').status_code, 404)
+        self.assertEquals(c.get('/test_compact/detail/').status_code, 404)
+        self.assertEquals(c.get('/test_compact/foo/').status_code, 404)
+
+    def test_with_client(self):
+        c = Client()
+        obj = TestCompactModel.objects.create(test='compact')
+        list_resp = c.get(reverse(test_compact_crud.list_url_name))
+        self.assertTrue(b'TestCompactModel object' in list_resp.content)
+        detail_resp = c.get(reverse(test_compact_crud.detail_url_name, args=[obj.pk]))
+        self.assertTrue(b'TestCompactModel object' in detail_resp.content)
+        create_resp = c.get(reverse(test_compact2_crud.create_url_name))
+        self.assertTrue(b'id_test' in create_resp.content)
+
+
+class TestExport(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(User.objects.create_user('user'))
+        for i in range(5):
+            TestExportModel.objects.create(test='test,{0}'.format(i), number=i)
+        TestExportModel.objects.create(test='hidden')
+
+    def test_export_disabled_by_default(self):
+        self.assertFalse('export' in test_crud.url_names)
+        self.assertEquals(len(test_crud.get_url_patterns()), 6)
+
+    def test_csv(self):
+        resp = self.client.get(reverse(test_export_crud.url_names['export']))
+        self.assertEquals(resp['Content-Type'], 'text/csv')
+        self.assertTrue(resp.streaming)
+        lines = b''.join(resp.streaming_content).decode('utf-8').splitlines()
+        self.assertEquals(lines[0], 'id,test,number')
+        self.assertEquals(len(lines), 6)
+        self.assertTrue(lines[1].endswith(',"test,0",0'))
+
+    def test_ndjson(self):
+        resp = self.client.get(reverse(test_export_crud.url_names['export']), {'format': 'ndjson'})
+        self.assertEquals(resp['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in b''.join(resp.streaming_content).decode('utf-8').splitlines()]
+        self.assertEquals([row['number'] for row in rows], [0, 1, 2, 3, 4])
+        self.assertEquals(sorted(rows[0].keys()), ['id', 'number', 'test'])
+
+    def test_unknown_format(self):
+        resp = self.client.get(reverse(test_export_crud.url_names['export']), {'format': 'xml'})
+        self.assertEquals(resp.status_code, 404)
+
+    def test_uses_list_permission(self):
+        resp = Client().get(reverse(test_export_crud.url_names['export']))
+        self.assertEquals(resp.status_code, 302)
+
+
+class TestBulkActions(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(User.objects.create_user('user'))
+        self.objects = [TestBulkModel.objects.create(test='bulk{0}'.format(i), number=i) for i in range(4)]
+        self.management = {'form-INITIAL_FORMS': '2', 'form-MIN_NUM_FORMS': '0', 'form-MAX_NUM_FORMS': '1000'}
+
+    def test_invalid_bulk_action(self):
+        with self.assertRaises(django.core.exceptions.ImproperlyConfigured):
+            type("InvalidBulk", (TestBulkCrudManager, ), {'bulk_actions': ('foo', )}).get_actions()
+
+    def test_list_has_selection(self):
+        resp = self.client.get(reverse(test_bulk_crud.list_url_name))
+        self.assertTrue(b"name='pk'" in resp.content)
+        self.assertTrue(reverse(test_bulk_crud.url_names['bulk_delete']).encode() in resp.content)
+        resp = self.client.get(reverse(test_crud.list_url_name))
+        self.assertFalse(b"name='pk'" in resp.content)
+
+    def test_bulk_delete(self):
+        url = reverse(test_bulk_crud.url_names['bulk_delete'])
+        resp = self.client.post(url, {'pk': [self.objects[0].pk, self.objects[2].pk]})
+        self.assertRedirects(resp, reverse(test_bulk_crud.list_url_name))
+        self.assertEquals(list(TestBulkModel.objects.values_list('test', flat=True).order_by('pk')), ['bulk1', 'bulk3'])
+
+        self.assertEquals(self.client.get(url).status_code, 405)
+        self.assertEquals(self.client.post(url, {'pk': 'foo'}).status_code, 400)
+        self.assertEquals(Client().post(url, {'pk': self.objects[1].pk}).status_code, 302)
+        self.assertEquals(TestBulkModel.objects.count(), 2)
+
+    def test_action_mixins(self):
+        class FirstTwoMixin(object):
+            def get_queryset(self):
+                return super(FirstTwoMixin, self).get_queryset().filter(number__lt=2)
+
+        crud = type("RestrictedBulk", (TestBulkCrudManager, ), {
+            'delete_mixins': [FirstTwoMixin], 'update_mixins': [FirstTwoMixin],
+        })()
+        request = RequestFactory().post('/', {'pk': [self.objects[1].pk, self.objects[3].pk]})
+        request.user = User.objects.get(username='user')
+        resp = crud.get_view('bulk_update')(request)
+        self.assertEquals([f.instance.pk for f in resp.context_data['formset'].forms], [self.objects[1].pk])
+
+        crud.get_view('bulk_delete')(request)
+        self.assertEquals(list(TestBulkModel.objects.values_list('test', flat=True).order_by('pk')), ['bulk0', 'bulk2', 'bulk3'])
+
+    def test_bulk_update(self):
+        url = reverse(test_bulk_crud.url_names['bulk_update'])
+        resp = self.client.post(url, {'pk': [self.objects[0].pk, self.objects[1].pk]})
+        self.assertTemplateUsed(resp, 'generic_scaffold/bulk_form.html')
+        self.assertEquals(len(resp.context['formset'].forms), 2)
+
+        data = {
+            'pk': [self.objects[0].pk, self.objects[1].pk], 'form-TOTAL_FORMS': '2',
+            'form-0-id': self.objects[0].pk, 'form-0-test': 'changed', 'form-0-number': '0',
+            'form-1-id': self.objects[1].pk, 'form-1-test': 'bulk1', 'form-1-number': '10',
+        }
+        data.update(self.management)
+        resp = self.client.post(url, data)
+        self.assertRedirects(resp, reverse(test_bulk_crud.list_url_name))
+        self.assertEquals(
+            list(TestBulkModel.objects.values_list('test', 'number').order_by('pk')),
+            [('changed', 0), ('bulk1', 10), ('bulk2', 2), ('bulk3', 3)]
+        )
+
+    def test_bulk_update_invalid(self):
+        url = reverse(test_bulk_crud.url_names['bulk_update'])
+        data = {
+            'pk': [self.objects[0].pk, self.objects[1].pk], 'form-TOTAL_FORMS': '2',
+            'form-0-id': self.objects[0].pk, 'form-0-test': 'changed', 'form-0-number': 'foo',
+            'form-1-id': self.objects[1].pk, 'form-1-test': 'bulk1', 'form-1-number': '1',
+        }
+        data.update(self.management)
+        resp = self.client.post(url, data)
+        self.assertEquals(resp.status_code, 200)
+        self.assertTrue(resp.context['formset'].errors[0])
+        self.assertEquals(TestBulkModel.objects.get(pk=self.objects[0].pk).test, 'bulk0')
+
+    def test_bulk_create_formset(self):
+        url = reverse(test_bulk_crud.url_names['bulk_create'])
+        resp = self.client.get(url)
+        self.assertEquals(len(resp.context['formset'].forms), 2)
+
+        resp = self.client.post(url, {
+            'form-TOTAL_FORMS': '2', 'form-INITIAL_FORMS': '0',
+            'form-0-test': 'new0', 'form-0-number': '5',
+            'form-1-test': '', 'form-1-number': '0',
+        })
+        self.assertRedirects(resp, reverse(test_bulk_crud.list_url_name))
+        self.assertEquals(TestBulkModel.objects.get(test='new0').number, 5)
+        self.assertEquals(TestBulkModel.objects.count(), 5)
+
+    def test_bulk_create_csv(self):
+        url = reverse(test_bulk_crud.url_names['bulk_create'])
+        resp = self.client.post(url, {'csv': 'test,number\nnew0,5\nnew1,6\n'})
+        self.assertRedirects(resp, reverse(test_bulk_crud.list_url_name))
+        self.assertEquals(TestBulkModel.objects.filter(test__startswith='new').count(), 2)
+
+        resp = self.client.post(url, {'csv': 'test,number\nnew2,5\nnew3,foo\n'})
+        self.assertEquals(resp.status_code, 200)
+        self.assertEquals(resp.context['csv_errors'][0][0], 2)
+        self.assertEquals(TestBulkModel.objects.filter(test__startswith='new').count(), 2)
+
+
+class TestResponseCache(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.obj = TestCachedModel.objects.create(test='cached')
+        self.list_url = reverse(test_cached_crud.list_url_name)
+        self.detail_url = reverse(test_cached_crud.detail_url_name, args=[self.obj.pk])
+
+    def test_invalid_cache_action(self):
+        klazz = type("InvalidCache", (TestCachedCrudManager, ), {'cache': {'update': 60}})
+        with self.assertRaises(django.core.exceptions.ImproperlyConfigured):
+            klazz()
+
+    def test_list_is_cached(self):
+        first = self.client.get(self.list_url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.list_url)
+        self.assertEquals(first.content, second.content)
+
+        with self.assertNumQueries(1):
+            self.client.get(self.list_url, {'foo': 'bar'})
+
+    def test_detail_is_cached(self):
+        self.client.get(self.detail_url)
+        with self.assertNumQueries(0):
+            resp = self.client.get(self.detail_url)
+        self.assertTrue(b'TestCachedModel object' in resp.content)
+
+    def test_invalidated_on_save_and_delete(self):
+        self.client.get(self.list_url)
+        TestCachedModel.objects.create(test='new')
+        resp = self.client.get(self.list_url)
+        self.assertEquals(resp.content.count(b'TestCachedModel object'), 2)
+
+        TestCachedModel.objects.get(test='new').delete()
+        resp = self.client.get(self.list_url)
+        self.assertEquals(resp.content.count(b'TestCachedModel object'), 1)
+
+    def test_invalidated_by_scaffolded_views(self):
+        self.client.get(self.list_url)
+        resp = self.client.post(reverse(test_cached_crud.update_url_name, args=[self.obj.pk]), {'test': 'changed'})
+        self.assertEquals(resp.status_code, 302)
+        with self.assertNumQueries(1):
+            resp = self.client.get(self.list_url)
+        self.assertTrue(resp.context is not None)
+        self.assertTrue(isinstance(test_cached_crud.get_view_class('update')(), InvalidateCacheMixin))
+
+    def test_cached_per_user(self):
+        self.client.get(self.list_url)
+        other = Client()
+        other.force_login(User.objects.create_user('user'))
+        with self.assertNumQueries(3):
+            other.get(self.list_url)
+
+    def test_pages_with_csrf_are_not_cached(self):
+        klazz = type("CsrfCached", (TestCachedCrudManager, ), {'list_template_name': 'generic_scaffold/form.html'})
+        view = klazz().get_view('list')
+        responses = []
+        for i in range(2):
+            request = RequestFactory().get('/csrf')
+            request.user = AnonymousUser()
+            responses.append(view(request).content)
+        # Each response has a different csrf token
+        self.assertNotEquals(responses[0], responses[1])
+
+
+class TestConditionalGet(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.obj = TestConditionalModel.objects.create(test='conditional')
+        self.list_url = reverse(test_conditional_crud.list_url_name)
+        self.detail_url = reverse(test_conditional_crud.detail_url_name, args=[self.obj.pk])
+
+    def test_invalid_etag_strategy(self):
+        klazz = type("InvalidEtag", (TestConditionalCrudManager, ), {'etag_strategy': 'foo'})
+        with self.assertRaises(django.core.exceptions.ImproperlyConfigured):
+            klazz()
+        klazz = type("AggregateWithoutField", (TestConditionalCrudManager, ), {'last_modified_field': None})
+        with self.assertRaises(django.core.exceptions.ImproperlyConfigured):
+            klazz()
+
+    def test_list_etag(self):
+        resp = self.client.get(self.list_url)
+        self.assertEquals(resp.status_code, 200)
+        etag = resp['ETag']
+        self.assertFalse(resp.has_header('Last-Modified'))
+
+        with self.assertNumQueries(1):
+            resp = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEquals(resp.status_code, 304)
+        self.assertEquals(resp.content, b'')
+
+        TestConditionalModel.objects.create(test='new')
+        resp = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEquals(resp.status_code, 200)
+        self.assertNotEquals(resp['ETag'], etag)
+
+    def test_list_last_modified_only(self):
+        klazz = type("LastModifiedOnly", (TestConditionalCrudManager, ), {'etag_strategy': None})
+        view = klazz().get_view('list')
+        TestConditionalModel.objects.create(test='deleted')
+        resp = view(RequestFactory().get('/'))
+        etag = resp['ETag']
+        self.assertFalse(resp.has_header('Last-Modified'))
+        self.assertEquals(view(RequestFactory().get('/', HTTP_IF_NONE_MATCH=etag)).status_code, 304)
+
+        TestConditionalModel.objects.filter(test='deleted').delete()
+        resp = view(RequestFactory().get('/', HTTP_IF_NONE_MATCH=etag))
+        self.assertEquals(resp.status_code, 200)
+        resp = view(RequestFactory().get('/', HTTP_IF_MODIFIED_SINCE=http_date()))
+        self.assertEquals(resp.status_code, 200)
+
+    def test_detail_last_modified(self):
+        resp = self.client.get(self.detail_url)
+        last_modified = resp['Last-Modified']
+        resp = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEquals(resp.status_code, 304)
+
+    def test_detail_not_found(self):
+        resp = self.client.get(reverse(test_conditional_crud.detail_url_name, args=[self.obj.pk + 1]))
+        self.assertEquals(resp.status_code, 404)
+
+    def test_version_etag(self):
+        klazz = type("VersionEtag", (TestConditionalCrudManager, ), {
+            'etag_strategy': 'version',
+            'last_modified_field': None,
+        })
+        view = klazz().get_view('list')
+        resp = view(RequestFactory().get('/'))
+        etag = resp['ETag']
+        with self.assertNumQueries(0):
+            resp = view(RequestFactory().get('/', HTTP_IF_NONE_MATCH=etag))
+        self.assertEquals(resp.status_code, 304)
+
+        self.obj.save()
+        resp = view(RequestFactory().get('/', HTTP_IF_NONE_MATCH=etag))
+        self.assertEquals(resp.status_code, 200)
+
+
+class TestAsyncViews(TestCase):
+    def setUp(self):
+        self.client = AsyncClient()
+        self.user_client = AsyncClient()
+        self.user_client.force_login(User.objects.create_user('async', password='async'))
+        self.urls = test_async_crud.url_names
+        for i in range(3):
+            TestAsyncModel.objects.create(test='async{0}'.format(i))
+
+    def test_views_are_async(self):
+        for action in ['list', 'create', 'detail', 'update', 'delete']:
+            self.assertTrue(test_async_crud.get_view_class(action).view_is_async)
+            self.assertTrue(asyncio.iscoroutinefunction(test_async_crud.get_view(action)))
+            self.assertTrue(asyncio.iscoroutinefunction(test_async_crud.get_lazy_view(action)))
+
+    def test_incompatible_options(self):
+        for options in [{'cache': {'list': 60}}, {'etag_strategy': 'version'}]:
+            klazz = type("InvalidAsync", (TestAsyncCrudManager, ), options)
+            with self.assertRaises(django.core.exceptions.ImproperlyConfigured):
+                klazz()
+
+    async def test_list(self):
+        resp = await self.client.get(reverse(self.urls['list']))
+        self.assertEquals(resp.status_code, 200)
+        self.assertTrue(b'async0' in resp.content)
+        self.assertTrue(b'async1' in resp.content)
+        self.assertFalse(b'async2' in resp.content)
+        self.assertTemplateUsed(resp, 'generic_scaffold/list.html')
+
+        resp = await self.client.get(reverse(self.urls['list']), {'page': 2})
+        self.assertTrue(b'async2' in resp.content)
+        resp = await self.client.get(reverse(self.urls['list']), {'page': 3})
+        self.assertEquals(resp.status_code, 404)
+
+    async def test_list_without_count(self):
+        klazz = type("AsyncNoCount", (TestAsyncCrudManager, ), {'list_count': 'none'})
+        view = klazz().get_view('list')
+        resp = await view(RequestFactory().get('/', {'page': 2}))
+        self.assertTrue(b'async2' in resp.content)
+        self.assertFalse(b'?page=3' in resp.content)
+
+    async def test_keyset_list(self):
+        klazz = type("AsyncKeyset", (TestAsyncCrudManager, ), {'list_pagination': 'keyset'})
+        view = klazz().get_view('list')
+        request = RequestFactory().get('/')
+        resp = await view(request)
+        self.assertTrue(b'async1' in resp.content)
+        self.assertFalse(b'async2' in resp.content)
+        self.assertTrue(b'?cursor=' in resp.content)
+
+    async def test_render_in_thread(self):
+        # The __str__ of the model and the fallback templates access foreign keys
+        klazz = type("AsyncRelated", (TestRelatedCrudManager, ), {
+            'async_views': True, 'list_select_related': None, 'list_prefetch_related': None,
+            'detail_select_related': None,
+        })
+        crud = klazz()
+        target = await TestRelatedTarget.objects.acreate(test='target')
+        obj = await TestRelatedModel.objects.acreate(test='related', target=target)
+        resp = await crud.get_view('list')(RequestFactory().get('/'))
+        self.assertTrue(b'related target' in resp.content)
+        for action in ['detail', 'delete']:
+            resp = await crud.get_view(action)(RequestFactory().get('/'), pk=obj.pk)
+            self.assertTrue(b'related target' in resp.content)
+
+    async def test_detail(self):
+        obj = await TestAsyncModel.objects.aget(test='async1')
+        resp = await self.client.get(reverse(self.urls['detail'], args=[obj.pk]))
+        self.assertEquals(resp.status_code, 200)
+        self.assertTrue(b'async1' in resp.content)
+        resp = await self.client.get(reverse(self.urls['detail'], args=[obj.pk + 100]))
+        self.assertEquals(resp.status_code, 404)
+
+    async def test_create_and_update(self):
+        resp = await self.client.get(reverse(self.urls['create']))
+        self.assertEquals(resp.status_code, 200)
+        self.assertTrue(b'name="test"' in resp.content)
+
+        resp = await self.client.post(reverse(self.urls['create']), {})
+        self.assertEquals(resp.status_code, 200)
+        self.assertTrue(b'required' in resp.content)
+
+        resp = await self.client.post(reverse(self.urls['create']), {'test': 'created'})
+        obj = await TestAsyncModel.objects.aget(test='created')
+        self.assertEquals(resp.status_code, 302)
+        self.assertEquals(resp['Location'], reverse(self.urls['detail'], args=[obj.pk]))
+
+        resp = await self.client.post(reverse(self.urls['update'], args=[obj.pk]), {'test': 'updated'})
+        self.assertEquals(resp.status_code, 302)
+        self.assertTrue(await TestAsyncModel.objects.filter(test='updated').aexists())
+
+    async def test_cached_count_invalidation(self):
+        crud = type("AsyncCachedCount", (TestAsyncCrudManager, ), {'list_count': 'cached'})()
+        version = get_model_version(TestAsyncModel, cache)
+        resp = await crud.get_view('create')(RequestFactory().post('/', {'test': 'created'}))
+        self.assertEquals(resp.status_code, 302)
+        self.assertNotEquals(get_model_version(TestAsyncModel, cache), version)
+
+        obj = await TestAsyncModel.objects.aget(test='created')
+        resp = await crud.get_view('update')(RequestFactory().post('/', {'test': 'updated'}), pk=obj.pk)
+        self.assertEquals(resp.status_code, 302)
+
+    async def test_delete_needs_login(self):
+        obj = await TestAsyncModel.objects.aget(test='async0')
+        url = reverse(self.urls['delete'], args=[obj.pk])
+        resp = await self.client.post(url)
+        self.assertEquals(resp.status_code, 302)
+        self.assertTrue('login' in resp['Location'])
+
+        resp = await self.user_client.get(url)
+        self.assertEquals(resp.status_code, 200)
+        resp = await self.user_client.post(url)
+        self.assertEquals(resp.status_code, 302)
+        self.assertEquals(resp['Location'], reverse(self.urls['list']))
+        self.assertFalse(await TestAsyncModel.objects.filter(pk=obj.pk).aexists())
+
+
+class TestApi(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.urls = test_api_crud.url_names
+        for i in range(3):
+            TestApiModel.objects.create(test='api{0}'.format(i), number=i)
+
+    def test_url_names(self):
+        self.assertEquals(self.urls['api_list'], 'test_api_generic_scaffold_testapimodel_api_list')
+        self.assertEquals(reverse(self.urls['api_detail'], args=[1]), '/test_apiapi/detail/1')
+        self.assertFalse('api_list' in test_crud.url_names)
+
+    def test_list(self):
+        with self.assertNumQueries(2):
+            resp = self.client.get(reverse(self.urls['api_list']))
+        self.assertEquals(resp['Content-Type'], 'application/json')
+        data = resp.json()
+        self.assertEquals(data['count'], 3)
+        self.assertEquals(data['previous'], None)
+        self.assertEquals([r['test'] for r in data['results']], ['api0', 'api1'])
+        self.assertEquals(sorted(data['results'][0].keys()), ['id', 'number', 'test'])
+
+        data = self.client.get(data['next']).json()
+        self.assertEquals([r['test'] for r in data['results']], ['api2'])
+        self.assertEquals(data['next'], None)
+
+    def test_action_mixins(self):
+        class PositiveMixin(object):
+            ordering = ('-number', )
+
+            def get_queryset(self):
+                return super(PositiveMixin, self).get_queryset().filter(number__gt=0)
+
+        class NotAllowedMixin(object):
+            def get_queryset(self):
+                raise django.core.exceptions.PermissionDenied
+
+        crud = type("RestrictedApi", (TestApiCrudManager, ), {
+            'list_mixins': [PositiveMixin], 'detail_mixins': [NotAllowedMixin],
+        })()
+        data = json.loads(crud.get_view('api_list')(RequestFactory().get('/')).content)
+        self.assertEquals([r['test'] for r in data['results']], ['api2', 'api1'])
+        self.assertEquals(data['count'], 2)
+        with self.assertRaises(django.core.exceptions.PermissionDenied):
+            crud.get_view('api_detail')(RequestFactory().get('/'), pk=1)
+
+    def test_list_without_count(self):
+        klazz = type("NoCountApi", (TestApiCrudManager, ), {'list_count': 'none'})
+        view = klazz().get_view('api_list')
+        with self.assertNumQueries(1):
+            data = json.loads(view(RequestFactory().get('/')).content)
+        self.assertFalse('count' in data)
+        self.assertTrue('page=2' in data['next'])
+
+    def test_list_fields(self):
+        data = self.client.get(reverse(self.urls['api_list']), {'fields': 'test'}).json()
+        self.assertEquals(data['results'], [{'test': 'api0'}, {'test': 'api1'}])
+        self.assertTrue('fields=test' in data['next'])
+
+        resp = self.client.get(reverse(self.urls['api_list']), {'fields': 'test,foo'})
+        self.assertEquals(resp.status_code, 400)
+
+    def test_keyset_list(self):
+        klazz = type("KeysetApi", (TestApiCrudManager, ), {
+            'list_pagination': 'keyset', 'list_keyset_ordering': ('-number', 'pk'),
+        })
+        view = klazz().get_view('api_list')
+        resp = view(RequestFactory().get('/', {'fields': 'test'}))
+        data = json.loads(resp.content)
+        self.assertEquals(data['results'], [{'test': 'api2'}, {'test': 'api1'}])
+        self.assertFalse('count' in data)
+        cursor = data['next'].split('cursor=')[1]
+        data = json.loads(view(RequestFactory().get('/', {'fields': 'test', 'cursor': cursor})).content)
+        self.assertEquals(data['results'], [{'test': 'api0'}])
+
+    def test_detail(self):
+        obj = TestApiModel.objects.get(test='api1')
+        resp = self.client.get(reverse(self.urls['api_detail'], args=[obj.pk]), {'fields': 'number'})
+        self.assertEquals(resp.json(), {'number': 1})
+        resp = self.client.get(reverse(self.urls['api_detail'], args=[obj.pk + 100]))
+        self.assertEquals(resp.status_code, 404)
+
+    def test_create(self):
+        url = reverse(self.urls['api_create'])
+        self.assertEquals(self.client.get(url).status_code, 405)
+
+        resp = self.client.post(url, {'test': 'form', 'number': 5})
+        self.assertEquals(resp.status_code, 201)
+        self.assertEquals(resp.json()['test'], 'form')
+
+        resp = self.client.post(url, json.dumps({'test': 'json', 'number': 6}), content_type='application/json')
+        self.assertEquals(resp.status_code, 201)
+        self.assertEquals(TestApiModel.objects.get(pk=resp.json()['id']).number, 6)
+
+        resp = self.client.post(url, json.dumps({'test': 'json', 'number': -1}), content_type='application/json')
+        self.assertEquals(resp.status_code, 400)
+        self.assertEquals(resp.json()['errors']['number'][0]['message'], 'Negative number')
+
+        resp = self.client.post(url, '[1, 2]', content_type='application/json')
+        self.assertEquals(resp.status_code, 400)
+
+    def test_update(self):
+        obj = TestApiModel.objects.get(test='api1')
+        url = reverse(self.urls['api_update'], args=[obj.pk])
+        resp = self.client.put(url, json.dumps({'test': 'updated', 'number': 10}), content_type='application/json')
+        self.assertEquals(resp.status_code, 200)
+        self.assertEquals(resp.json(), {'id': obj.pk, 'test': 'updated', 'number': 10})
+        self.assertEquals(TestApiModel.objects.get(pk=obj.pk).test, 'updated')
+
+        resp = self.client.put(url, json.dumps({'number': 11}), content_type='application/json')
+        self.assertEquals(resp.json(), {'id': obj.pk, 'test': 'updated', 'number': 11})
+
+    def test_delete(self):
+        obj = TestApiModel.objects.get(test='api1')
+        url = reverse(self.urls['api_delete'], args=[obj.pk])
+        resp = self.client.delete(url)
+        self.assertEquals(resp.status_code, 302)
+
+        self.client.force_login(User.objects.create_user('api', password='api'))
+        resp = self.client.delete(url)
+        self.assertEquals(resp.status_code, 204)
+        self.assertFalse(TestApiModel.objects.filter(pk=obj.pk).exists())
+
+
+class TestFilters(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.urls = test_filter_crud.url_names
+        for name, code, number in [
+            ('alpha', 'xa', 1), ('beta', 'xb', 2), ('gamma', 'alp', 3), ('alphabet', 'xd', 4),
+        ]:
+            TestFilterModel.objects.create(name=name, code=code, number=number)
+
+    def get_names(self, params, action='list'):
+        resp = self.client.get(reverse(self.urls[action]), params)
+        self.assertEquals(resp.status_code, 200)
+        if action == 'api_list':
+            return [row['name'] for row in resp.json()['results']]
+        return [obj.name for obj in resp.context['object_list']]
+
+    def test_exact(self):
+        self.assertEquals(self.get_names({'name': 'beta'}), ['beta'])
+        self.assertEquals(self.get_names({'number': ['1', '3']}), ['alpha', 'gamma'])
+        self.assertEquals(self.get_names({'number': '', 'foo': 'bar'}), ['alpha', 'beta'])
+
+    def test_range_and_prefix(self):
+        self.assertEquals(self.get_names({'number__gte': 2, 'number__lt': 4}), ['beta', 'gamma'])
+        self.assertEquals(self.get_names({'name__startswith': 'alpha'}), ['alpha', 'alphabet'])
+        # code is not a filter field
+        self.assertEquals(self.get_names({'code': 'xb', 'number__gt': 1}), ['beta', 'gamma'])
+
+    def test_invalid_value(self):
+        resp = self.client.get(reverse(self.urls['list']), {'number': 'foo'})
+        self.assertEquals(resp.status_code, 400)
+
+    def test_search(self):
+        self.assertEquals(self.get_names({'q': 'alp'}), ['alpha', 'gamma'])
+        self.assertEquals(self.get_names({'q': 'alpha'}), ['alpha', 'alphabet'])
+        self.assertEquals(self.get_names({'q': 'eta'}), [])
+
+    def test_pagination_keeps_filters(self):
+        resp = self.client.get(reverse(self.urls['list']), {'number__gt': 1})
+        self.assertTrue(b'?number__gt=1&amp;page=2' in resp.content)
+        self.assertTrue(b"name='q'" in resp.content)
+
+    def test_export_and_api(self):
+        self.assertEquals(self.get_names({'number__lte': 2, 'q': 'x'}, 'api_list'), ['alpha', 'beta'])
+        resp = self.client.get(reverse(self.urls['export']), {'name': 'gamma'})
+        self.assertEquals(b''.join(resp.streaming_content).decode().splitlines()[1:], ['3,gamma,alp,3'])
+
+    def test_indexed_fields(self):
+        indexed = get_indexed_fields(TestFilterModel)
+        self.assertEquals(indexed, set(['id', 'name', 'number']))
+
+    def test_missing_index_warning(self):
+        klazz = type("UnindexedFilter", (TestFilterCrudManager, ), {'list_filter_fields': ('code', )})
+        with self.assertWarns(MissingIndexWarning):
+            klazz()
+        klazz = type("UnindexedSearch", (TestFilterCrudManager, ), {'search_fields': ('=code', )})
+        with self.assertWarns(MissingIndexWarning):
+            klazz()
+        klazz = type("UnindexedOrdering", (TestFilterCrudManager, ), {
+            'list_pagination': 'keyset', 'list_keyset_ordering': ('code', 'pk'),
+        })
+        with self.assertWarns(MissingIndexWarning):
+            klazz()
+
+    def test_invalid_filter_field(self):
+        klazz = type("InvalidFilter", (TestFilterCrudManager, ), {'list_filter_fields': ('foo', )})
+        with self.assertRaises(django.core.exceptions.ImproperlyConfigured):
+            klazz()
+
+
+class TestConcurrentUpdates(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.obj = TestVersionedModel.objects.create(test='versioned', description='long text')
+        self.url = reverse(test_versioned_crud.update_url_name, args=[self.obj.pk])
+
+    def post(self, url=None, **data):
+        values = {'test': 'versioned', 'description': 'long text', '_version': '0'}
+        values.update(data)
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.post(url or self.url, values)
+        updates = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('UPDATE')]
+        return resp, updates
+
+    def test_form_has_version(self):
+        resp = self.client.get(self.url)
+        self.assertTrue(b'<input type="hidden" name="_version" value="0"' in resp.content)
+        self.assertFalse(b'name="version"' in resp.content)
+        resp = self.client.get(reverse(test_versioned_crud.create_url_name))
+        self.assertFalse(b'version' in resp.content)
+
+    def test_update_changed_fields(self):
+        resp, updates = self.post(test='changed')
+        self.assertEquals(resp.status_code, 302)
+        self.assertEquals(len(updates), 1)
+        self.assertTrue('"test"' in updates[0])
+        self.assertTrue('"version"' in updates[0])
+        self.assertFalse('"description"' in updates[0])
+        obj = TestVersionedModel.objects.get(pk=self.obj.pk)
+        self.assertEquals((obj.test, obj.version), ('changed', 1))
+
+    def test_no_changes(self):
+        resp, updates = self.post()
+        self.assertEquals(resp.status_code, 302)
+        self.assertEquals(updates, [])
+        self.assertEquals(TestVersionedModel.objects.get(pk=self.obj.pk).version, 0)
+
+    def test_stale_update(self):
+        self.post(test='first')
+        resp, updates = self.post(test='second')
+        self.assertEquals(resp.status_code, 409)
+        self.assertTrue(b'changed by someone else' in resp.content)
+        self.assertEquals(updates, [])
+        self.assertEquals(TestVersionedModel.objects.get(pk=self.obj.pk).test, 'first')
+
+        resp, updates = self.post(test='third', _version='')
+        self.assertEquals(resp.status_code, 409)
+        resp, updates = self.post(test='third', _version='1')
+        self.assertEquals(resp.status_code, 302)
+        self.assertEquals(TestVersionedModel.objects.get(pk=self.obj.pk).version, 2)
+
+    def test_timestamp_concurrency_field(self):
+        klazz = type("TimestampVersion", (TestVersionedCrudManager, ), {
+            'concurrency_field': 'updated', 'update_changed_only': False,
+        })
+        view = klazz().get_view('update')
+        version = TestVersionedModel._meta.get_field('updated').value_to_string(self.obj)
+        data = {'test': 'changed', 'description': 'long text', 'version': '5', '_version': version}
+        resp = view(RequestFactory().post('/', data), pk=self.obj.pk)
+        self.assertEquals(resp.status_code, 302)
+        obj = TestVersionedModel.objects.get(pk=self.obj.pk)
+        self.assertEquals((obj.test, obj.version), ('changed', 5))
+        self.assertTrue(obj.updated > self.obj.updated)
+
+        resp = view(RequestFactory().post('/', data), pk=self.obj.pk)
+        self.assertEquals(resp.status_code, 409)
+
+    def test_plain_timestamp_concurrency_field(self):
+        obj = TestStampedModel.objects.create(test='stamped')
+        view = test_stamped_crud.get_view('update')
+        data = {'test': 'first', '_version': ''}
+        resp = view(RequestFactory().post('/', data), pk=obj.pk)
+        self.assertEquals(resp.status_code, 302)
+        self.assertNotEquals(TestStampedModel.objects.get(pk=obj.pk).stamp, None)
+
+        # The same form again must not overwrite the first change
+        resp = view(RequestFactory().post('/', dict(data, test='second')), pk=obj.pk)
+        self.assertEquals(resp.status_code, 409)
+        self.assertEquals(TestStampedModel.objects.get(pk=obj.pk).test, 'first')
+
+    def test_invalid_concurrency_field(self):
+        klazz = type("InvalidVersion", (TestVersionedCrudManager, ), {'concurrency_field': 'test'})
+        with self.assertRaises(django.core.exceptions.ImproperlyConfigured):
+            klazz().get_update_class_view()
+
+    async def test_async_stale_update(self):
+        klazz = type("AsyncVersioned", (TestVersionedCrudManager, ), {'async_views': True})
+        view = klazz().get_view('update')
+        data = {'test': 'changed', 'description': 'long text', '_version': '0'}
+        resp = await view(RequestFactory().post('/', data), pk=self.obj.pk)
+        self.assertEquals(resp.status_code, 302)
+        resp = await view(RequestFactory().post('/', data), pk=self.obj.pk)
+        self.assertEquals(resp.status_code, 409)
+
+
+class TestFastDelete(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.obj = TestFastDeleteModel.objects.create(test='fast', body='x' * 1000)
+        self.url = reverse(test_fast_delete_crud.delete_url_name, args=[self.obj.pk])
+
+    def test_confirmation_defers_big_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.get(self.url)
+        self.assertEquals(resp.status_code, 200)
+        self.assertTrue(b'fast' in resp.content)
+        self.assertEquals(len(queries), 1)
+        self.assertFalse('"body"' in queries[0]['sql'])
+
+    def test_confirmation_delete_fields(self):
+        klazz = type("DeleteFields", (TestFastDeleteCrudManager, ), {'delete_fields': ('test', )})
+        view = klazz().get_view('delete')
+        with CaptureQueriesContext(connection) as queries:
+            view(RequestFactory().get('/'), pk=self.obj.pk).render()
+        self.assertEquals(len(queries), 1)
+        self.assertTrue('"test"' in queries[0]['sql'])
+        self.assertFalse('"body"' in queries[0]['sql'])
+
+    def test_fast_delete(self):
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.post(self.url)
+        self.assertEquals(resp.status_code, 302)
+        self.assertEquals(resp['Location'], reverse(test_fast_delete_crud.list_url_name))
+        self.assertEquals([q['sql'].split()[0] for q in queries], ['DELETE'])
+        self.assertFalse(TestFastDeleteModel.objects.exists())
+
+        resp = self.client.post(self.url)
+        self.assertEquals(resp.status_code, 404)
+
+    def test_delete_receivers(self):
+        for options in [{'cache': {'list': 60}}, {'list_count': 'cached'}, {'etag_strategy': 'version'}]:
+            klazz = type("CachedFastDelete", (TestFastDeleteCrudManager, ), options)
+            with self.assertRaises(django.core.exceptions.ImproperlyConfigured):
+                klazz()
+
+        def receiver(sender, **kwargs):
+            pass
+
+        post_delete.connect(receiver, sender=TestFastDeleteModel)
+        try:
+            with self.assertWarns(FastDeleteWarning):
+                TestFastDeleteCrudManager().get_view_class('delete')
+        finally:
+            post_delete.disconnect(receiver, sender=TestFastDeleteModel)
+
+    async def test_async_fast_delete(self):
+        klazz = type("AsyncFastDelete", (TestFastDeleteCrudManager, ), {'async_views': True})
+        view = klazz().get_view('delete')
+        resp = await view(RequestFactory().get('/'), pk=self.obj.pk)
+        self.assertTrue(b'fast' in resp.content)
+        resp = await view(RequestFactory().post('/'), pk=self.obj.pk)
+        self.assertEquals(resp.status_code, 302)
+        self.assertFalse(await TestFastDeleteModel.objects.aexists())
+
+
+class TestInstrumentation(TestCase):
+    def setUp(self):
+        self.reports = []
+        for i in range(3):
+            TestOffsetModel.objects.create(test='offset{0}'.format(i))
+            TestAsyncModel.objects.create(test='async{0}'.format(i))
+
+    def get_crud(self, manager, **options):
+        reports = self.reports
+        options.update({
+            'instrument': True,
+            'instrument_callback': lambda *args: reports.append(args[:2] + (dict(args[2]), )),
+        })
+        return type("Instrumented", (manager, ), options)()
+
+    def test_not_instrumented_by_default(self):
+        resp = self.client.get(reverse(test_offset_crud.list_url_name))
+        self.assertFalse(resp.has_header('Server-Timing'))
+
+    def test_list_timings(self):
+        signals = []
+
+        def receiver(sender, **kwargs):
+            signals.append(kwargs)
+        view_timed.connect(receiver)
+        try:
+            view = self.get_crud(TestOffsetCrudManager, server_timing=True).get_view('list')
+            resp = view(RequestFactory().get('/'))
+        finally:
+            view_timed.disconnect(receiver)
+
+        self.assertTrue(resp.is_rendered)
+        prefix, action, timings = self.reports[0]
+        self.assertEquals((prefix, action), ('test_offset', 'list'))
+        self.assertEquals(timings['queries'], 2)
+        self.assertTrue(0 < timings['db'] <= timings['total'])
+        self.assertTrue(0 < timings['render'] <= timings['total'])
+        self.assertTrue(timings['queryset'] > 0)
+        self.assertEquals(signals[0]['prefix'], 'test_offset')
+        self.assertEquals(signals[0]['action'], 'list')
+        self.assertEquals(signals[0]['response'], resp)
+
+        header = resp['Server-Timing']
+        self.assertTrue(header.startswith('queryset;dur='))
+        self.assertTrue('db;dur=' in header and '2 queries' in header and 'total;dur=' in header)
+
+    def test_redirect_timings(self):
+        view = self.get_crud(TestOffsetCrudManager).get_view('delete')
+        resp = view(RequestFactory().post('/'), pk=TestOffsetModel.objects.first().pk)
+        self.assertEquals(resp.status_code, 302)
+        self.assertFalse(resp.has_header('Server-Timing'))
+        prefix, action, timings = self.reports[0]
+        self.assertEquals(action, 'delete')
+        self.assertEquals(timings['render'], 0)
+        self.assertTrue(timings['queries'] >= 1)
+
+    async def test_async_timings(self):
+        view = self.get_crud(TestAsyncCrudManager, server_timing=True).get_view('list')
+        resp = await view(RequestFactory().get('/'))
+        self.assertEquals(resp.status_code, 200)
+        prefix, action, timings = self.reports[0]
+        self.assertEquals((prefix, action), ('test_async', 'list'))
+        self.assertEquals(timings['queries'], 2)
+        self.assertTrue(timings['render'] > 0)
+        self.assertTrue(resp.has_header('Server-Timing'))
+
+    async def test_concurrent_async_timings(self):
+        crud = self.get_crud(TestAsyncCrudManager)
+        obj = await TestAsyncModel.objects.afirst()
+        await asyncio.gather(
+            crud.get_view('list')(RequestFactory().get('/')),
+            crud.get_view('detail')(RequestFactory().get('/'), pk=obj.pk),
+        )
+        queries = dict((action, timings['queries']) for prefix, action, timings in self.reports)
+        self.assertEquals(queries, {'list': 2, 'detail': 1})
+
+
+class TestTemplateRendering(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.objs = [
+            TestVersionedModel.objects.create(test='row{0}'.format(i)) for i in range(3)
+        ]
+
+    def test_templates_are_pinned(self):
+        view = type("Pinned", (TestOffsetCrudManager, ), {'pin_templates': True})().get_view('list')
+        with mock.patch('generic_scaffold.rendering.select_template', wraps=select_template) as selected:
+            for i in range(3):
+                resp = view(RequestFactory().get('/'))
+                resp.render()
+        self.assertEquals(selected.call_count, 1)
+        self.assertEquals(resp.template_name.template.name, 'generic_scaffold/list.html')
+
+    def test_templates_not_pinned_in_debug(self):
+        klazz = type("Debug", (TestOffsetCrudManager, ), {})
+        with self.settings(DEBUG=True):
+            self.assertEquals(klazz().get_template_mixins(), [FallbackTemplateMixin])
+        self.assertEquals(klazz().get_template_mixins(), [PinnedTemplateMixin, FallbackTemplateMixin])
+
+    def test_row_cache(self):
+        view = type("RowCached", (TestVersionedCrudManager, ), {
+            'list_row_cache_field': 'updated'
+        })().get_view('list')
+        self.assertTrue(b'row0' in view(RequestFactory().get('/')).render().content)
+
+        # The row is not rendered again until the field changes
+        TestVersionedModel.objects.filter(pk=self.objs[0].pk).update(test='changed')
+        with CaptureQueriesContext(connection) as queries:
+            content = view(RequestFactory().get('/')).render().content
+        self.assertEquals(len(queries), 1)
+        self.assertTrue(b'row0' in content and b'changed' not in content)
+
+        obj = TestVersionedModel.objects.get(pk=self.objs[0].pk)
+        obj.save()
+        content = view(RequestFactory().get('/')).render().content
+        self.assertTrue(b'changed' in content and b'row0' not in content)
+        self.assertTrue(b'row1' in content and b'row2' in content)
+
+    def test_row_cache_without_prefix(self):
+        crud = type("RowCachedNoPrefix", (TestVersionedCrudManager, ), {
+            'prefix': None, 'list_row_cache_field': 'updated',
+        })()
+        view = crud.get_view('list')
+        self.assertTrue(b'row0' in view(RequestFactory().get('/')).render().content)
+        with self.assertNumQueries(1):
+            self.assertTrue(b'row0' in view(RequestFactory().get('/')).render().content)
+
+    def test_row_cache_only_fields(self):
+        crud = type("RowCachedOnly", (TestVersionedCrudManager, ), {
+            'list_row_cache_field': 'updated', 'list_fields': ['test'],
+        })()
+        self.assertEquals(crud.get_queryset_plan('list')['only_fields'], ('test', 'updated'))
+
+    def test_no_row_cache_by_default(self):
+        with mock.patch.object(CrudManager, 'get_row_cache') as get_row_cache:
+            test_versioned_crud.get_view('list')(RequestFactory().get('/')).render()
+        self.assertFalse(get_row_cache.called)
+
+    def test_invalid_row_cache_field(self):
+        klazz = type("InvalidRowCache", (TestVersionedCrudManager, ), {'list_row_cache_field': 'foo'})
+        with self.assertRaises(django.core.exceptions.ImproperlyConfigured):
+            klazz()
+
+
+class TestStreamingList(TestCase):
+    def setUp(self):
+        self.objs = [TestOffsetModel.objects.create(test='row{0}'.format(i)) for i in range(5)]
+        self.rows = ["/test_offsetdetail/{0}'".format(obj.pk) for obj in self.objs]
+
+    def get_view(self, manager=TestOffsetCrudManager, **options):
+        options.setdefault('list_streaming', True)
+        return type("Streaming", (manager, ), options)().get_view('list')
+
+    def test_streaming_whole_list(self):
+        view = self.get_view(list_pagination=None, list_streaming_chunk_size=2)
+        with CaptureQueriesContext(connection) as queries:
+            resp = view(RequestFactory().get('/'))
+            self.assertEquals(len(queries), 0)
+            chunks = [chunk.decode() for chunk in resp.streaming_content]
+        self.assertEquals(len(queries), 1)
+        self.assertTrue(resp.streaming)
+        # The header, three chunks of rows and the footer
+        self.assertEquals(len(chunks), 5)
+        self.assertTrue('<ul>' in chunks[0] and self.rows[0] not in chunks[0])
+        self.assertTrue(self.rows[0] in chunks[1] and self.rows[1] in chunks[1] and self.rows[2] not in chunks[1])
+        self.assertTrue(self.rows[4] in chunks[3] and '</ul>' in chunks[4])
+
+    def test_streaming_paginated_list(self):
+        view = self.get_view()
+        resp = view(RequestFactory().get('/'))
+        self.assertFalse(resp.streaming)
+        content = resp.render().content.decode()
+        self.assertTrue(self.rows[1] in content and self.rows[2] not in content and 'all=1' in content)
+
+        content = b''.join(view(RequestFactory().get('/', {'all': '1'})).streaming_content).decode()
+        self.assertTrue(all(row in content for row in self.rows))
+
+    def test_streaming_template_names(self):
+        view_class = type("Streaming", (TestOffsetCrudManager, ), {'list_streaming': True})().get_view_class('list')
+        self.assertEquals(view_class.get_streaming_template_names(view_class, '_list_streaming'), (
+            'generic_scaffold/testoffsetmodel_list_streaming.html', 'generic_scaffold/list_streaming.html',
+        ))
+
+        view = self.get_view(list_pagination=None, list_template_name='generic_scaffold/list.html')
+        content = b''.join(view(RequestFactory().get('/')).streaming_content).decode()
+        self.assertTrue(all(row in content for row in self.rows))
+        view_class = view.view_class
+        self.assertEquals(view_class.get_streaming_template_names(view_class, '_list_rows'), (
+            'generic_scaffold/list_rows.html',
+        ))
+
+        view = self.get_view(list_pagination=None, list_template_name='foo/bar.html')
+        with self.assertRaises(TemplateDoesNotExist):
+            b''.join(view(RequestFactory().get('/')).streaming_content)
+
+    def test_streaming_filtered_list(self):
+        TestFilterModel.objects.create(name='foo', code='a')
+        TestFilterModel.objects.create(name='bar', code='b')
+        view = self.get_view(TestFilterCrudManager)
+        content = b''.join(view(RequestFactory().get('/', {'all': '1', 'name': 'foo'})).streaming_content)
+        self.assertTrue(b'foo' in content and b'bar' not in content)
+
+    def test_streaming_keyset_list(self):
+        objs = [TestKeysetModel.objects.create(test='test', rank=rank) for rank in (1, 3, 2)]
+        view = self.get_view(TestKeysetCrudManager)
+        content = b''.join(view(RequestFactory().get('/', {'all': '1'})).streaming_content).decode()
+        indexes = [content.index("/test_keysetdetail/{0}'".format(obj.pk)) for obj in objs]
+        self.assertTrue(indexes[1] < indexes[2] < indexes[0])
+
+    def test_streaming_instrumented(self):
+        view = self.get_view(list_pagination=None, instrument=True)
+        content = b''.join(view(RequestFactory().get('/')).streaming_content).decode()
+        self.assertTrue(self.rows[4] in content)
+
+    def test_streaming_async(self):
+        klazz = type("AsyncStreaming", (TestOffsetCrudManager, ), {'list_streaming': True, 'async_views': True})
+        with self.assertRaises(django.core.exceptions.ImproperlyConfigured):
+            klazz()
+
+
+class TestDatabaseRouting(TestCase):
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        self.obj = TestVersionedModel.objects.create(test='primary')
+        TestVersionedModel.objects.using('replica').create(pk=self.obj.pk, test='replica')
+        self.crud = type("Routed", (TestVersionedCrudManager, ), {'read_database': 'replica'})()
+
+    def test_reads_use_read_database(self):
+        resp = self.crud.get_view('list')(RequestFactory().get('/')).render()
+        self.assertTrue(b'replica' in resp.content and b'primary' not in resp.content)
+        resp = self.crud.get_view('detail')(RequestFactory().get('/'), pk=self.obj.pk)
+        self.assertEquals(resp.context_data['object'].test, 'replica')
+        self.assertEquals(resp.context_data['object']._state.db, 'replica')
+
+    def test_writes_use_write_database(self):
+        resp = self.crud.get_view('create')(RequestFactory().post('/', {'test': 'created', 'description': ''}))
+        self.assertEquals(resp.status_code, 302)
+        self.assertTrue(TestVersionedModel.objects.filter(test='created').exists())
+        self.assertFalse(TestVersionedModel.objects.using('replica').filter(test='created').exists())
+        self.assertEquals(resp.cookies['generic_scaffold_write']['max-age'], 10)
+
+        resp = self.crud.get_view('update')(RequestFactory().post('/', {
+            'test': 'changed', 'description': '', '_version': '0'
+        }), pk=self.obj.pk)
+        self.assertEquals(resp.status_code, 302)
+        self.assertEquals(TestVersionedModel.objects.get(pk=self.obj.pk).test, 'changed')
+        self.assertEquals(TestVersionedModel.objects.using('replica').get(pk=self.obj.pk).test, 'replica')
+
+        self.crud.get_view('delete')(RequestFactory().post('/'), pk=self.obj.pk)
+        self.assertFalse(TestVersionedModel.objects.filter(pk=self.obj.pk).exists())
+        self.assertTrue(TestVersionedModel.objects.using('replica').filter(pk=self.obj.pk).exists())
+
+    def test_read_after_write(self):
+        request = RequestFactory().get('/')
+        request.COOKIES['generic_scaffold_write'] = '1'
+        resp = self.crud.get_view('list')(request).render()
+        self.assertTrue(b'primary' in resp.content and b'replica' not in resp.content)
+
+        resp = self.crud.get_view('list')(RequestFactory().get('/'))
+        self.assertFalse('generic_scaffold_write' in resp.cookies)
+
+    async def test_async_views(self):
+        crud = type("RoutedAsync", (TestAsyncCrudManager, ), {'read_database': 'replica'})()
+        await TestAsyncModel.objects.using('replica').acreate(test='async replica')
+        resp = await crud.get_view('list')(RequestFactory().get('/'))
+        self.assertTrue(b'async replica' in resp.content)
+
+        resp = await crud.get_view('create')(RequestFactory().post('/', {'test': 'created'}))
+        self.assertEquals(resp.status_code, 302)
+        self.assertTrue('generic_scaffold_write' in resp.cookies)
+        self.assertEquals(await TestAsyncModel.objects.filter(test='created').acount(), 1)
+        self.assertEquals(await TestAsyncModel.objects.using('replica').filter(test='created').acount(), 0)
+
+    def test_write_database(self):
+        crud = type("RoutedWrites", (TestVersionedCrudManager, ), {'write_database': 'replica'})()
+        crud.get_view('create')(RequestFactory().post('/', {'test': 'created', 'description': ''}))
+        self.assertTrue(TestVersionedModel.objects.using('replica').filter(test='created').exists())
+        self.assertFalse(TestVersionedModel.objects.filter(test='created').exists())
+
+    def test_invalid_database(self):
+        klazz = type("InvalidDatabase", (TestVersionedCrudManager, ), {'read_database': 'foo'})
+        with self.assertRaises(django.core.exceptions.ImproperlyConfigured):
+            klazz()
+
+
+class TestAutocomplete(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.customers = [TestCustomer.objects.create(name=name) for name in ['alice', 'bob', 'alan']]
+        self.order = TestOrder.objects.create(customer=self.customers[1])
+        self.order.watchers.add(self.customers[2])
+
+    def get_results(self, crud=test_customer_crud, **params):
+        view = crud.get_view('autocomplete')
+        resp = view(RequestFactory().get('/', params))
+        return json.loads(resp.content)
+
+    def test_autocomplete(self):
+        url = reverse(test_customer_crud.url_names['autocomplete'])
+        self.assertEquals(url, '/test_customerautocomplete/')
+        with CaptureQueriesContext(connection) as queries:
+            data = json.loads(self.client.get(url, {'q': 'al'}).content)
+        self.assertEquals(data, {'results': [
+            {'id': self.customers[2].pk, 'text': 'alan'}, {'id': self.customers[0].pk, 'text': 'alice'},
+        ], 'more': False})
+        self.assertTrue('LIKE' in queries[0]['sql'] and 'COUNT' not in queries[0]['sql'])
+        self.assertEquals(len(self.get_results()['results']), 3)
+
+        crud = type("SmallPages", (TestCustomerCrudManager, ), {'autocomplete_paginate_by': 1})()
+        self.assertEquals(self.get_results(crud, q='al'), {
+            'results': [{'id': self.customers[2].pk, 'text': 'alan'}], 'more': True
+        })
+        self.assertEquals(self.get_results(crud, q='al', page=2)['more'], False)
+        self.assertEquals(self.client.get(url, {'page': 0}).status_code, 400)
+
+    def test_autocomplete_by_pk(self):
+        self.assertEquals(test_order_crud.get_view_class('autocomplete').autocomplete_fields, ())
+        data = self.get_results(test_order_crud, q=str(self.order.pk))
+        self.assertEquals([r['id'] for r in data['results']], [self.order.pk])
+        self.assertEquals(self.get_results(test_order_crud, q='foo')['results'], [])
+
+    def test_small_tables_are_not_lazy(self):
+        resp = self.client.get(reverse(test_order_crud.update_url_name, args=[self.order.pk]))
+        self.assertContains(resp, '>alice</option>', count=2)
+        self.assertNotContains(resp, 'data-autocomplete-url')
+
+    def test_lazy_widgets(self):
+        crud = type("LazyWidgets", (TestOrderCrudManager, ), {'autocomplete_threshold': 2})()
+        resp = crud.get_view('update')(RequestFactory().get('/'), pk=self.order.pk).render()
+        content = resp.content.decode()
+        self.assertFalse('alice' in content)
+        self.assertTrue('<option value="{0}" selected>bob</option>'.format(self.customers[1].pk) in content)
+        self.assertTrue('<option value="{0}" selected>alan</option>'.format(self.customers[2].pk) in content)
+        self.assertTrue('data-autocomplete-url="/test_customerautocomplete/"' in content)
+
+        resp = crud.get_view('create')(RequestFactory().get('/')).render()
+        self.assertTrue('<option value="" selected>---------</option>' in resp.content.decode())
+        self.assertFalse('alice' in resp.content.decode())
+
+        # Options that were not rendered can still be selected
+        resp = crud.get_view('create')(RequestFactory().post('/', {
+            'customer': self.customers[0].pk, 'watchers': [self.customers[0].pk]
+        }))
+        self.assertEquals(resp.status_code, 302)
+        self.assertEquals(TestOrder.objects.last().customer, self.customers[0])
+
+    def test_missing_autocomplete_url(self):
+        crud = type("MissingUrl", (TestOrderCrudManager, ), {'autocomplete_threshold': 2})()
+        view_class = type("MissingUrlView", (crud.get_view_class('update'), ), {
+            'autocomplete_widgets': {'customer': 'no_such_autocomplete'},
+        })
+        resp = view_class.as_view()(RequestFactory().get('/'), pk=self.order.pk).render()
+        self.assertTrue('alice' in resp.content.decode())
+        self.assertFalse('data-autocomplete-url' in resp.content.decode())
+
+    def test_table_size_expires(self):
+        crud = type("CountTimeout", (TestOrderCrudManager, ), {'autocomplete_threshold': 3})()
+        view = crud.get_view('update')
+        resp = view(RequestFactory().get('/'), pk=self.order.pk).render()
+        self.assertTrue('alice' in resp.content.decode())
+
+        TestCustomer.objects.create(name='carol')
+        resp = view(RequestFactory().get('/'), pk=self.order.pk).render()
+        self.assertTrue('alice' in resp.content.decode())
+        cache.delete(get_count_key(TestCustomer))
+        resp = view(RequestFactory().get('/'), pk=self.order.pk).render()
+        self.assertFalse('alice' in resp.content.decode())
+
+    def test_list_mixins(self):
+        class NotAllowedMixin(object):
+            def get_queryset(self):
+                raise django.core.exceptions.PermissionDenied
+
+        class OnlyAMixin(object):
+            def get_queryset(self):
+                return super(OnlyAMixin, self).get_queryset().filter(name__startswith='a')
+
+        crud = type("RestrictedAutocomplete", (TestCustomerCrudManager, ), {'list_mixins': [OnlyAMixin]})()
+        self.assertEquals([r['text'] for r in self.get_results(crud)['results']], ['alan', 'alice'])
+        crud = type("DisabledAutocomplete", (TestCustomerCrudManager, ), {'list_mixins': [NotAllowedMixin]})()
+        with self.assertRaises(django.core.exceptions.PermissionDenied):
+            self.get_results(crud, q='al')
+
+    def test_disabled(self):
+        crud = type("NoLazyWidgets", (TestOrderCrudManager, ), {'autocomplete_threshold': None})()
+        self.assertFalse(issubclass(crud.get_view_class('update'), AutocompleteWidgetsMixin))
+        crud = type("NoAutocomplete", (TestCustomerCrudManager, ), {'autocomplete': False})()
+        self.assertFalse('autocomplete' in crud.get_actions())
+
+
+class TestLookups(TestCase):
+    def setUp(self):
+        self.uuid_obj = TestUUIDModel.objects.create(test='uuid')
+        self.slug_obj = TestSlugModel.objects.create(slug='the-slug', code='a b,c', test='slug')
+
+    def test_uuid_primary_key(self):
+        url = reverse(test_uuid_crud.detail_url_name, args=[self.uuid_obj.pk])
+        self.assertEquals(url, '/test_uuiddetail/{0}'.format(self.uuid_obj.pk))
+        resp = self.client.get(url)
+        self.assertEquals(resp.status_code, 200)
+        self.assertEquals(resp.context['object'], self.uuid_obj)
+        self.assertEquals(self.client.get('/test_uuiddetail/{0}'.format(uuid.uuid4())).status_code, 404)
+        self.assertEquals(self.client.get('/test_uuiddetail/1').status_code, 404)
+
+        resp = self.client.get(reverse(test_uuid_crud.list_url_name))
+        self.assertContains(resp, "href='{0}'".format(url))
+        self.assertContains(resp, "href='{0}'".format(
+            reverse(test_uuid_crud.delete_url_name, args=[self.uuid_obj.pk])
+        ))
+
+        resp = self.client.post(reverse(test_uuid_crud.update_url_name, args=[self.uuid_obj.pk]), {'test': 'changed'})
+        self.assertEquals(resp.status_code, 302)
+        self.assertEquals(TestUUIDModel.objects.get().test, 'changed')
+        self.client.post(reverse(test_uuid_crud.delete_url_name, args=[self.uuid_obj.pk]))
+        self.assertFalse(TestUUIDModel.objects.exists())
+
+    def test_lookup_field(self):
+        url = reverse(test_slug_crud.detail_url_name, args=['the-slug'])
+        self.assertEquals(url, '/test_slugdetail/the-slug')
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.get(url)
+        self.assertEquals(resp.context['object'], self.slug_obj)
+        self.assertTrue('"slug" = ' in queries[0]['sql'])
+        self.assertEquals(self.client.get('/test_slugdetail/{0}'.format(self.slug_obj.pk)).status_code, 404)
+        self.assertEquals(self.client.get('/test_slugdetail/not.a.slug').status_code, 404)
+        self.assertEquals(test_slug_crud.row_urls(self.slug_obj)['update'], '/test_slugupdate/the-slug')
+
+        resp = self.client.get(reverse(test_slug_crud.url_names['api_detail'], args=['the-slug']))
+        self.assertEquals(json.loads(resp.content)['test'], 'slug')
+
+        resp = self.client.post(reverse(test_slug_crud.update_url_name, args=['the-slug']), {
+            'slug': 'the-slug', 'code': 'code', 'test': 'changed'
+        })
+        self.assertEquals(resp.status_code, 302)
+        self.assertEquals(TestSlugModel.objects.get().test, 'changed')
+
+        view = type("FastDeleteSlug", (TestSlugCrudManager, ), {'fast_delete': True})().get_view('delete')
+        self.assertEquals(view(RequestFactory().post('/'), slug='the-slug').status_code, 302)
+        self.assertFalse(TestSlugModel.objects.exists())
+
+    def test_string_lookup_field(self):
+        crud = type("CodeLookup", (TestSlugCrudManager, ), {'lookup_field': 'code'})()
+        urlconf = types.ModuleType(str('code_urls'))
+        urlconf.urlpatterns = crud.get_url_patterns()
+        url = reverse(crud.detail_url_name, args=['a b,c'], urlconf=urlconf)
+        self.assertEquals(url, '/test_slugdetail/a%20b,c')
+        with self.settings(ROOT_URLCONF=urlconf):
+            self.assertEquals(crud.row_urls(self.slug_obj)['detail'], '/test_slugdetail/a%20b,c')
+        match = resolve('/test_slugdetail/a b,c', urlconf=urlconf)
+        self.assertEquals(match.kwargs, {'code': 'a b,c'})
+
+    def test_invalid_lookup_field(self):
+        for lookup_field in ['test', 'foo']:
+            klazz = type("InvalidLookup", (TestSlugCrudManager, ), {'lookup_field': lookup_field})
+            with self.assertRaises(django.core.exceptions.ImproperlyConfigured):
+                klazz().get_url_patterns()
+
 
 class TestOverrideViews(TestCase):
     def setUp(self):
@@ -287,3 +2075,179 @@ class TestOverrideViews(TestCase):
         self.assertEquals(self.update_view.__bases__[-1].__name__, "OverridenUpdateView")
         self.assertEquals(self.delete_view.__bases__[-1].__name__, "OverridenDeleteView")
         self.assertEquals(self.detail_view.__bases__[-1].__name__, "OverridenDetailView")
+
+
+class TestPagination(TestCase):
+    def setUp(self):
+        self.client = Client()
+        for i in range(5):
+            TestOffsetModel.objects.create(test='offset{0}'.format(i))
+        for i, rank in enumerate([3, 1, 3, 2, 1]):
+            TestKeysetModel.objects.create(test='keyset{0}'.format(i), rank=rank)
+
+    def test_no_pagination_by_default(self):
+        self.assertEquals(test_crud.get_list_class_view().paginate_by, None)
+
+    def test_invalid_pagination(self):
+        klazz = type("InvalidPagination", (TestOffsetCrudManager, ), {'list_pagination': 'foo'})
+        with self.assertRaises(django.core.exceptions.ImproperlyConfigured):
+            klazz().get_list_class_view()
+
+    def test_nullable_keyset_field(self):
+        klazz = type("NullKeyset", (TestStampedCrudManager, ), {
+            'list_pagination': 'keyset', 'list_keyset_ordering': ('stamp', 'pk'),
+        })
+        with self.assertRaises(django.core.exceptions.ImproperlyConfigured):
+            klazz()
+
+    def test_offset_default_ordering(self):
+        self.assertEquals(test_offset_crud.get_list_class_view()().get_ordering(), ('pk', ))
+
+        OrderingMixin = type("OrderingMixin", (object, ), {'ordering': ('-test', )})
+        klazz = type("MixinOrdering", (TestOffsetCrudManager, ), {'list_mixins': [OrderingMixin]})
+        self.assertEquals(klazz().get_list_class_view()().get_ordering(), ('-test', ))
+
+    def test_offset_pagination(self):
+        url = reverse(get_url_names(prefix='test_offset')['list'])
+        resp = self.client.get(url)
+        self.assertEquals(len(resp.context['object_list']), 2)
+        self.assertTrue(resp.context['is_paginated'])
+        self.assertTrue(b'?page=2' in resp.content)
+
+        resp = self.client.get(url, {'page': 3})
+        self.assertEquals(len(resp.context['object_list']), 1)
+
+    def get_count_strategy_view(self, list_count):
+        klazz = type("CountStrategy", (TestOffsetCrudManager, ), {'list_count': list_count})
+        return klazz().get_view('list')
+
+    def test_invalid_count_strategy(self):
+        klazz = type("InvalidCount", (TestOffsetCrudManager, ), {'list_count': 'foo'})
+        with self.assertRaises(django.core.exceptions.ImproperlyConfigured):
+            klazz()
+
+    def test_cached_count(self):
+        cache.clear()
+        view = self.get_count_strategy_view('cached')
+        with self.assertNumQueries(2):
+            resp = view(RequestFactory().get('/')).render()
+        self.assertEquals(resp.context_data['paginator'].count, 5)
+        with self.assertNumQueries(1):
+            resp = view(RequestFactory().get('/', {'page': 2})).render()
+        self.assertEquals(resp.context_data['paginator'].count, 5)
+
+        TestOffsetModel.objects.create(test='offset5')
+        with self.assertNumQueries(2):
+            resp = view(RequestFactory().get('/')).render()
+        self.assertEquals(resp.context_data['paginator'].count, 6)
+
+    def test_estimated_count_falls_back_to_exact(self):
+        view = self.get_count_strategy_view('estimated')
+        with self.assertNumQueries(2):
+            resp = view(RequestFactory().get('/')).render()
+        self.assertEquals(resp.context_data['paginator'].count, 5)
+
+    def test_no_count(self):
+        view = self.get_count_strategy_view('none')
+        with self.assertNumQueries(1):
+            resp = view(RequestFactory().get('/', {'page': 2})).render()
+        page = resp.context_data['page_obj']
+        self.assertEquals([obj.test for obj in page], ['offset2', 'offset3'])
+        self.assertTrue(page.has_next())
+        self.assertTrue(b'?page=1' in resp.content)
+        self.assertTrue(b'?page=3' in resp.content)
+
+        resp = view(RequestFactory().get('/', {'page': 3})).render()
+        self.assertFalse(resp.context_data['page_obj'].has_next())
+        self.assertFalse(b'?page=4' in resp.content)
+        with self.assertRaises(Http404):
+            view(RequestFactory().get('/', {'page': 4}))
+
+    def test_keyset_pagination(self):
+        url = reverse(get_url_names(prefix='test_keyset')['list'])
+        seen = []
+        resp = self.client.get(url)
+        self.assertFalse(resp.context['page_obj'].has_previous())
+        while True:
+            seen.extend(obj.test for obj in resp.context['object_list'])
+            page = resp.context['page_obj']
+            if not page.has_next():
+                break
+            resp = self.client.get(url, {'cursor': page.next_cursor})
+        self.assertEquals(seen, ['keyset0', 'keyset2', 'keyset3', 'keyset1', 'keyset4'])
+
+        page = resp.context['page_obj']
+        resp = self.client.get(url, {'cursor': page.previous_cursor})
+        self.assertEquals([obj.test for obj in resp.context['object_list']], ['keyset3', 'keyset1'])
+        self.assertTrue(resp.context['page_obj'].has_next())
+        self.assertTrue(resp.context['page_obj'].has_previous())
+
+    def test_keyset_pagination_does_not_count(self):
+        url = reverse(get_url_names(prefix='test_keyset')['list'])
+        with self.assertNumQueries(1):
+            self.client.get(url)
+
+    def test_keyset_invalid_cursor(self):
+        url = reverse(get_url_names(prefix='test_keyset')['list'])
+        resp = self.client.get(url, {'cursor': 'foo'})
+        self.assertEquals(resp.status_code, 404)
+
+
+class TestQuerysetPlan(TestCase):
+    def setUp(self):
+        self.client = Client()
+        target = TestRelatedTarget.objects.create(test='target')
+        for i in range(5):
+            obj = TestRelatedModel.objects.create(test='related{0}'.format(i), target=target)
+            obj.tags.add(target)
+
+    def test_no_automatic_plan(self):
+        klazz = type("NoPlan", (TestRelatedCrudManager, ), {
+            'list_select_related': None, 'list_prefetch_related': None, 'list_defer_fields': (),
+            'detail_select_related': None, 'detail_prefetch_related': None,
+        })
+        for action in ['list', 'detail']:
+            self.assertEquals(klazz().get_queryset_plan(action), {
+                'select_related': (), 'prefetch_related': (), 'only_fields': (), 'defer_fields': (),
+            })
+        query = str(klazz().get_list_class_view()().get_queryset().query)
+        self.assertFalse('JOIN' in query)
+
+    def test_declared_plan(self):
+        plan = test_related_crud.get_queryset_plan('list')
+        self.assertEquals(plan['select_related'], ('target', ))
+        self.assertEquals(plan['prefetch_related'], ('tags', ))
+        self.assertEquals(plan['defer_fields'], ('description', ))
+
+    def test_declarative_plan(self):
+        klazz = type("DeclarativePlan", (TestRelatedCrudManager, ), {
+            'list_select_related': ('target', ),
+            'list_prefetch_related': (),
+            'detail_prefetch_related': (),
+        })
+        plan = klazz().get_queryset_plan('list')
+        self.assertEquals(plan['select_related'], ('target', ))
+        self.assertEquals(plan['prefetch_related'], ())
+        plan = klazz().get_queryset_plan('detail')
+        self.assertEquals(plan['select_related'], ('target', ))
+        self.assertEquals(plan['prefetch_related'], ())
+
+    def test_list_fields_plan(self):
+        klazz = type("FieldsPlan", (TestRelatedCrudManager, ), {
+            'list_fields': ('test', 'target__test'), 'list_select_related': None, 'list_prefetch_related': None,
+        })
+        plan = klazz().get_queryset_plan('list')
+        self.assertEquals(plan['select_related'], ('target', ))
+        self.assertEquals(plan['prefetch_related'], ())
+        self.assertEquals(plan['only_fields'], ('test', 'target__test'))
+        self.assertEquals(len(klazz().get_list_class_view()().get_queryset()), 5)
+
+    def test_list_queries_do_not_depend_on_rows(self):
+        with self.assertNumQueries(2):
+            resp = self.client.get(reverse(get_url_names(prefix='test_related')['list']))
+        self.assertTrue(b'related4 target target' in resp.content)
+
+    def test_detail_queries(self):
+        obj = TestRelatedModel.objects.first()
+        with self.assertNumQueries(2):
+            self.client.get(reverse(get_url_names(prefix='test_related')['detail'], args=[obj.pk]))
@@ -0,0 +1,97 @@
+from asgiref.sync import sync_to_async
+from django import forms
+from django.core.exceptions import ImproperlyConfigured
+from django.db import models, router, transaction
+from django.http import HttpResponseRedirect
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+def check_concurrency_field(model, name):
+    "The concurrency field must be an integer version or a timestamp"
+    field = model._meta.get_field(name)
+    if not isinstance(field, (models.IntegerField, models.DateTimeField)):
+        raise ImproperlyConfigured(
+            'concurrency_field {0}.{1} must be an IntegerField or a DateTimeField'.format(
+                model._meta.label, name
+            )
+        )
+    return field
+
+
+class ConcurrentUpdateMixin(object):
+    """
+    Save only the changed fields of the object and/or refuse to save it if
+    its concurrency_field has changed since the form was displayed.
+    """
+    update_changed_only = False
+    concurrency_field = None
+    concurrency_kwarg = '_version'
+    conflict_message = _('This object has been changed by someone else since you loaded it. '
+                         'Please reload the page and try again.')
+
+    def get_version(self, obj):
+        return self.model._meta.get_field(self.concurrency_field).value_to_string(obj)
+
+    def get_form(self, form_class=None):
+        form = super(ConcurrentUpdateMixin, self).get_form(form_class)
+        if self.concurrency_field and self.object is not None:
+            form.fields[self.concurrency_kwarg] = forms.CharField(widget=forms.HiddenInput, required=False)
+            form.initial[self.concurrency_kwarg] = self.get_version(self.object)
+        return form
+
+    def get_update_fields(self, form):
+        "The concrete fields to save or None to save all of them"
+        if not self.update_changed_only:
+            return None
+        concrete_fields = set(f.name for f in self.model._meta.concrete_fields if not f.primary_key)
+        return [name for name in form.changed_data if name in concrete_fields]
+
+    def is_stale(self, form):
+        "Lock the row and check that it has the version of the submitted form"
+        field = self.model._meta.get_field(self.concurrency_field)
+        current = self.model._default_manager.db_manager(self.object._state.db).select_for_update().filter(
+            pk=self.object.pk
+        ).values_list(field.attname, flat=True).get()
+        # Use the current value so that the saved version follows it
+        setattr(self.object, field.attname, current)
+        return self.get_version(self.object) != form.cleaned_data.get(self.concurrency_kwarg)
+
+    def save_object(self, form):
+        "Save the form and return False if it was stale"
+        # The object has been read from the database it will be saved to
+        with transaction.atomic(using=self.object._state.db or router.db_for_write(self.model)):
+            if self.concurrency_field and self.is_stale(form):
+                return False
+            self.object = form.save(commit=False)
+            update_fields = self.get_update_fields(form)
+            if self.concurrency_field and update_fields != []:
+                field = self.model._meta.get_field(self.concurrency_field)
+                if isinstance(field, models.IntegerField):
+                    setattr(self.object, field.attname, (getattr(self.object, field.attname) or 0) + 1)
+                elif not field.auto_now:
+                    # An auto_now timestamp is set by its pre_save
+                    setattr(self.object, field.attname, timezone.now())
+                if update_fields is not None:
+                    update_fields.append(field.name)
+            if update_fields is None:
+                self.object.save()
+            elif update_fields:
+                self.object.save(update_fields=update_fields)
+            form.save_m2m()
+        return True
+
+    def get_conflict_response(self, form):
+        form.add_error(None, self.conflict_message)
+        return self.render_to_response(self.get_context_data(form=form), status=409)
+
+    def form_valid(self, form):
+        if not self.save_object(form):
+            return self.get_conflict_response(form)
+        return HttpResponseRedirect(self.get_success_url())
+
+    async def aform_valid(self, form):
+        if not await sync_to_async(self.save_object)(form):
+            form.add_error(None, self.conflict_message)
+            return await self.render_form(form, status=409)
+        return HttpResponseRedirect(self.get_success_url())
@@ -5,17 +5,41 @@ else:
     from django.conf.urls import url
 
 if django.VERSION >= (2, 0, 0):
-    from django.urls import reverse
+    from django.urls import reverse, get_script_prefix, get_urlconf
 else:
-    from django.core.urlresolvers import reverse
+    from django.core.urlresolvers import reverse, get_script_prefix, get_urlconf
 
 from django.views.generic import ListView, CreateView , DetailView, UpdateView, DeleteView, TemplateView
-from six import with_metaclass
-try:
-    from django.apps import apps
-    get_model = apps.get_model
-except:
-    from django.db.models.loading import get_model
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.forms import modelform_factory
+from django.utils.http import RFC3986_SUBDELIMS
+from six.moves.urllib.parse import quote
+from six import with_metaclass, string_types
+from generic_scaffold import manifest
+from generic_scaffold.pagination import DefaultOrderingMixin, KeysetPaginationMixin, get_keyset_fields
+from generic_scaffold.querysets import QuerysetPlanMixin, plan_related_fields
+from generic_scaffold.export import ExportMixin
+from generic_scaffold.bulk import BulkDeleteView, BulkUpdateView, BulkCreateView
+from generic_scaffold.cache import CacheResponseMixin, InvalidateCacheMixin, connect_cache_signals
+from generic_scaffold.conditional import ConditionalGetMixin
+from generic_scaffold.counts import PAGINATOR_CLASSES
+from generic_scaffold.filters import FilterMixin, check_indexes
+from generic_scaffold.deletes import FastDeleteMixin, AsyncFastDeleteMixin, check_fast_delete
+from generic_scaffold.instrumentation import InstrumentationMixin
+from generic_scaffold.rendering import PinnedTemplateMixin, get_row_cache_key
+from generic_scaffold.routing import DatabaseRoutingMixin
+from generic_scaffold.streaming import StreamingListMixin
+from generic_scaffold.autocomplete import AutocompleteView, AutocompleteWidgetsMixin, get_autocomplete_fields
+from generic_scaffold.lookups import INT_LOOKUP, get_lookup_field, get_lookup_regex
+from generic_scaffold.updates import ConcurrentUpdateMixin, check_concurrency_field
+from generic_scaffold.api import (
+    ApiListView, ApiKeysetListView, ApiCreateView, ApiDetailView, ApiUpdateView, ApiDeleteView
+)
+from generic_scaffold.async_views import (
+    AsyncListView, AsyncCreateView, AsyncDetailView, AsyncUpdateView, AsyncDeleteView, async_permission
+)
 
 
 def get_model_name(model):
@@ -27,6 +51,12 @@ def get_model_name(model):
 def get_app_label(model):
     return model._meta.app_label
 
+def get_model_key(model):
+    if isinstance(model, string_types):
+        app_label, model_name = model.split('.')
+        return app_label, model_name.lower()
+    return get_app_label(model), get_model_name(model)
+
 
 class CrudTracker(type):
     def __init__(cls, name, bases, attrs):
@@ -42,20 +72,40 @@ class CrudTracker(type):
         except AttributeError:
             cls.prefix = None
 
-        for r in CrudManager._registry:
-            if r.prefix == cls.prefix:
-                raise django.core.exceptions.ImproperlyConfigured
+        if cls.prefix in CrudManager._registry_by_prefix:
+            raise django.core.exceptions.ImproperlyConfigured
+
+        model_key = get_model_key(cls.model)
+        if model_key in CrudManager._registry_by_model:
+            raise django.core.exceptions.ImproperlyConfigured
+
+        cls.app_label, cls.model_name = model_key
+        cls.set_url_names()
 
-            if get_model_name(r.model)==get_model_name(cls.model) and \
-                get_app_label(r.model) == get_app_label(cls.model):
-                raise django.core.exceptions.ImproperlyConfigured
         CrudManager._registry.append(cls)
+        CrudManager._registry_by_prefix[cls.prefix] = cls
+        CrudManager._registry_by_model[model_key] = cls
+
+
+ASYNC_VIEW_CLASSES = {
+    ListView: AsyncListView,
+    CreateView: AsyncCreateView,
+    DetailView: AsyncDetailView,
+    UpdateView: AsyncUpdateView,
+    DeleteView: AsyncDeleteView,
+}
 
 
 def identity(f):
     return f
 
 
+def copy_view_attributes(view, to):
+    for attr in ['view_class', 'view_initkwargs', 'csrf_exempt']:
+        if hasattr(view, attr):
+            setattr(to, attr, getattr(view, attr))
+
+
 class FallbackTemplateMixin(object, ):
     def get_template_names(self):
         names = super(FallbackTemplateMixin, self).get_template_names()
@@ -63,6 +113,8 @@ class FallbackTemplateMixin(object, ):
             fallback_name = 'confirm_delete'
         elif self.kind in ['create', 'update']:
             fallback_name = 'form'
+        elif self.kind in ['bulk_create', 'bulk_update']:
+            fallback_name = 'bulk_form'
         else:
             fallback_name = self.kind
         names.append('generic_scaffold/{0}.html'.format(fallback_name))
@@ -72,11 +124,16 @@ class FallbackTemplateMixin(object, ):
 
 class CrudManager(with_metaclass(CrudTracker, object, )):
     _registry = []
+    _registry_by_prefix = {}
+    _registry_by_model = {}
     list_mixins = []
     delete_mixins = []
     detail_mixins = []
     create_mixins = []
     update_mixins = []
+    export_mixins = []
+    bulk_mixins = []
+    api_mixins = []
 
     list_view_class = ListView
     create_view_class = CreateView
@@ -84,22 +141,80 @@ class CrudManager(with_metaclass(CrudTracker, object, )):
     update_view_class = UpdateView
     delete_view_class = DeleteView
 
+    lazy = False
+    async_views = False
+
+    list_pagination = None
+    list_paginate_by = 25
+    list_keyset_ordering = ('pk', )
+    list_count = 'exact'
+    list_count_timeout = 300
+    list_streaming = False
+    list_streaming_chunk_size = 2000
+
+    list_filter_fields = ()
+    search_fields = ()
+
+    update_changed_only = False
+    concurrency_field = None
+
+    fast_delete = False
+    delete_fields = None
+
+    instrument = False
+    instrument_callback = None
+    server_timing = False
+
+    lookup_field = None
+
+    read_database = None
+    write_database = None
+    read_after_write_timeout = 10
+
+    pin_templates = None
+    list_row_cache_field = None
+    list_row_cache_timeout = 300
+
+    list_select_related = None
+    list_prefetch_related = None
+    list_fields = None
+    list_defer_fields = ()
+    detail_select_related = None
+    detail_prefetch_related = None
+
+    export_formats = ()
+    export_fields = None
+    export_chunk_size = 2000
+
+    bulk_actions = ()
+    bulk_batch_size = 500
+    bulk_create_extra = 10
+
+    cache = {}
+    cache_alias = 'default'
+    cache_per_user = True
+
+    last_modified_field = None
+    etag_strategy = None
+
+    api = False
+    api_fields = None
+
+    autocomplete = True
+    autocomplete_fields = None
+    autocomplete_paginate_by = 20
+    autocomplete_threshold = 1000
+    autocomplete_count_timeout = 300
+
     def __new__(cls):
-        cls.app_label = get_app_label(cls.model)
-        cls.model_name = get_model_name(cls.model)
-
-        if hasattr(cls, 'prefix') and cls.prefix:
-            cls.list_url_name = '{0}_{1}_{2}'.format(cls.prefix, cls.get_name(), 'list')
-            cls.create_url_name = '{0}_{1}_{2}'.format(cls.prefix, cls.get_name(), 'create')
-            cls.detail_url_name = '{0}_{1}_{2}'.format(cls.prefix, cls.get_name(), 'detail')
-            cls.update_url_name = '{0}_{1}_{2}'.format(cls.prefix, cls.get_name(), 'update')
-            cls.delete_url_name = '{0}_{1}_{2}'.format(cls.prefix, cls.get_name(), 'delete')
-        else:
-            cls.list_url_name = '{0}_{1}'.format(cls.get_name(), 'list')
-            cls.create_url_name = '{0}_{1}'.format(cls.get_name(), 'create')
-            cls.detail_url_name = '{0}_{1}'.format(cls.get_name(), 'detail')
-            cls.update_url_name = '{0}_{1}'.format(cls.get_name(), 'update')
-            cls.delete_url_name = '{0}_{1}'.format(cls.get_name(), 'delete')
+        if not cls.lazy:
+            cls.resolve_model()
+        return super(CrudManager, cls).__new__(cls)
+
+    @classmethod
+    def resolve_model(cls):
+        if isinstance(cls.model, string_types):
+            cls.model = apps.get_model(cls.model)
 
         cls.model.list_url_name = cls.list_url_name
         cls.model.detail_url_name = cls.detail_url_name
@@ -107,8 +222,6 @@ class CrudManager(with_metaclass(CrudTracker, object, )):
         cls.model.update_url_name = cls.update_url_name
         cls.model.delete_url_name = cls.delete_url_name
 
-        return super(CrudManager, cls).__new__(cls)
-
     def __init__(self, *args, **kwargs):
         self.perms = {
             'list': identity,
@@ -119,6 +232,92 @@ class CrudManager(with_metaclass(CrudTracker, object, )):
         }
         if hasattr(self, 'permissions') and self.permissions:
             self.perms.update(self.permissions)
+        if 'export' not in self.perms:
+            self.perms['export'] = self.perms['list']
+        for action in ['create', 'update', 'delete']:
+            if 'bulk_' + action not in self.perms:
+                self.perms['bulk_' + action] = self.perms[action]
+        for action in ['list', 'create', 'detail', 'update', 'delete']:
+            if 'api_' + action not in self.perms:
+                self.perms['api_' + action] = self.perms[action]
+        if 'autocomplete' not in self.perms:
+            self.perms['autocomplete'] = self.perms['list']
+        self._row_url_prefixes = {}
+        self._lookup = None
+        self._view_classes = {}
+        self._views = {}
+        self._url_patterns = None
+        self._list_fields_checked = False
+
+        for action in self.cache:
+            if action not in ['list', 'detail']:
+                raise django.core.exceptions.ImproperlyConfigured(
+                    "cache may only contain 'list' and 'detail'"
+                )
+        if self.list_count not in PAGINATOR_CLASSES:
+            raise django.core.exceptions.ImproperlyConfigured(
+                "list_count must be 'exact', 'cached', 'estimated' or 'none'"
+            )
+        if self.etag_strategy not in [None, 'aggregate', 'version']:
+            raise django.core.exceptions.ImproperlyConfigured(
+                "etag_strategy must be 'aggregate', 'version' or None"
+            )
+        if self.etag_strategy == 'aggregate' and not self.last_modified_field:
+            raise django.core.exceptions.ImproperlyConfigured(
+                "etag_strategy 'aggregate' needs a last_modified_field"
+            )
+        if self.async_views:
+            if django.VERSION < (4, 2):
+                raise django.core.exceptions.ImproperlyConfigured(
+                    "async_views needs django 4.2 or newer"
+                )
+            if self.cache or self.last_modified_field or self.etag_strategy or self.list_streaming:
+                raise django.core.exceptions.ImproperlyConfigured(
+                    "async_views can't be used with cache, last_modified_field, etag_strategy or list_streaming"
+                )
+        for database in [self.read_database, self.write_database]:
+            if database and database not in settings.DATABASES:
+                raise django.core.exceptions.ImproperlyConfigured(
+                    "read_database and write_database must be in settings.DATABASES"
+                )
+        if self.uses_model_version():
+            if self.fast_delete:
+                # The post_delete receiver that invalidates the cache makes
+                # django fetch the rows before deleting them
+                raise django.core.exceptions.ImproperlyConfigured(
+                    "fast_delete can't be used with cache, list_count 'cached' or etag_strategy 'version'"
+                )
+            connect_cache_signals(self.model, self.cache_alias)
+        if not self.lazy:
+            self.check_list_fields()
+
+    def check_list_fields(self):
+        if self.list_pagination == 'keyset':
+            ordering = self.list_keyset_ordering
+            get_keyset_fields(self.model, ordering, self.__class__.__name__)
+        elif self.list_pagination == 'offset':
+            ordering = self.model._meta.ordering or ('pk', )
+        else:
+            ordering = ()
+        check_indexes(
+            self.model, self.list_filter_fields, self.search_fields,
+            [o for o in ordering if isinstance(o, string_types)], label=self.__class__.__name__
+        )
+        if self.autocomplete and self.autocomplete_fields:
+            check_indexes(
+                self.model, search_fields=['^' + name for name in self.autocomplete_fields],
+                label=self.__class__.__name__
+            )
+        if self.list_row_cache_field:
+            try:
+                self.model._meta.get_field(self.list_row_cache_field)
+            except django.core.exceptions.FieldDoesNotExist:
+                raise django.core.exceptions.ImproperlyConfigured(
+                    '{0}: list_row_cache_field {1} is not a field of {2}'.format(
+                        self.__class__.__name__, self.list_row_cache_field, self.model._meta.label
+                    )
+                )
+        self._list_fields_checked = True
 
     def get_get_context_data(self, klazz, **kwargs):
         def wrapped_get_context_data(inst, **kwargs):
@@ -128,13 +327,148 @@ class CrudManager(with_metaclass(CrudTracker, object, )):
             return context
         return wrapped_get_context_data
 
+    def get_lookup(self):
+        "The (field, url kwarg, regex, sample value) of the single object urls"
+        if self._lookup is None:
+            # Don't resolve the model of lazy managers; just find its field
+            model = apps.get_model(self.model) if isinstance(self.model, string_types) else self.model
+            field = get_lookup_field(model, self.lookup_field, label=self.__class__.__name__)
+            regex, sample = get_lookup_regex(field)
+            self._lookup = (field, self.lookup_field or 'pk', regex, sample)
+        return self._lookup
+
+    def get_lookup_options(self):
+        if not self.lookup_field:
+            return {}
+        field, url_kwarg, regex, sample = self.get_lookup()
+        return {'slug_field': field.name, 'slug_url_kwarg': url_kwarg, 'query_pk_and_slug': False}
+
+    def get_row_url_prefixes(self):
+        key = (get_script_prefix(), get_urlconf())
+        prefixes = self._row_url_prefixes.get(key)
+        if prefixes is None:
+            prefixes = {}
+            sample = self.get_lookup()[3]
+            for action in ['detail', 'update', 'delete']:
+                # The lookup value is always the last part of the url so
+                # reverse it once with a placeholder and keep everything before it
+                url = reverse(getattr(self, action + '_url_name'), args=[sample])
+                prefixes[action] = url[:-len(sample)]
+            self._row_url_prefixes[key] = prefixes
+        return prefixes
+
+    def row_urls(self, obj):
+        field, url_kwarg, regex, sample = self.get_lookup()
+        value = getattr(obj, field.attname)
+        value = str(value) if regex == INT_LOOKUP[0] else quote(str(value), safe=RFC3986_SUBDELIMS + '~:@')
+        return dict((action, prefix + value) for action, prefix in self.get_row_url_prefixes().items())
+
+    def get_row_cache_key(self, obj, vary=()):
+        field = self.model._meta.get_field(self.list_row_cache_field)
+        return get_row_cache_key(get_script_prefix() + (self.prefix or ''), obj, field, vary)
+
+    def get_row_cache(self):
+        return caches[self.cache_alias]
+
+    def uses_model_version(self):
+        return bool(self.cache) or self.etag_strategy == 'version' or self.list_count == 'cached'
+
+    def get_cache_mixins(self, action):
+        mixins, options = [], {'cache_alias': self.cache_alias}
+        if action in ['list', 'detail'] and (self.last_modified_field or self.etag_strategy):
+            mixins.append(ConditionalGetMixin)
+            options['last_modified_field'] = self.last_modified_field
+            options['etag_strategy'] = self.etag_strategy
+        if action in self.cache:
+            mixins.append(CacheResponseMixin)
+            options['cache_timeout'] = self.cache[action]
+            options['cache_per_user'] = self.cache_per_user
+            options['cache_key_prefix'] = self.url_names[action]
+        elif self.uses_model_version() and action in [
+            'create', 'update', 'delete', 'bulk_create', 'bulk_update', 'bulk_delete',
+            'api_create', 'api_update', 'api_delete',
+        ]:
+            mixins.append(InvalidateCacheMixin)
+        return mixins, options
+
+    def get_paginator_class(self):
+        paginator_class = PAGINATOR_CLASSES[self.list_count]
+        if self.list_count == 'cached':
+            paginator_class = type(str('{0}_CachedCountPaginator'.format(self.get_name())), (paginator_class, ), {
+                'cache_alias': self.cache_alias,
+                'count_timeout': self.list_count_timeout,
+            })
+        return paginator_class
+
+    def get_concurrency_form_class(self):
+        # The version must not be editable
+        return modelform_factory(self.model, exclude=[self.concurrency_field])
+
+    def get_filter_options(self):
+        return {
+            'list_filter_fields': tuple(self.list_filter_fields),
+            'search_fields': tuple(self.search_fields),
+        }
+
+    def get_queryset_plan(self, action):
+        select_related = getattr(self, action + '_select_related')
+        prefetch_related = getattr(self, action + '_prefetch_related')
+        only_fields = self.list_fields if action == 'list' else None
+        if only_fields and self.list_row_cache_field:
+            # The rows are cached by the value of this field
+            only_fields = tuple(only_fields) + (self.list_row_cache_field, )
+        defer_fields = self.list_defer_fields if action == 'list' else ()
+
+        if only_fields and (select_related is None or prefetch_related is None):
+            # Only follow the relations that the declared list_fields use
+            auto_select_related, auto_prefetch_related = plan_related_fields(
+                self.model, fields=only_fields, exclude=defer_fields
+            )
+            if select_related is None:
+                select_related = auto_select_related
+            if prefetch_related is None:
+                prefetch_related = auto_prefetch_related
+
+        return {
+            'select_related': tuple(select_related or ()),
+            'prefetch_related': tuple(prefetch_related or ()),
+            'only_fields': tuple(only_fields or ()),
+            'defer_fields': tuple(defer_fields),
+        }
+
+    @classmethod
+    def get_actions(cls):
+        actions = ['list', 'create', 'detail', 'update', 'delete']
+        if cls.export_formats:
+            actions.append('export')
+        for action in cls.bulk_actions:
+            if action not in ['create', 'update', 'delete']:
+                raise django.core.exceptions.ImproperlyConfigured(
+                    "bulk_actions may only contain 'create', 'update' and 'delete'"
+                )
+            actions.append('bulk_' + action)
+        if cls.api:
+            actions.extend(['api_list', 'api_create', 'api_detail', 'api_update', 'api_delete'])
+        if cls.autocomplete:
+            actions.append('autocomplete')
+        return actions
+
+    @classmethod
+    def set_url_names(cls):
+        if cls.prefix:
+            base_name = '{0}_{1}'.format(cls.prefix, cls.get_name())
+        else:
+            base_name = cls.get_name()
+
+        cls.url_names = {}
+        for action in cls.get_actions():
+            url_name = '{0}_{1}'.format(base_name, action)
+            setattr(cls, action + '_url_name', url_name)
+            cls.url_names[action] = url_name
+
     @classmethod
     def get_name(cls):
-        try:
-            model_name = cls.model._meta.model_name
-        except:
-            model_name = cls.model._meta.module_name
-        return '{0}_{1}'.format(cls.model._meta.app_label, model_name)
+        return '{0}_{1}'.format(cls.app_label, cls.model_name)
 
     def get_list_class_view(self):
         name = '{0}_{1}'.format(self.get_name(), 'ListView')
@@ -146,9 +480,40 @@ class CrudManager(with_metaclass(CrudTracker, object, )):
         if hasattr(self, 'list_template_name') and self.list_template_name:
             options_dict['template_name'] = self.list_template_name
 
-        parent_classes_list = [FallbackTemplateMixin]
+        options_dict.update(self.get_queryset_plan('list'))
+
+        cache_mixins, cache_options = self.get_cache_mixins('list')
+        options_dict.update(cache_options)
+
+        options_dict.update(self.get_filter_options())
+
+        parent_classes_list = self.get_template_mixins()
         parent_classes_list.extend(self.list_mixins)
-        parent_classes_list.append(self.list_view_class)
+        parent_classes_list.extend(cache_mixins)
+        parent_classes_list.append(FilterMixin)
+        parent_classes_list.append(QuerysetPlanMixin)
+
+        if self.list_pagination == 'offset':
+            options_dict['paginate_by'] = self.list_paginate_by
+            options_dict['paginator_class'] = self.get_paginator_class()
+            if not self.model._meta.ordering:
+                # After the list_mixins so that their ordering is used
+                parent_classes_list.append(DefaultOrderingMixin)
+        elif self.list_pagination == 'keyset':
+            options_dict['paginate_by'] = self.list_paginate_by
+            options_dict['keyset_ordering'] = self.list_keyset_ordering
+            parent_classes_list.append(KeysetPaginationMixin)
+        elif self.list_pagination:
+            raise django.core.exceptions.ImproperlyConfigured(
+                "list_pagination must be 'offset', 'keyset' or None"
+            )
+
+        if self.list_streaming:
+            # Before the template mixins since it replaces their response
+            options_dict['streaming_chunk_size'] = self.list_streaming_chunk_size
+            parent_classes_list.insert(0, StreamingListMixin)
+
+        parent_classes_list.append(self.get_base_view_class('list'))
 
         klazz = type(name, tuple(parent_classes_list), options_dict )
         klazz.get_context_data = self.get_get_context_data(klazz)
@@ -168,10 +533,18 @@ class CrudManager(with_metaclass(CrudTracker, object, )):
         if hasattr(self, 'form_class') and self.form_class:
             options_dict['form_class'] = self.form_class
             options_dict['fields'] = None
+        elif self.concurrency_field:
+            options_dict['form_class'] = self.get_concurrency_form_class()
+            options_dict['fields'] = None
+
+        cache_mixins, cache_options = self.get_cache_mixins('create')
+        options_dict.update(cache_options)
 
-        parent_classes_list = [FallbackTemplateMixin]
+        parent_classes_list = self.get_template_mixins()
         parent_classes_list.extend(self.create_mixins)
-        parent_classes_list.append(self.create_view_class)
+        parent_classes_list.extend(cache_mixins)
+        self.add_autocomplete_widgets(parent_classes_list, options_dict)
+        parent_classes_list.append(self.get_base_view_class('create'))
 
         klazz = type(name, tuple(parent_classes_list), options_dict )
         klazz.get_context_data = self.get_get_context_data(klazz)
@@ -183,12 +556,20 @@ class CrudManager(with_metaclass(CrudTracker, object, )):
             'kind': 'detail',
             'model': self.model,
         }
+        options_dict.update(self.get_lookup_options())
         if hasattr(self, 'detail_template_name') and self.detail_template_name:
             options_dict['template_name'] = self.detail_template_name
 
-        parent_classes_list = [FallbackTemplateMixin]
+        options_dict.update(self.get_queryset_plan('detail'))
+
+        cache_mixins, cache_options = self.get_cache_mixins('detail')
+        options_dict.update(cache_options)
+
+        parent_classes_list = self.get_template_mixins()
         parent_classes_list.extend(self.detail_mixins)
-        parent_classes_list.append(self.detail_view_class)
+        parent_classes_list.extend(cache_mixins)
+        parent_classes_list.append(QuerysetPlanMixin)
+        parent_classes_list.append(self.get_base_view_class('detail'))
 
         klazz = type(name, tuple(parent_classes_list), options_dict )
         klazz.get_context_data = self.get_get_context_data(klazz)
@@ -203,14 +584,29 @@ class CrudManager(with_metaclass(CrudTracker, object, )):
         }
         if hasattr(self, 'form_template_name') and self.form_template_name:
             options_dict['template_name'] = self.form_template_name
+        options_dict.update(self.get_lookup_options())
 
         if hasattr(self, 'form_class') and self.form_class:
             options_dict['form_class'] = self.form_class
             options_dict['fields'] = None
+        elif self.concurrency_field:
+            options_dict['form_class'] = self.get_concurrency_form_class()
+            options_dict['fields'] = None
 
-        parent_classes_list = [FallbackTemplateMixin]
+        cache_mixins, cache_options = self.get_cache_mixins('update')
+        options_dict.update(cache_options)
+
+        parent_classes_list = self.get_template_mixins()
         parent_classes_list.extend(self.update_mixins)
-        parent_classes_list.append(self.update_view_class)
+        parent_classes_list.extend(cache_mixins)
+        self.add_autocomplete_widgets(parent_classes_list, options_dict)
+        if self.update_changed_only or self.concurrency_field:
+            if self.concurrency_field:
+                check_concurrency_field(self.model, self.concurrency_field)
+            options_dict['update_changed_only'] = self.update_changed_only
+            options_dict['concurrency_field'] = self.concurrency_field
+            parent_classes_list.append(ConcurrentUpdateMixin)
+        parent_classes_list.append(self.get_base_view_class('update'))
 
         klazz = type(name, tuple(parent_classes_list), options_dict )
         klazz.get_context_data = self.get_get_context_data(klazz)
@@ -226,26 +622,314 @@ class CrudManager(with_metaclass(CrudTracker, object, )):
         }
         if hasattr(self, 'delete_template_name') and self.delete_template_name:
             options_dict['template_name'] = self.delete_template_name
+        options_dict.update(self.get_lookup_options())
+
+        cache_mixins, cache_options = self.get_cache_mixins('delete')
+        options_dict.update(cache_options)
 
-        parent_classes_list = [FallbackTemplateMixin]
+        parent_classes_list = self.get_template_mixins()
         parent_classes_list.extend(self.delete_mixins)
-        parent_classes_list.append(self.delete_view_class)
+        parent_classes_list.extend(cache_mixins)
+        if self.fast_delete:
+            check_fast_delete(self.model, self.get_name())
+            options_dict['delete_fields'] = self.delete_fields
+            parent_classes_list.append(AsyncFastDeleteMixin if self.is_async('delete') else FastDeleteMixin)
+        parent_classes_list.append(self.get_base_view_class('delete'))
 
         klazz = type(name, tuple(parent_classes_list), options_dict )
         klazz.get_context_data = self.get_get_context_data(klazz)
         return klazz
 
-    def get_url_patterns(self, ):
-        prefix = hasattr(self, 'prefix') and self.prefix or ''
-
-        url_patterns = [
-            url(r'^'+prefix+'$', self.perms['list'](self.get_list_class_view().as_view()), name=self.list_url_name, ),
-            url(r'^'+prefix+'create/$', self.perms['create'](self.get_create_class_view().as_view()), name=self.create_url_name ),
-            url(r'^'+prefix+'detail/(?P<pk>\d+)$', self.perms['detail'](self.get_detail_class_view().as_view()), name=self.detail_url_name ),
-            url(r'^'+prefix+'update/(?P<pk>\d+)$', self.perms['update'](self.get_update_class_view().as_view()), name=self.update_url_name ),
-            url(r'^'+prefix+'delete/(?P<pk>\d+)$', self.perms['delete'](self.get_delete_class_view().as_view()), name=self.delete_url_name ),
+    def get_export_class_view(self):
+        name = '{0}_{1}'.format(self.get_name(), 'ExportView')
+        options_dict = {
+            'kind': 'export',
+            'model': self.model,
+            'export_formats': tuple(self.export_formats),
+            'export_fields': tuple(self.export_fields or [f.attname for f in self.model._meta.concrete_fields]),
+            'export_chunk_size': self.export_chunk_size,
+        }
+
+        options_dict.update(self.get_filter_options())
+
+        parent_classes_list = []
+        parent_classes_list.extend(self.list_mixins)
+        parent_classes_list.extend(self.export_mixins)
+        parent_classes_list.append(ExportMixin)
+        parent_classes_list.append(FilterMixin)
+        parent_classes_list.append(self.list_view_class)
+
+        return type(name, tuple(parent_classes_list), options_dict )
+
+    def get_bulk_options(self, kind):
+        options_dict = {
+            'kind': kind,
+            'model': self.model,
+            'bulk_batch_size': self.bulk_batch_size,
+            'get_success_url': lambda x: reverse(self.list_url_name),
+        }
+        if kind in ['bulk_create', 'bulk_update']:
+            options_dict['fields'] = '__all__'
+            if hasattr(self, 'form_class') and self.form_class:
+                options_dict['form_class'] = self.form_class
+                options_dict['fields'] = None
+            if hasattr(self, 'bulk_form_template_name') and self.bulk_form_template_name:
+                options_dict['template_name'] = self.bulk_form_template_name
+        if kind == 'bulk_create':
+            options_dict['bulk_create_extra'] = self.bulk_create_extra
+        return options_dict
+
+    def get_bulk_class_view(self, kind, view_class):
+        name = '{0}_{1}'.format(self.get_name(), view_class.__name__)
+        options_dict = self.get_bulk_options(kind)
+
+        cache_mixins, cache_options = self.get_cache_mixins(kind)
+        options_dict.update(cache_options)
+
+        # The restrictions of the single object views (i.e a filtered
+        # get_queryset) apply to the bulk views too
+        parent_classes_list = self.get_template_mixins()
+        parent_classes_list.extend(getattr(self, kind[len('bulk_'):] + '_mixins'))
+        parent_classes_list.extend(self.bulk_mixins)
+        parent_classes_list.extend(cache_mixins)
+        parent_classes_list.append(view_class)
+
+        klazz = type(name, tuple(parent_classes_list), options_dict )
+        klazz.get_context_data = self.get_get_context_data(klazz)
+        return klazz
+
+    def get_bulk_create_class_view(self):
+        return self.get_bulk_class_view('bulk_create', BulkCreateView)
+
+    def get_bulk_update_class_view(self):
+        return self.get_bulk_class_view('bulk_update', BulkUpdateView)
+
+    def get_bulk_delete_class_view(self):
+        return self.get_bulk_class_view('bulk_delete', BulkDeleteView)
+
+    def get_api_options(self, kind):
+        options_dict = {
+            'kind': kind,
+            'model': self.model,
+            'api_fields': tuple(self.api_fields or [f.attname for f in self.model._meta.concrete_fields]),
+        }
+        if kind == 'api_list':
+            options_dict.update(self.get_filter_options())
+            options_dict['paginate_by'] = self.list_paginate_by
+            if self.list_pagination == 'keyset':
+                options_dict['keyset_ordering'] = self.list_keyset_ordering
+            else:
+                options_dict['paginator_class'] = self.get_paginator_class()
+        if kind in ['api_detail', 'api_update', 'api_delete']:
+            options_dict.update(self.get_lookup_options())
+        if kind in ['api_create', 'api_update']:
+            options_dict['fields'] = '__all__'
+            if hasattr(self, 'form_class') and self.form_class:
+                options_dict['form_class'] = self.form_class
+                options_dict['fields'] = None
+        return options_dict
+
+    def get_api_class_view(self, kind, view_class):
+        name = '{0}_{1}'.format(self.get_name(), view_class.__name__)
+        options_dict = self.get_api_options(kind)
+
+        cache_mixins, cache_options = self.get_cache_mixins(kind)
+        options_dict.update(cache_options)
+
+        # The restrictions of the html views (i.e a filtered get_queryset)
+        # apply to the json views too
+        parent_classes_list = []
+        parent_classes_list.extend(getattr(self, kind[len('api_'):] + '_mixins'))
+        parent_classes_list.extend(self.api_mixins)
+        parent_classes_list.extend(cache_mixins)
+        if kind == 'api_list':
+            if self.list_pagination != 'keyset' and not self.model._meta.ordering:
+                parent_classes_list.append(DefaultOrderingMixin)
+            parent_classes_list.append(FilterMixin)
+        parent_classes_list.append(view_class)
+
+        return type(name, tuple(parent_classes_list), options_dict )
+
+    def get_api_list_class_view(self):
+        if self.list_pagination == 'keyset':
+            return self.get_api_class_view('api_list', ApiKeysetListView)
+        return self.get_api_class_view('api_list', ApiListView)
+
+    def get_api_create_class_view(self):
+        return self.get_api_class_view('api_create', ApiCreateView)
+
+    def get_api_detail_class_view(self):
+        return self.get_api_class_view('api_detail', ApiDetailView)
+
+    def get_api_update_class_view(self):
+        return self.get_api_class_view('api_update', ApiUpdateView)
+
+    def get_api_delete_class_view(self):
+        return self.get_api_class_view('api_delete', ApiDeleteView)
+
+    def get_autocomplete_fields(self):
+        if self.autocomplete_fields is None:
+            return get_autocomplete_fields(self.model)
+        return list(self.autocomplete_fields)
+
+    def get_autocomplete_class_view(self):
+        name = '{0}_{1}'.format(self.get_name(), 'AutocompleteView')
+        options_dict = {
+            'kind': 'autocomplete',
+            'model': self.model,
+            'autocomplete_fields': tuple(self.get_autocomplete_fields()),
+            'paginate_by': self.autocomplete_paginate_by,
+        }
+        # Like the export the autocomplete lists the rows of the list view so
+        # it uses its mixins (i.e a filtered get_queryset or a disabled view)
+        parent_classes_list = []
+        parent_classes_list.extend(self.list_mixins)
+        parent_classes_list.append(AutocompleteView)
+        return type(name, tuple(parent_classes_list), options_dict)
+
+    def get_autocomplete_widgets(self):
+        "The autocomplete url names of the relations of the model that are scaffolded"
+        widgets = {}
+        if self.autocomplete_threshold is None:
+            return widgets
+        for field in self.model._meta.get_fields():
+            if not (field.many_to_one or field.one_to_one or field.many_to_many):
+                continue
+            if not field.concrete or field.auto_created or not field.editable:
+                continue
+            related_crud = CrudManager._registry_by_model.get(get_model_key(field.related_model))
+            if related_crud is not None and related_crud.autocomplete:
+                widgets[field.name] = related_crud.url_names['autocomplete']
+        return widgets
+
+    def add_autocomplete_widgets(self, parent_classes_list, options_dict):
+        # Only for the generated forms
+        if hasattr(self, 'form_class') and self.form_class:
+            return
+        widgets = self.get_autocomplete_widgets()
+        if widgets:
+            options_dict['autocomplete_widgets'] = widgets
+            options_dict['autocomplete_threshold'] = self.autocomplete_threshold
+            options_dict['autocomplete_count_timeout'] = self.autocomplete_count_timeout
+            options_dict['cache_alias'] = self.cache_alias
+            parent_classes_list.append(AutocompleteWidgetsMixin)
+
+    def get_instrumented_class_view(self, klazz):
+        # Access the callback through the class so that it isn't bound
+        callback = type(self).instrument_callback
+        options_dict = {
+            'instrument_prefix': self.prefix,
+            'instrument_callback': staticmethod(callback) if callback else None,
+            'server_timing': self.server_timing,
+        }
+        return type(klazz.__name__, (InstrumentationMixin, klazz), options_dict)
+
+    def should_pin_templates(self):
+        if self.pin_templates is None:
+            return not settings.DEBUG
+        return self.pin_templates
+
+    def get_template_mixins(self):
+        if self.should_pin_templates():
+            return [PinnedTemplateMixin, FallbackTemplateMixin]
+        return [FallbackTemplateMixin]
+
+    def get_routed_class_view(self, klazz):
+        options_dict = {
+            'read_database': self.read_database,
+            'write_database': self.write_database,
+            'read_after_write_timeout': self.read_after_write_timeout,
+        }
+        return type(klazz.__name__, (DatabaseRoutingMixin, klazz), options_dict)
+
+    def get_base_view_class(self, action):
+        view_class = getattr(self, '{0}_view_class'.format(action))
+        if self.async_views:
+            view_class = ASYNC_VIEW_CLASSES.get(view_class, view_class)
+        return view_class
+
+    def is_async(self, action):
+        if action not in ['list', 'create', 'detail', 'update', 'delete']:
+            return False
+        return getattr(self.get_base_view_class(action), 'view_is_async', False)
+
+    def get_view_class(self, action):
+        klazz = self._view_classes.get(action)
+        if klazz is None:
+            self.resolve_model()
+            if not self._list_fields_checked:
+                self.check_list_fields()
+            klazz = getattr(self, 'get_{0}_class_view'.format(action))()
+            if self.read_database or self.write_database:
+                klazz = self.get_routed_class_view(klazz)
+            if self.instrument:
+                klazz = self.get_instrumented_class_view(klazz)
+            self._view_classes[action] = klazz
+        return klazz
+
+    def get_view(self, action):
+        view = self._views.get(action)
+        if view is None:
+            view = self.get_view_class(action).as_view()
+            if self.is_async(action):
+                view = async_permission(self.perms[action], view)
+            else:
+                view = self.perms[action](view)
+            self._views[action] = view
+        return view
+
+    def get_lazy_view(self, action):
+        def get_view():
+            view = self.get_view(action)
+            copy_view_attributes(view, lazy_view)
+            return view
+
+        if self.is_async(action):
+            async def lazy_view(request, *args, **kwargs):
+                return await get_view()(request, *args, **kwargs)
+        else:
+            def lazy_view(request, *args, **kwargs):
+                return get_view()(request, *args, **kwargs)
+        lazy_view.__name__ = '{0}_{1}_lazy_view'.format(self.get_name(), action)
+        # The attributes that the permission decorator sets (i.e csrf_exempt)
+        # are needed before the view is built; decorating the lazy view finds them
+        copy_view_attributes(self.perms[action](lazy_view), lazy_view)
+        return lazy_view
+
+    @classmethod
+    def get_routes(cls):
+        prefix = hasattr(cls, 'prefix') and cls.prefix or ''
+        actions = cls.get_actions()
+        routes = [
+            ('list', prefix, False),
+            ('create', prefix + 'create/', False),
+            ('detail', prefix + 'detail/', True),
+            ('update', prefix + 'update/', True),
+            ('delete', prefix + 'delete/', True),
+            ('export', prefix + 'export/', False),
+            ('bulk_create', prefix + 'bulk_create/', False),
+            ('bulk_update', prefix + 'bulk_update/', False),
+            ('bulk_delete', prefix + 'bulk_delete/', False),
+            ('api_list', prefix + 'api/', False),
+            ('api_create', prefix + 'api/create/', False),
+            ('api_detail', prefix + 'api/detail/', True),
+            ('api_update', prefix + 'api/update/', True),
+            ('api_delete', prefix + 'api/delete/', True),
+            ('autocomplete', prefix + 'autocomplete/', False),
         ]
+        return [route for route in routes if route[0] in actions]
+
+    def get_url_patterns(self, ):
+        if self._url_patterns is None:
+            get_view = self.get_lazy_view if self.lazy else self.get_view
+
+            field, url_kwarg, lookup_regex, sample = self.get_lookup()
+            self._url_patterns = []
+            for action, route, with_pk in self.get_routes():
+                regex = r'^' + route + (r'(?P<{0}>{1})$'.format(url_kwarg, lookup_regex) if with_pk else '$')
+                self._url_patterns.append(url(regex, get_view(action), name=self.url_names[action]))
 
+        url_patterns = list(self._url_patterns)
         if django.VERSION >= (1, 8, 0):
             return url_patterns
         else:
@@ -254,18 +938,20 @@ class CrudManager(with_metaclass(CrudTracker, object, )):
 
     @classmethod
     def get_url_names(cls, prefix=None, model_class=None):
-        for r in cls._registry:
-            if r.prefix==prefix or model_class and r.model==model_class:
-                return {
-                    'list': r.list_url_name,
-                    'create': r.create_url_name,
-                    'update': r.update_url_name,
-                    'delete': r.delete_url_name,
-                    'detail': r.detail_url_name,
-                }
+        if model_class:
+            r = cls._registry_by_model.get((get_app_label(model_class), get_model_name(model_class)))
+        else:
+            r = cls._registry_by_prefix.get(prefix)
+        if r:
+            # A copy so that the callers can't change the registry
+            return dict(r.url_names)
+        # The scaffolding module may not be imported in this process
+        if model_class:
+            return manifest.get_url_names(get_app_label(model_class), get_model_name(model_class))
+        return manifest.get_url_names(prefix=prefix)
 
 def get_url_names(app=None, model=None, prefix=None):
-    model_class = None
     if app and model:
-        model_class = get_model(app, model)
-    return CrudManager.get_url_names(prefix=prefix, model_class=model_class)
+        r = CrudManager._registry_by_model.get((app, model.lower()))
+        return dict(r.url_names) if r else manifest.get_url_names(app, model)
+    return CrudManager.get_url_names(prefix=prefix)
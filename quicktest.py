@@ -42,7 +42,10 @@ class QuickDjangoTest(object):
             'DATABASES':{
                 'default': {
                     'ENGINE': 'django.db.backends.sqlite3',
-                }
+                },
+                'replica': {
+                    'ENGINE': 'django.db.backends.sqlite3',
+                },
             },
             'INSTALLED_APPS':self.INSTALLED_APPS + self.apps,
             'STATIC_URL':'/static/',